@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:00
+
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='profile_image',
+            field=models.ImageField(blank=True, null=True, storage=core.storage.content_addressed_storage, upload_to='profile_images/'),
+        ),
+    ]
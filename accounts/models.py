@@ -2,9 +2,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
+from core.storage import content_addressed_storage
 
 class User(AbstractUser):
-    profile_image = models.ImageField(upload_to='profile_images/', blank=True, null=True)
+    profile_image = models.ImageField(upload_to='profile_images/', storage=content_addressed_storage, blank=True, null=True)
     intro = models.TextField(blank=True, null=True, help_text=_("User introduction"))
     last_login_ip = models.GenericIPAddressField(blank=True, null=True)
     is_dormant = models.BooleanField(default=False)
@@ -13,6 +14,10 @@ class User(AbstractUser):
     class Meta:
         verbose_name = _('user')
         verbose_name_plural = _('users')
+        indexes = [
+            # 미디어 GC의 파일 참조 확인 (core.media.count_references)
+            models.Index(fields=['profile_image'], name='user_profile_image_idx'),
+        ]
     
     def __str__(self):
         return self.username
\ No newline at end of file
@@ -3,8 +3,13 @@ import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.utils.html import escape
-from django.utils import timezone
-from .models import ChatRoom, Message
+from .models import ChatRoom
+from .history import message_page, parse_before, serialize_message
+from .membership import is_member
+from .readcursors import mark_read, read_receipt_event
+from .summaries import record_message
+from .writer import get_message_writer
+from django.conf import settings
 from django.contrib.auth import get_user_model
 import logging
 
@@ -16,7 +21,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         self.room_id = self.scope['url_route']['kwargs']['room_id']
         self.room_group_name = f'chat_{self.room_id}'
         
-        # 방 참여자인지 확인
+        # 방 참여자인지 연결할 때 한 번만 확인 (이후 제외되면 participant_removed 알림으로 연결 종료)
         if not await self.is_room_participant():
             logger.warning(f"Unauthorized chat room access attempt: {self.scope['user']} tried to access room {self.room_id}")
             await self.close()
@@ -36,9 +41,26 @@ class ChatConsumer(AsyncWebsocketConsumer):
             self.room_group_name,
             self.channel_name
         )
+        
+        # 이 채팅방에서 쓰기 지연 중인 메시지 저장 (다른 채팅방은 주기적인 flush에 맡김)
+        if getattr(settings, 'CHAT_WRITE_BEHIND', False):
+            writer = get_message_writer()
+            if writer.pending_count(self.room_id):
+                await database_sync_to_async(writer.flush)(self.room_id)
     
     async def receive(self, text_data):
         text_data_json = json.loads(text_data)
+        
+        # 읽음 알림: {"type": "read", "message_id": ...}
+        if text_data_json.get('type') == 'read':
+            await self.receive_read(text_data_json.get('message_id'))
+            return
+        
+        # 이전 메시지 요청: {"type": "history", "before": <message_id>}
+        if text_data_json.get('type') == 'history':
+            await self.send_history(text_data_json.get('before'))
+            return
+        
         message = text_data_json['message']
         
         # XSS 방지
@@ -51,8 +73,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
         if len(message) > 500:
             message = message[:497] + '...'
         
-        # 메시지 저장
-        message_obj = await self.save_message(message)
+        # 메시지 저장 (CHAT_WRITE_BEHIND면 모아서 저장하므로 id 없이 바로 전송)
+        if getattr(settings, 'CHAT_WRITE_BEHIND', False):
+            message_obj = get_message_writer().record(self.room_id, self.scope['user'].id, message)
+        else:
+            message_obj = await self.save_message(message)
         
         # 그룹으로 메시지 전송
         await self.channel_layer.group_send(
@@ -62,44 +87,84 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 'message': message,
                 'sender_id': self.scope['user'].id,
                 'sender_username': self.scope['user'].username,
+                'message_id': message_obj.id,
                 'timestamp': message_obj.created_at.isoformat()
             }
         )
     
+    async def receive_read(self, message_id):
+        # message_id가 없으면 (쓰기 지연 모드에서 받은 메시지) 저장된 마지막 메시지까지
+        if message_id is not None:
+            try:
+                message_id = int(message_id)
+            except (TypeError, ValueError):
+                return
+            if message_id <= 0:
+                return
+        message_id = await self.save_read_cursor(message_id)
+        if message_id:
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                read_receipt_event(self.scope['user'].id, message_id)
+            )
+    
+    async def send_history(self, before):
+        messages, has_more = await self.load_history(parse_before(before))
+        await self.send(text_data=json.dumps({
+            'type': 'history',
+            'messages': messages,
+            'has_more': has_more
+        }))
+    
     async def chat_message(self, event):
         # 클라이언트로 메시지 전송
         await self.send(text_data=json.dumps({
             'message': event['message'],
             'sender_id': event['sender_id'],
             'sender_username': event['sender_username'],
+            'message_id': event['message_id'],
             'timestamp': event['timestamp']
         }))
     
+    async def read_receipt(self, event):
+        # 상대방의 읽음 알림 전달 (자신의 알림은 보내지 않음)
+        if event['user_id'] != self.scope['user'].id:
+            await self.send(text_data=json.dumps({
+                'type': 'read',
+                'user_id': event['user_id'],
+                'message_id': event['message_id']
+            }))
+    
+    async def participant_removed(self, event):
+        # 연결 후 채팅방에서 제외된 사용자 (user_ids가 None이면 채팅방 삭제)
+        if event['user_ids'] is None or self.scope['user'].id in event['user_ids']:
+            logger.warning(f"Closing chat connection of removed participant: {self.scope['user']} in room {self.room_id}")
+            await self.close()
+    
     @database_sync_to_async
     def is_room_participant(self):
-        try:
-            # 인증된 사용자인지 확인
-            if not self.scope['user'].is_authenticated:
-                return False
-            
-            room = ChatRoom.objects.get(id=self.room_id)
-            return room.participants.filter(id=self.scope['user'].id).exists()
-        except ChatRoom.DoesNotExist:
-            return False
+        # 인증된 참여자인지 확인
+        return is_member(self.room_id, self.scope['user'])
+    
+    @database_sync_to_async
+    def load_history(self, before):
+        page, has_more = message_page(self.room_id, before)
+        return [serialize_message(message) for message in page], has_more
+    
+    @database_sync_to_async
+    def save_read_cursor(self, message_id):
+        # 이 채팅방의 메시지 id까지만 읽음 처리
+        # 반환값: 읽음 처리한 메시지 id (커서가 이동하지 않았으면 None)
+        last_message_id = ChatRoom.objects.filter(id=self.room_id).values_list('last_message_id', flat=True).first()
+        if not last_message_id:
+            return None
+        if message_id is not None:
+            last_message_id = min(message_id, last_message_id)
+        if mark_read(self.room_id, self.scope['user'].id, last_message_id):
+            return last_message_id
+        return None
     
     @database_sync_to_async
     def save_message(self, content):
-        room = ChatRoom.objects.get(id=self.room_id)
-        
-        # 채팅방 마지막 활동 시간 업데이트
-        room.updated_at = timezone.now()
-        room.save()
-        
-        # 메시지 저장
-        message = Message.objects.create(
-            chat_room=room,
-            sender=self.scope['user'],
-            content=content
-        )
-        
-        return message
\ No newline at end of file
+        # 메시지 저장 + 채팅방 마지막 활동 시간/요약 갱신
+        return record_message(self.room_id, self.scope['user'], content)
\ No newline at end of file
@@ -0,0 +1,50 @@
+# chat/history.py
+from django.conf import settings
+
+from .models import Message
+
+
+def page_size(limit=None):
+    # 한 번에 불러올 메시지 수 (요청 값은 CHAT_HISTORY_PAGE_SIZE 이하로 제한)
+    default = getattr(settings, 'CHAT_HISTORY_PAGE_SIZE', 50)
+    try:
+        return min(max(int(limit), 1), default) if limit is not None else default
+    except (TypeError, ValueError):
+        return default
+
+
+def message_page(room_id, before=None, limit=None):
+    """
+    채팅방의 최신 메시지 limit개 (before가 있으면 그 id보다 오래된 메시지)
+    - (chat_room, id) 인덱스를 역순으로 읽으므로 전체 대화 길이와 관계없이 일정한 비용
+    - 반환값: (오래된 순 메시지 목록, 더 오래된 메시지가 있는지 여부)
+    """
+    limit = page_size(limit)
+    messages = Message.objects.filter(chat_room_id=room_id).select_related('sender')
+    if before is not None:
+        messages = messages.filter(id__lt=before)
+    page = list(messages.order_by('-id')[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    page.reverse()
+    return page, has_more
+
+
+def serialize_message(message):
+    # WebSocket chat_message 이벤트와 같은 형식
+    return {
+        'message_id': message.id,
+        'message': message.content,
+        'sender_id': message.sender_id,
+        'sender_username': message.sender.username,
+        'timestamp': message.created_at.isoformat(),
+    }
+
+
+def parse_before(value):
+    # before=<message_id> 값 (잘못된 값이면 None)
+    try:
+        before = int(value)
+    except (TypeError, ValueError):
+        return None
+    return before if before > 0 else None
@@ -0,0 +1,135 @@
+# chat/management/commands/bench_chat_writes.py
+import asyncio
+import json
+import time
+
+from asgiref.testing import ApplicationCommunicator
+from channels.routing import URLRouter
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from chat.models import ChatRoom, Message
+from chat.routing import websocket_urlpatterns
+from chat.writer import get_message_writer
+
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE')
+
+
+class WriteCounter:
+    # 모든 스레드의 DB 연결에서 실행된 쓰기 쿼리 수
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(WRITE_PREFIXES):
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self, sender=None, connection=None, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+class Client(ApplicationCommunicator):
+    # channels.testing.WebsocketCommunicator와 같은 방식으로 ChatConsumer에 연결
+    def __init__(self, application, room_id, user):
+        super().__init__(application, {
+            'type': 'websocket',
+            'path': f'/ws/chat/{room_id}/',
+            'headers': [],
+            'subprotocols': [],
+            'user': user,
+        })
+
+    async def connect(self):
+        await self.send_input({'type': 'websocket.connect'})
+        response = await self.receive_output(10)
+        return response['type'] == 'websocket.accept'
+
+    async def send_message(self, text):
+        await self.send_input({'type': 'websocket.receive', 'text': json.dumps({'message': text})})
+
+    async def receive_messages(self, count):
+        for _ in range(count):
+            await self.receive_output(30)
+
+    async def disconnect(self):
+        await self.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await self.wait(30)
+
+
+class Command(BaseCommand):
+    help = (
+        '여러 채팅방에서 동시에 메시지를 보내 초당 처리 메시지 수와 DB 쓰기 쿼리 수 측정 '
+        '(바로 저장 / CHAT_WRITE_BEHIND 비교, 생성한 데이터는 마지막에 삭제)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rooms', type=int, default=200, help='동시에 대화하는 채팅방 수')
+        parser.add_argument('--messages', type=int, default=10, help='채팅방 참여자 한 명이 보내는 메시지 수')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        rooms, users = [], []
+        try:
+            users = User.objects.bulk_create([
+                User(username=f'__chat_bench_{index}') for index in range(options['rooms'] * 2)
+            ])
+            for index in range(options['rooms']):
+                room = ChatRoom.objects.create(initiator=users[index * 2], counterpart=users[index * 2 + 1])
+                room.participants.add(users[index * 2], users[index * 2 + 1])
+                rooms.append(room)
+
+            for label, write_behind in (('direct', False), ('write-behind', True)):
+                with override_settings(CHAT_WRITE_BEHIND=write_behind):
+                    sent, elapsed, writes = self.run(rooms, options['messages'])
+                stored = Message.objects.filter(chat_room__in=rooms).count()
+                Message.objects.filter(chat_room__in=rooms).delete()
+                self.stdout.write(
+                    f'{label}: {sent} messages in {elapsed:.2f}s ({sent / elapsed:.0f} messages/sec), '
+                    f'{writes} DB writes ({writes / sent:.2f} per message), {stored} stored'
+                )
+        finally:
+            ChatRoom.objects.filter(id__in=[room.id for room in rooms]).delete()
+            User.objects.filter(id__in=[user.id for user in users]).delete()
+
+    def run(self, rooms, per_user):
+        counter = WriteCounter()
+        connection_created.connect(counter.install)
+        for connection in connections.all(initialized_only=True):
+            counter.install(connection=connection)
+        try:
+            sent = asyncio.run(self.talk(rooms, per_user))
+            # 쓰기 지연 모드에서 남은 메시지까지 저장된 시점으로 측정
+            get_message_writer().flush()
+            elapsed = time.perf_counter() - self.started
+        finally:
+            connection_created.disconnect(counter.install)
+            for connection in connections.all(initialized_only=True):
+                if counter in connection.execute_wrappers:
+                    connection.execute_wrappers.remove(counter)
+        return sent, elapsed, counter.count
+
+    async def talk(self, rooms, per_user):
+        application = URLRouter(websocket_urlpatterns)
+        room_ids = [room.id for room in rooms]
+        members = await asyncio.to_thread(
+            lambda: {room.id: (room.initiator, room.counterpart) for room in
+                     ChatRoom.objects.filter(id__in=room_ids).select_related('initiator', 'counterpart')}
+        )
+        clients = [Client(application, room_id, user) for room_id in room_ids for user in members[room_id]]
+        await asyncio.gather(*(client.connect() for client in clients))
+        self.started = time.perf_counter()
+
+        async def chat(client):
+            for index in range(per_user):
+                await client.send_message(f'bench message {index}')
+            # 두 참여자가 보낸 메시지를 모두 전달받을 때까지 대기
+            await client.receive_messages(per_user * 2)
+
+        await asyncio.gather(*(chat(client) for client in clients))
+        await asyncio.gather(*(client.disconnect() for client in clients))
+        return len(clients) * per_user
@@ -0,0 +1,67 @@
+# chat/membership.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from .models import ChatRoom
+
+
+def get_cache():
+    # CHAT_MEMBERSHIP_CACHE 별칭의 캐시 사용 (locmem: 워커별, Redis: 워커 간 공유)
+    return caches[getattr(settings, 'CHAT_MEMBERSHIP_CACHE', 'default')]
+
+
+def is_process_local(cache):
+    # 워커별 캐시는 다른 워커에서 보낸 무효화가 닿지 않음
+    return isinstance(cache, LocMemCache)
+
+
+def cache_key(room_id):
+    return f'chat:members:{room_id}'
+
+
+def room_members(room_id):
+    """
+    채팅방 참여자 id 집합 (캐시에 없을 때만 조회, 없는 채팅방은 빈 집합)
+    - 참여자 추가/삭제 시 chat.signals에서 무효화
+    """
+    cache = get_cache()
+    key = cache_key(room_id)
+    members = cache.get(key)
+    if members is None:
+        through = ChatRoom.participants.through
+        members = frozenset(through.objects.filter(chatroom_id=room_id).values_list('user_id', flat=True))
+        cache.set(key, members, getattr(settings, 'CHAT_MEMBERSHIP_CACHE_TIMEOUT', 300))
+    return members
+
+
+def is_member(room_id, user):
+    """
+    user가 채팅방 참여자인지 확인 (페이지 접근과 WebSocket 연결 허용 여부)
+    - 캐시가 워커별(locmem)이면 다른 워커에서 제외된 참여자가 통과하지 않도록 DB에서 확인
+    - 연결 후에는 다시 확인하지 않고 notify_removed로 받은 알림으로 연결 종료
+    """
+    if user is None or not user.is_authenticated:
+        return False
+    if is_process_local(get_cache()):
+        through = ChatRoom.participants.through
+        return through.objects.filter(chatroom_id=room_id, user_id=user.id).exists()
+    return user.id in room_members(room_id)
+
+
+def invalidate(room_ids):
+    get_cache().delete_many([cache_key(room_id) for room_id in room_ids])
+
+
+def removed_event(user_ids):
+    # user_ids가 None이면 채팅방 삭제 (모든 연결 종료)
+    return {'type': 'participant_removed', 'user_ids': None if user_ids is None else list(user_ids)}
+
+
+def notify_removed(room_id, user_ids):
+    # 채팅방 WebSocket 그룹에 참여자 제외 알림 (제외된 사용자의 연결은 consumer가 종료)
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)(f'chat_{room_id}', removed_event(user_ids))
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def populate_summaries(apps, schema_editor):
+    # 기존 채팅방의 요약 채우기 (첫 메시지를 보낸 참여자를 채팅을 시작한 사람으로 간주)
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    Message = apps.get_model('chat', 'Message')
+    participants = {}
+    for room_id, user_id in ChatRoom.participants.through.objects.order_by('chatroom_id', 'user_id').values_list('chatroom_id', 'user_id'):
+        participants.setdefault(room_id, []).append(user_id)
+    bounds = {
+        row['chat_room_id']: (row['first_id'], row['last_id'])
+        for row in Message.objects.order_by().values('chat_room_id').annotate(first_id=Min('id'), last_id=Max('id'))
+    }
+
+    rooms = list(ChatRoom.objects.order_by('id').iterator(chunk_size=500))
+    for offset in range(0, len(rooms), 500):
+        batch = rooms[offset:offset + 500]
+        message_ids = [pk for room in batch for pk in bounds.get(room.id, ())]
+        messages = Message.objects.in_bulk(message_ids)
+        for room in batch:
+            first_id, last_id = bounds.get(room.id, (None, None))
+            users = participants.get(room.id, [])
+            if first_id and messages[first_id].sender_id in users:
+                sender_id = messages[first_id].sender_id
+                users = [sender_id] + [pk for pk in users if pk != sender_id]
+            room.initiator_id = users[0] if users else None
+            room.counterpart_id = users[1] if len(users) > 1 else None
+            if last_id:
+                content = messages[last_id].content
+                room.last_message_id = last_id
+                room.last_message_preview = content if len(content) <= 100 else content[:97] + '...'
+                room.last_message_at = messages[last_id].created_at
+        ChatRoom.objects.bulk_update(
+            batch, ['initiator', 'counterpart', 'last_message', 'last_message_preview', 'last_message_at']
+        )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='counterpart',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='initiator',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='chat.message'),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='chatroom',
+            name='last_message_preview',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
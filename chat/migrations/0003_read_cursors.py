@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Min
+
+
+def carry_read_state(apps, schema_editor):
+    # 기존 is_read 값을 참여자별 읽음 커서로 변환
+    # (상대방이 보낸 첫 번째 안 읽은 메시지 직전까지 읽은 것으로 보고, 없으면 마지막 메시지까지)
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    Message = apps.get_model('chat', 'Message')
+    ReadCursor = apps.get_model('chat', 'ReadCursor')
+    last_ids = dict(Message.objects.order_by().values('chat_room_id').annotate(last_id=Max('id')).values_list('chat_room_id', 'last_id'))
+    first_unread = {}
+    rows = Message.objects.filter(is_read=False).order_by().values('chat_room_id', 'sender_id').annotate(first_id=Min('id'))
+    for row in rows:
+        first_unread.setdefault(row['chat_room_id'], []).append((row['sender_id'], row['first_id']))
+
+    cursors = []
+    participants = ChatRoom.participants.through.objects.values_list('chatroom_id', 'user_id')
+    for room_id, user_id in participants.iterator(chunk_size=2000):
+        unread_ids = [first_id for sender_id, first_id in first_unread.get(room_id, []) if sender_id != user_id]
+        last_read = min(unread_ids) - 1 if unread_ids else last_ids.get(room_id, 0)
+        cursors.append(ReadCursor(chat_room_id=room_id, user_id=user_id, last_read_message_id=last_read))
+        if len(cursors) >= 1000:
+            ReadCursor.objects.bulk_create(cursors)
+            cursors = []
+    ReadCursor.objects.bulk_create(cursors)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_chatroom_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='readcursor',
+            name='chat_room',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_cursors', to='chat.chatroom'),
+        ),
+        migrations.AddField(
+            model_name='readcursor',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_read_cursors', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='readcursor',
+            constraint=models.UniqueConstraint(fields=('chat_room', 'user'), name='read_cursor_room_user_unique'),
+        ),
+        migrations.RunPython(carry_read_state, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='message',
+            name='message_unread_idx',
+        ),
+        migrations.RemoveField(
+            model_name='message',
+            name='is_read',
+        ),
+    ]
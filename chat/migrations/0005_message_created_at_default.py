@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:32
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_message_room_id_idx'),
+    ]
+
+    # auto_now_add와 default 모두 Python에서 값을 정하므로 컬럼은 그대로 두고 상태만 변경
+    # (SQLite에서 AlterField가 메시지 테이블 전체를 다시 만드는 것을 피함)
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='message',
+                    name='created_at',
+                    field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+                ),
+            ],
+        ),
+    ]
@@ -1,6 +1,7 @@
 # chat/models.py
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from products.models import Product
 
 class ChatRoom(models.Model):
@@ -9,6 +10,12 @@ class ChatRoom(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
+    # 채팅 목록용 요약 (메시지 저장 시 chat.summaries.record_message가 함께 갱신)
+    initiator = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    counterpart = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_preview = models.CharField(max_length=100, blank=True)
+    last_message_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-updated_at']
@@ -17,19 +24,43 @@ class ChatRoom(models.Model):
         participants_str = ', '.join([user.username for user in self.participants.all()])
         return f"Chat: {participants_str}"
     
-    @property
-    def last_message(self):
-        return self.messages.order_by('-created_at').first()
+    def other_participant_id(self, user):
+        # 1:1 채팅방에서 user의 상대방 id
+        return self.counterpart_id if self.initiator_id == user.id else self.initiator_id
 
 class Message(models.Model):
     chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='messages')
     sender = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='sent_messages')
     content = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
-    is_read = models.BooleanField(default=False)
+    # auto_now_add는 저장 시각으로 덮어쓰므로 쓰기 지연 저장(chat.writer)에서도 받은 시각이 남도록 default 사용
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            # 채팅방 메시지 시간순 조회 / 마지막 메시지
+            models.Index(fields=['chat_room', 'created_at'], name='message_room_created_idx'),
+            # 채팅 기록 페이지 (최신 N개, before=<id> 이전 메시지)
+            models.Index(fields=['chat_room', 'id'], name='message_room_id_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.sender.username}: {self.content[:20]}..."
+
+class ReadCursor(models.Model):
+    """
+    채팅방 참여자별로 마지막으로 읽은 메시지 id
+    - 안 읽은 메시지: 상대방이 보낸 메시지 중 id > last_read_message_id
+    """
+    chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='read_cursors')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chat_read_cursors')
+    last_read_message_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['chat_room', 'user'], name='read_cursor_room_user_unique'),
+        ]
     
     def __str__(self):
-        return f"{self.sender.username}: {self.content[:20]}..."
\ No newline at end of file
+        return f"{self.user_id} read room {self.chat_room_id} up to {self.last_read_message_id}"
\ No newline at end of file
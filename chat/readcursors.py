@@ -0,0 +1,60 @@
+# chat/readcursors.py
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db.models import Count, F, FilteredRelation, Q
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import ReadCursor
+
+
+def mark_read(room_id, user_id, message_id):
+    """
+    채팅방의 message_id까지 읽음 처리 (커서는 앞으로만 이동)
+    - 보통은 UPDATE 한 번, 커서가 없을 때만 INSERT
+    - 반환값: 커서가 이동했는지 여부
+    """
+    if not message_id:
+        return False
+    updated = ReadCursor.objects.filter(
+        chat_room_id=room_id, user_id=user_id, last_read_message_id__lt=message_id
+    ).update(last_read_message_id=message_id, updated_at=timezone.now())
+    if updated:
+        return True
+    _, created = ReadCursor.objects.get_or_create(
+        chat_room_id=room_id, user_id=user_id, defaults={'last_read_message_id': message_id}
+    )
+    return created
+
+
+def with_unread_count(rooms, user):
+    """
+    채팅방 쿼리셋에 unread_count(상대방이 보낸 메시지 중 읽음 커서 이후 메시지 수) 추가
+    """
+    rooms = rooms.annotate(
+        user_read_cursor=FilteredRelation('read_cursors', condition=Q(read_cursors__user=user))
+    )
+    return rooms.annotate(
+        unread_count=Count(
+            'messages',
+            filter=Q(messages__id__gt=Coalesce(F('user_read_cursor__last_read_message_id'), 0))
+            & ~Q(messages__sender=user)
+        )
+    )
+
+
+def last_read_by_others(room_id, user_id):
+    # 상대방이 읽은 마지막 메시지 id (읽음 표시용)
+    cursors = ReadCursor.objects.filter(chat_room_id=room_id).exclude(user_id=user_id)
+    return max(cursors.values_list('last_read_message_id', flat=True), default=0)
+
+
+def read_receipt_event(user_id, message_id):
+    return {'type': 'read_receipt', 'user_id': user_id, 'message_id': message_id}
+
+
+def broadcast_read(room_id, user_id, message_id):
+    # HTTP 요청에서 읽음 처리한 경우 채팅방 WebSocket 그룹에 읽음 알림
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)(f'chat_{room_id}', read_receipt_event(user_id, message_id))
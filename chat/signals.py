@@ -0,0 +1,54 @@
+# chat/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
+
+from . import membership
+from .models import ChatRoom
+
+
+def _invalidate_membership(room_ids):
+    # 지금 한 번, 커밋 후 한 번 더 삭제 (커밋 전에 다른 요청이 예전 참여자로 다시 채운 경우 대비)
+    room_ids = list(room_ids)
+    if room_ids:
+        membership.invalidate(room_ids)
+        transaction.on_commit(lambda: membership.invalidate(room_ids))
+
+
+def _notify_removed(removed):
+    # 커밋 후 제외된 참여자의 WebSocket 연결 종료 알림 ({채팅방 id: 사용자 id 목록})
+    def notify():
+        for room_id, user_ids in removed.items():
+            membership.notify_removed(room_id, user_ids)
+
+    if removed:
+        transaction.on_commit(notify)
+
+
+@receiver(m2m_changed, sender=ChatRoom.participants.through)
+def invalidate_room_membership(sender, instance, action, reverse, pk_set, **kwargs):
+    # room.participants.add/remove/clear 와 user.chat_rooms.add/remove/clear 모두 처리
+    if action == 'pre_clear':
+        if reverse:
+            instance._cleared_chat_room_ids = list(instance.chat_rooms.values_list('id', flat=True))
+        else:
+            instance._cleared_participant_ids = list(instance.participants.values_list('id', flat=True))
+    elif action == 'post_add':
+        _invalidate_membership(pk_set if reverse else [instance.pk])
+    elif action == 'post_remove':
+        _invalidate_membership(pk_set if reverse else [instance.pk])
+        _notify_removed({room_id: [instance.pk] for room_id in pk_set} if reverse else {instance.pk: list(pk_set)})
+    elif action == 'post_clear':
+        if reverse:
+            room_ids = getattr(instance, '_cleared_chat_room_ids', [])
+            _invalidate_membership(room_ids)
+            _notify_removed({room_id: [instance.pk] for room_id in room_ids})
+        else:
+            _invalidate_membership([instance.pk])
+            _notify_removed({instance.pk: getattr(instance, '_cleared_participant_ids', [])})
+
+
+@receiver(post_delete, sender=ChatRoom)
+def invalidate_deleted_room_membership(sender, instance, **kwargs):
+    _invalidate_membership([instance.pk])
+    _notify_removed({instance.pk: None})
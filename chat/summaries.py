@@ -0,0 +1,75 @@
+# chat/summaries.py
+import re
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import ChatRoom, Message
+from .readcursors import with_unread_count
+
+PREVIEW_LENGTH = ChatRoom._meta.get_field('last_message_preview').max_length
+# 잘린 HTML 엔티티 (메시지는 escape된 상태로 저장됨)
+_PARTIAL_ENTITY_RE = re.compile(r'&[#\w]*$')
+
+
+def preview_text(content):
+    if len(content) <= PREVIEW_LENGTH:
+        return content
+    return _PARTIAL_ENTITY_RE.sub('', content[:PREVIEW_LENGTH - 3]) + '...'
+
+
+def summary_values(message):
+    return {
+        'updated_at': message.created_at,
+        'last_message': message,
+        'last_message_preview': preview_text(message.content),
+        'last_message_at': message.created_at,
+    }
+
+
+def record_message(room_id, sender, content):
+    """
+    메시지 저장과 채팅방 요약(마지막 메시지, 미리보기, 시각) 갱신을 한 트랜잭션으로 처리
+    - 동시에 저장된 메시지의 커밋 순서가 바뀌어도 id가 더 큰 메시지가 요약에 남음
+    """
+    with transaction.atomic():
+        message = Message.objects.create(chat_room_id=room_id, sender=sender, content=content)
+        update_summaries([message])
+    return message
+
+
+def update_summaries(messages):
+    """
+    저장된 메시지 목록으로 채팅방별 요약을 한 번씩 갱신 (채팅방마다 마지막 메시지 기준 UPDATE 1번)
+    """
+    last_messages = {}
+    for message in messages:
+        if message.chat_room_id not in last_messages or message.id > last_messages[message.chat_room_id].id:
+            last_messages[message.chat_room_id] = message
+    for room_id, message in last_messages.items():
+        ChatRoom.objects.filter(id=room_id).filter(
+            Q(last_message__isnull=True) | Q(last_message_id__lt=message.id)
+        ).update(**summary_values(message))
+
+
+def inbox(user):
+    """
+    사용자의 채팅 목록 (채팅방 수와 관계없이 쿼리 1번)
+    - room.other_participant: 상대방 (요약 필드의 initiator / counterpart 중 하나)
+    - room.last_message_obj / room.last_message_time: 기존 채팅 목록 템플릿에서 쓰는 이름
+    """
+    rooms = ChatRoom.objects.filter(
+        participants=user,
+        is_active=True
+    ).select_related(
+        'initiator', 'counterpart', 'product', 'last_message', 'last_message__sender'
+    ).order_by('-updated_at')
+    # 안 읽은 메시지 수 (읽음 커서 이후 메시지)
+    rooms = with_unread_count(rooms, user)
+
+    rooms = list(rooms)
+    for room in rooms:
+        room.other_participant = room.counterpart if room.initiator_id == user.id else room.initiator
+        room.last_message_obj = room.last_message
+        room.last_message_time = room.last_message_at
+    return rooms
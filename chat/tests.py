@@ -1,3 +1,307 @@
-from django.test import TestCase
+import json
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection
+from django.http import HttpResponse
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from products.models import Product
+from . import membership
+from .consumers import ChatConsumer
+from .history import message_page
+from .models import ChatRoom, Message
+from .summaries import inbox, record_message
+from .writer import ChatMessageWriter
+
+User = get_user_model()
+
+
+def create_room(initiator, counterpart, product=None):
+    room = ChatRoom.objects.create(initiator=initiator, counterpart=counterpart, product=product)
+    room.participants.add(initiator, counterpart)
+    return room
+
+
+class InboxTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='user', password='password')
+        cls.product = Product.objects.create(
+            title='상품', description='설명', price=1000, seller=cls.user, image='product_images/test.jpg'
+        )
+
+    def add_rooms(self, count):
+        start = ChatRoom.objects.count()
+        for index in range(start, start + count):
+            other = User.objects.create(username=f'other{index}')
+            room = create_room(other, self.user, self.product)
+            record_message(room.id, other, f'안녕하세요 {index}')
+
+    def test_query_count_does_not_grow_with_rooms(self):
+        for total, added in [(1, 1), (10, 9)]:
+            self.add_rooms(added)
+            with self.assertNumQueries(1):
+                rooms = inbox(self.user)
+                for room in rooms:
+                    # 채팅 목록 템플릿에서 사용하는 값
+                    (room.other_participant.username, room.last_message_preview, room.last_message_at,
+                     room.last_message_obj.content, room.last_message_obj.sender.username,
+                     room.last_message_time, room.unread_count, room.product.title)
+            self.assertEqual(len(rooms), total)
+
+    def test_summary_fields_and_template_aliases(self):
+        other = User.objects.create(username='other')
+        room = create_room(other, self.user)
+        record_message(room.id, other, '첫 메시지')
+        last = record_message(room.id, self.user, '답장')
+
+        [summary] = inbox(self.user)
+        self.assertEqual(summary.other_participant, other)
+        self.assertEqual(summary.last_message_obj, last)
+        self.assertEqual(summary.last_message_time, last.created_at)
+        self.assertEqual(summary.last_message_preview, '답장')
+        # 내가 보낸 메시지는 안 읽은 메시지로 세지 않음
+        self.assertEqual(summary.unread_count, 1)
+
+
+@override_settings(CHAT_HISTORY_PAGE_SIZE=20)
+class ChatHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username='buyer', password='password')
+        cls.seller = User.objects.create(username='seller')
+        cls.outsider = User.objects.create(username='outsider')
+        cls.room = create_room(cls.buyer, cls.seller)
+        cls.messages = Message.objects.bulk_create([
+            Message(chat_room=cls.room, sender=cls.buyer if index % 2 else cls.seller, content=f'메시지 {index}')
+            for index in range(45)
+        ])
+
+    def history(self, **params):
+        response = self.client.get(reverse('chat:chat_history', args=[self.room.id]), params)
+        return response.status_code, json.loads(response.content)
+
+    def test_message_page_cursor_round_trip(self):
+        pages = []
+        page, has_more = message_page(self.room.id)
+        pages.append(page)
+        while has_more:
+            page, has_more = message_page(self.room.id, before=page[0].id)
+            pages.append(page)
+
+        self.assertEqual([len(page) for page in pages], [20, 20, 5])
+        # 페이지를 이어 붙이면 전체 대화가 빠짐 없이 오래된 순으로 나옴
+        ids = [message.id for page in reversed(pages) for message in page]
+        self.assertEqual(ids, [message.id for message in self.messages])
+
+    def test_chat_history_cursor_round_trip(self):
+        self.client.force_login(self.buyer)
+        status, body = self.history()
+        self.assertEqual(status, 200)
+        self.assertTrue(body['has_more'])
+        ids = [message['message_id'] for message in body['messages']]
+        while body['has_more']:
+            status, body = self.history(before=body['messages'][0]['message_id'])
+            self.assertEqual(status, 200)
+            ids = [message['message_id'] for message in body['messages']] + ids
+        self.assertEqual(ids, [message.id for message in self.messages])
+
+    def test_chat_history_rejects_invalid_cursor(self):
+        self.client.force_login(self.buyer)
+        for before in ['abc', '0', '-1', '']:
+            status, _ = self.history(before=before)
+            self.assertEqual(status, 400, before)
+
+    def test_chat_history_forbidden_for_non_participant(self):
+        self.client.force_login(self.outsider)
+        status, body = self.history()
+        self.assertEqual(status, 403)
+        self.assertNotIn('messages', body)
+
+    def test_page_cost_does_not_depend_on_history_length(self):
+        for total in [45, 1000]:
+            Message.objects.bulk_create([
+                Message(chat_room=self.room, sender=self.buyer, content='추가 메시지')
+                for _ in range(total - Message.objects.filter(chat_room=self.room).count())
+            ])
+            with CaptureQueriesContext(connection) as queries:
+                page, has_more = message_page(self.room.id, before=self.messages[-1].id)
+            self.assertEqual((len(queries), len(page), has_more), (1, 20, True))
+            if connection.vendor == 'sqlite':
+                # (chat_room, id) 인덱스를 역순으로 읽고 LIMIT에서 멈춤 (전체 스캔이나 정렬 없음)
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {queries[0]['sql']}")
+                    plan = ' '.join(row[-1] for row in cursor.fetchall())
+                self.assertIn('message_room_id_idx', plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+
+class ChatMessageWriterTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='user')
+        self.other = User.objects.create(username='other')
+        self.room = create_room(self.user, self.other)
+        self.other_room = create_room(self.other, self.user)
+        # 테스트에서는 flush()를 직접 호출
+        self.writer = ChatMessageWriter(flush_interval=3600, flush_threshold=10000, max_pending=3)
+
+    def test_created_at_is_the_time_the_message_was_received(self):
+        message = self.writer.record(self.room.id, self.user.id, '안녕하세요')
+        received_at = message.created_at
+
+        self.assertEqual(self.writer.flush(), 1)
+
+        saved = Message.objects.get(chat_room=self.room)
+        # 브로드캐스트한 시각과 저장된 시각이 같음
+        self.assertEqual(saved.created_at, received_at)
+        self.assertEqual(ChatRoom.objects.get(id=self.room.id).last_message_at, received_at)
+
+    def test_integrity_error_drops_only_the_failing_messages(self):
+        self.writer.record(self.room.id, self.user.id, '첫 메시지')
+        self.writer.record(self.room.id + 1000, self.user.id, '없는 채팅방')
+        self.writer.record(self.room.id, self.other.id, '두 번째 메시지')
+
+        with self.assertLogs('chat.writer', 'WARNING'):
+            self.assertEqual(self.writer.flush(), 2)
+
+        self.assertEqual(self.writer.pending_count(), 0)
+        self.assertEqual(
+            list(Message.objects.values_list('content', flat=True)), ['첫 메시지', '두 번째 메시지']
+        )
+
+    def test_retry_buffer_is_capped(self):
+        for index in range(5):
+            self.writer.record(self.room.id, self.user.id, f'메시지 {index}')
+
+        with mock.patch.object(Message.objects, 'bulk_create', side_effect=OperationalError('database is locked')):
+            with self.assertLogs('chat.writer', 'WARNING') as logs:
+                self.assertEqual(self.writer.flush(), 0)
+
+        # 오래된 메시지부터 버리고 최근 max_pending개만 보관
+        self.assertEqual([message.content for message in self.writer._pending], ['메시지 2', '메시지 3', '메시지 4'])
+        self.assertTrue(any('2 oldest messages dropped' in line for line in logs.output))
+        self.assertEqual(self.writer.flush(), 3)
+
+    def test_flush_can_be_scoped_to_a_room(self):
+        self.writer.record(self.room.id, self.user.id, '이 채팅방')
+        self.writer.record(self.other_room.id, self.other.id, '다른 채팅방')
+
+        # 연결 종료 시에는 그 채팅방의 메시지만 저장 (room_id는 URL에서 받은 문자열)
+        self.assertEqual(self.writer.flush(str(self.room.id)), 1)
+
+        self.assertEqual(self.writer.pending_count(self.room.id), 0)
+        self.assertEqual(self.writer.pending_count(self.other_room.id), 1)
+        self.assertEqual(list(Message.objects.values_list('content', flat=True)), ['이 채팅방'])
+
+
+def remove_without_signal(room, user):
+    # 다른 워커에서 제외되어 이 워커의 캐시 무효화가 일어나지 않은 상태
+    ChatRoom.participants.through.objects.filter(chatroom=room, user=user).delete()
+
+
+class MembershipTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.buyer = User.objects.create_user(username='buyer', password='password')
+        cls.seller = User.objects.create(username='seller')
+        cls.product = Product.objects.create(
+            title='상품', description='설명', price=1000, seller=cls.seller, image='product_images/test.jpg'
+        )
+        cls.room = create_room(cls.buyer, cls.seller, cls.product)
+
+    def setUp(self):
+        membership.invalidate([self.room.id])
+
+    def test_authorization_checks_database_with_process_local_cache(self):
+        self.assertTrue(membership.is_member(self.room.id, self.buyer))
+        remove_without_signal(self.room, self.buyer)
+
+        self.assertFalse(membership.is_member(self.room.id, self.buyer))
+
+    def test_shared_cache_serves_authorization_without_queries(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(
+            CACHES={
+                'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location},
+            },
+            CHAT_MEMBERSHIP_CACHE='shared',
+        ):
+            self.assertTrue(membership.is_member(self.room.id, self.buyer))
+            with self.assertNumQueries(0):
+                self.assertTrue(membership.is_member(self.room.id, self.buyer))
+
+            # 참여자 삭제는 시그널로 공유 캐시에서 바로 무효화
+            self.room.participants.remove(self.buyer)
+            self.assertFalse(membership.is_member(self.room.id, self.buyer))
+
+    def test_chat_room_uses_summary_for_other_participant(self):
+        context = {}
+
+        def capture(request, template_name, data=None, *args, **kwargs):
+            context.update(data)
+            return HttpResponse(template_name)
+
+        self.client.force_login(self.buyer)
+        with mock.patch('chat.views.render', capture), CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('chat:chat_room', args=[self.room.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(context['other_participant'], self.seller)
+        self.assertEqual(context['product'], self.product)
+        # 참여자 테이블을 조인해 상대방을 찾는 쿼리 없음 (권한 확인만 참여자 테이블 조회)
+        participant_joins = [
+            query['sql'] for query in queries.captured_queries
+            if 'JOIN "chat_chatroom_participants"' in query['sql']
+        ]
+        self.assertEqual(participant_joins, [])
+
+    def test_removed_participant_cannot_open_room_from_another_worker(self):
+        self.client.force_login(self.buyer)
+        self.assertTrue(membership.is_member(self.room.id, self.buyer))
+        remove_without_signal(self.room, self.buyer)
+
+        response = self.client.get(reverse('chat:chat_history', args=[self.room.id]))
+        self.assertEqual(response.status_code, 403)
+
+    def consumer(self, user):
+        consumer = ChatConsumer()
+        consumer.scope = {'user': user, 'url_route': {'kwargs': {'room_id': str(self.room.id)}}}
+        consumer.room_id = str(self.room.id)
+        consumer.room_group_name = f'chat_{self.room.id}'
+        consumer.channel_layer = mock.AsyncMock()
+        consumer.close = mock.AsyncMock()
+        consumer.send = mock.AsyncMock()
+        return consumer
+
+    def test_messages_are_not_reauthorized(self):
+        consumer = self.consumer(self.buyer)
+        with mock.patch.object(ChatConsumer, 'is_room_participant') as is_room_participant:
+            async_to_sync(consumer.receive)(json.dumps({'type': 'history'}))
+
+        # 권한은 연결할 때만 확인 (메시지마다 스레드를 거쳐 다시 확인하지 않음)
+        is_room_participant.assert_not_called()
+        consumer.send.assert_awaited_once()
+
+    def test_removed_participant_connection_is_closed(self):
+        with mock.patch.object(membership, 'notify_removed') as notify_removed:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.room.participants.remove(self.buyer)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.seller.chat_rooms.clear()
+        self.assertEqual(notify_removed.call_args_list, [
+            mock.call(self.room.id, [self.buyer.id]), mock.call(self.room.id, [self.seller.id]),
+        ])
+
+        seller, buyer = self.consumer(self.seller), self.consumer(self.buyer)
+        event = membership.removed_event([self.buyer.id])
+        async_to_sync(seller.participant_removed)(event)
+        with self.assertLogs('chat.consumers', 'WARNING'):
+            async_to_sync(buyer.participant_removed)(event)
+        seller.close.assert_not_awaited()
+        buyer.close.assert_awaited_once()
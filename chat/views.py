@@ -1,13 +1,17 @@
 # chat/views.py
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.contrib import messages
-from django.db.models import Q, Count, Max, F, ExpressionWrapper, BooleanField
 from django.utils.html import escape
 from django.contrib.auth import get_user_model
 import logging
 
-from .models import ChatRoom, Message
+from .models import ChatRoom
+from .history import message_page, parse_before, serialize_message
+from .membership import is_member
+from .readcursors import broadcast_read, last_read_by_others, mark_read
+from .summaries import inbox, record_message
 from products.models import Product
 
 User = get_user_model()
@@ -15,24 +19,8 @@ logger = logging.getLogger(__name__)
 
 @login_required
 def chat_list(request):
-    # 자신이 참여한 채팅방 목록 가져오기
-    chat_rooms = ChatRoom.objects.filter(
-        participants=request.user,
-        is_active=True
-    ).annotate(
-        # 안 읽은 메시지 수 계산
-        unread_count=Count(
-            'messages', 
-            filter=Q(messages__is_read=False) & ~Q(messages__sender=request.user)
-        ),
-        # 마지막 메시지 시간
-        last_message_time=Max('messages__created_at')
-    ).order_by('-updated_at')
-    
-    # 채팅방마다 상대방 정보 추가
-    for room in chat_rooms:
-        room.other_participant = room.participants.exclude(id=request.user.id).first()
-        room.last_message_obj = room.messages.order_by('-created_at').first()
+    # 자신이 참여한 채팅방 목록 (상대방, 마지막 메시지는 채팅방 요약 필드 사용)
+    chat_rooms = inbox(request.user)
     
     return render(request, 'chat/chat_list.html', {
         'chat_rooms': chat_rooms
@@ -40,28 +28,23 @@ def chat_list(request):
 
 @login_required
 def chat_room(request, room_id):
-    chat_room = get_object_or_404(ChatRoom, id=room_id)
+    chat_room = get_object_or_404(ChatRoom.objects.select_related('initiator', 'counterpart', 'product'), id=room_id)
     
     # 권한 확인
-    if request.user not in chat_room.participants.all():
+    if not is_member(chat_room.id, request.user):
         messages.error(request, '이 채팅방에 접근할 권한이 없습니다.')
         return redirect('chat:chat_list')
     
-    # 상대방 정보
-    other_participant = chat_room.participants.exclude(id=request.user.id).first()
-    
-    # 메시지 불러오기
-    messages_list = chat_room.messages.all()
+    # 상대방 정보 (요약 필드의 initiator / counterpart 중 하나)
+    other_id = chat_room.other_participant_id(request.user)
+    other_participant = chat_room.counterpart if other_id == chat_room.counterpart_id else chat_room.initiator
     
-    # 읽지 않은 메시지 읽음 처리
-    unread_messages = messages_list.filter(
-        sender=other_participant,
-        is_read=False
-    )
+    # 최신 메시지만 불러오기 (이전 메시지는 chat_history / WebSocket history 요청으로)
+    messages_list, has_more_messages = message_page(chat_room.id)
     
-    for message in unread_messages:
-        message.is_read = True
-        message.save()
+    # 마지막 메시지까지 읽음 처리 (읽음 커서 갱신 한 번) 후 상대방에게 읽음 알림
+    if mark_read(chat_room.id, request.user.id, chat_room.last_message_id):
+        broadcast_read(chat_room.id, request.user.id, chat_room.last_message_id)
     
     # 관련 상품 정보
     product = chat_room.product
@@ -69,10 +52,32 @@ def chat_room(request, room_id):
     return render(request, 'chat/chat_room.html', {
         'chat_room': chat_room,
         'messages': messages_list,
+        'has_more_messages': has_more_messages,
         'other_participant': other_participant,
+        'other_last_read_id': last_read_by_others(chat_room.id, request.user.id),
         'product': product
     })
 
+@login_required
+def chat_history(request, room_id):
+    """
+    이전 메시지 JSON (GET before=<message_id>&limit=N)
+    - 응답: {'messages': [...오래된 순], 'has_more': 더 오래된 메시지 여부}
+    """
+    chat_room = get_object_or_404(ChatRoom, id=room_id)
+    if not is_member(chat_room.id, request.user):
+        return JsonResponse({'error': '권한이 없습니다.'}, status=403)
+    
+    before = request.GET.get('before')
+    if before is not None and parse_before(before) is None:
+        return JsonResponse({'error': '잘못된 메시지 번호입니다.'}, status=400)
+    
+    page, has_more = message_page(chat_room.id, parse_before(before), request.GET.get('limit'))
+    return JsonResponse({
+        'messages': [serialize_message(message) for message in page],
+        'has_more': has_more,
+    })
+
 @login_required
 def start_chat(request, user_id=None, product_id=None):
     # 채팅 시작 대상
@@ -127,13 +132,9 @@ def start_chat(request, user_id=None, product_id=None):
         return redirect('chat:chat_room', room_id=existing_chat.first().id)
     
     # 새 채팅방 생성
-    chat_room = ChatRoom.objects.create()
+    chat_room = ChatRoom.objects.create(initiator=request.user, counterpart=other_user, product=product)
     chat_room.participants.add(request.user, other_user)
     
-    if product:
-        chat_room.product = product
-        chat_room.save()
-    
     logger.info(f"New chat room created: {request.user.username} with {other_user.username}")
     
     # 시스템 메시지 추가
@@ -141,10 +142,6 @@ def start_chat(request, user_id=None, product_id=None):
     if product:
         system_message = f"'{product.title}' 상품에 대한 대화가 시작되었습니다."
     
-    Message.objects.create(
-        chat_room=chat_room,
-        sender=request.user,
-        content=system_message
-    )
+    record_message(chat_room.id, request.user, system_message)
     
     return redirect('chat:chat_room', room_id=chat_room.id)
\ No newline at end of file
@@ -0,0 +1,173 @@
+# chat/writer.py
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.utils import timezone
+
+from .models import Message
+from .summaries import update_summaries
+
+logger = logging.getLogger(__name__)
+
+
+class ChatMessageWriter:
+    """
+    채팅 메시지를 메모리에 모았다가 일괄 저장하는 버퍼 (write-behind, CHAT_WRITE_BEHIND)
+    - 메시지는 받는 즉시 브로드캐스트하고 저장은 flush_interval초마다 또는 flush_threshold개가 모이면 수행
+    - 한 번의 flush는 bulk_create 1번 + 채팅방마다 요약/updated_at UPDATE 1번
+    - 받은 순서대로 저장하므로 같은 채팅방의 메시지 순서(id 순서)가 유지됨
+    - 워커가 비정상 종료되면 마지막 flush 이후의 메시지가 유실됨 (정상 종료 시에는 atexit에서 저장)
+    - DB 장애로 저장하지 못한 메시지는 max_pending개까지만 보관하고 넘치면 오래된 것부터 버림
+    """
+
+    def __init__(self, flush_interval=None, flush_threshold=None, max_pending=None):
+        self.flush_interval = flush_interval if flush_interval is not None else getattr(
+            settings, 'CHAT_WRITE_BEHIND_INTERVAL', 0.05)
+        self.flush_threshold = flush_threshold if flush_threshold is not None else getattr(
+            settings, 'CHAT_WRITE_BEHIND_THRESHOLD', 200)
+        self.max_pending = max_pending if max_pending is not None else getattr(
+            settings, 'CHAT_WRITE_BEHIND_MAX_PENDING', 10000)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher_pid = None
+
+    def record(self, room_id, sender_id, content):
+        """
+        저장할 메시지 추가 (반환값: 아직 id가 없는 Message, created_at은 받은 시각으로 저장됨)
+        """
+        self._ensure_flusher()
+        message = Message(chat_room_id=int(room_id), sender_id=sender_id, content=content)
+        with self._lock:
+            # 잠금 안에서 시각을 정해 같은 채팅방의 created_at 순서와 id 순서가 같도록 함
+            message.created_at = timezone.now()
+            self._pending.append(message)
+            full = len(self._pending) >= self.flush_threshold
+        if full:
+            self._wakeup.set()
+        return message
+
+    def pending_count(self, room_id=None):
+        if room_id is None:
+            return len(self._pending)
+        room_id = int(room_id)
+        with self._lock:
+            return sum(1 for message in self._pending if message.chat_room_id == room_id)
+
+    def _drain(self, room_id=None):
+        with self._lock:
+            if room_id is None:
+                pending, self._pending = self._pending, []
+            else:
+                room_id = int(room_id)
+                pending = [message for message in self._pending if message.chat_room_id == room_id]
+                self._pending = [message for message in self._pending if message.chat_room_id != room_id]
+        return pending
+
+    def _restore(self, pending):
+        # 저장에 실패한 메시지는 순서를 유지한 채 다음 flush로 넘김 (max_pending을 넘으면 오래된 것부터 버림)
+        for message in pending:
+            message.pk = None
+        with self._lock:
+            self._pending[:0] = pending
+            dropped = len(self._pending) - self.max_pending
+            if dropped > 0:
+                del self._pending[:dropped]
+        if dropped > 0:
+            logger.error(f"Chat message retry buffer full, {dropped} oldest messages dropped")
+
+    def flush(self, room_id=None):
+        """
+        대기 중인 메시지를 저장 (room_id가 있으면 그 채팅방의 메시지만, 반환값: 저장한 메시지 수)
+        - 무결성 오류(삭제된 채팅방/사용자 등)가 나면 한 건씩 저장하고 실패한 메시지는 로그를 남기고 버림
+        - 그 밖의 DB 오류는 전체를 다음 flush로 넘김
+        """
+        with self._flush_lock:
+            pending = self._drain(room_id)
+            if not pending:
+                return 0
+            try:
+                with transaction.atomic():
+                    created = Message.objects.bulk_create(pending)
+                    update_summaries(created)
+            except IntegrityError as e:
+                logger.warning(f"Chat message batch of {len(pending)} rejected, saving one at a time: {e}")
+                for message in pending:
+                    message.pk = None
+                return self._save_each(pending)
+            except DatabaseError as e:
+                logger.warning(f"Chat message flush failed, {len(pending)} messages kept for retry: {e}")
+                self._restore(pending)
+                return 0
+            return len(created)
+
+    def _save_each(self, pending):
+        saved = 0
+        for index, message in enumerate(pending):
+            try:
+                with transaction.atomic():
+                    Message.objects.bulk_create([message])
+                    update_summaries([message])
+            except IntegrityError as e:
+                logger.warning(
+                    f"Chat message dropped (room {message.chat_room_id}, sender {message.sender_id}): {e}"
+                )
+            except DatabaseError as e:
+                logger.warning(f"Chat message flush failed, {len(pending) - index} messages kept for retry: {e}")
+                self._restore(pending[index:])
+                break
+            else:
+                saved += 1
+        return saved
+
+    def _ensure_flusher(self):
+        # 포크된 워커에서는 스레드를 새로 시작
+        if self._flusher_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._flusher_pid == os.getpid():
+                return
+            thread = threading.Thread(target=self._run, name='chat-message-writer', daemon=True)
+            thread.start()
+            self._flusher_pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Chat message flush failed")
+            finally:
+                # 짧은 주기로 계속 사용하므로 연결은 유지하고 끊어졌거나 오래된 연결만 정리
+                for connection in connections.all(initialized_only=True):
+                    connection.close_if_unusable_or_obsolete()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_message_writer():
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ChatMessageWriter()
+    return _writer
+
+
+@atexit.register
+def _flush_on_exit():
+    if _writer is not None and _writer._flusher_pid == os.getpid():
+        try:
+            _writer.flush()
+        except Exception:
+            logger.exception("Chat message flush at exit failed")
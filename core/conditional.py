@@ -0,0 +1,49 @@
+# core/conditional.py
+import hashlib
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+def page_etag(request, *parts):
+    """
+    사용자별 페이지의 약한 ETag 생성
+    - 로그인 사용자와 CSRF 쿠키를 포함 (페이지에 사용자 메뉴와 CSRF 토큰이 들어가므로)
+    - CSRF 토큰은 렌더링마다 마스킹 값이 달라 바이트 단위로 같지 않으므로 약한(W/) ETag 사용
+    """
+    user = getattr(request, 'user', None)
+    user_part = f'{user.pk}:{int(user.is_staff)}' if user is not None and user.is_authenticated else 'anonymous'
+    csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    digest = hashlib.md5('\x1f'.join(str(part) for part in (user_part, csrf_cookie) + parts).encode('utf-8'))
+    return f'W/"{digest.hexdigest()}"'
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """
+    요청의 If-None-Match / If-Modified-Since가 현재 상태와 같으면 렌더링 없이 304 응답 반환
+    - If-Match 등 전제 조건이 맞지 않으면 412 응답 반환
+    - 표시할 메시지(django.contrib.messages)가 있으면 페이지를 새로 그려야 하므로 None
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    if len(get_messages(request)):
+        return None
+    timestamp = int(last_modified.timestamp()) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None and response.status_code == 304:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """
+    ETag/Last-Modified 헤더 설정 (사용자별 페이지이므로 private + 매번 재검증)
+    """
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Cookie',))
+    return response
@@ -0,0 +1,196 @@
+# core/instrumentation.py
+import contextvars
+import json
+import logging
+import math
+import threading
+import time
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.backends.django import DjangoTemplates, Template
+
+logger = logging.getLogger(__name__)
+
+# 요청당 측정값 (PerformanceMiddleware가 요청 시작 시 설정)
+_current_timings = contextvars.ContextVar('request_timings', default=None)
+
+# 느린 요청 로그에 남길 최대 SQL 수
+MAX_RECORDED_QUERIES = 50
+
+
+class RequestTimings:
+    """
+    요청 하나에서 측정한 시간 (초 단위)
+    """
+
+    __slots__ = ('db_count', 'db_time', 'template_time', 'scan_time', 'queries')
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.scan_time = 0.0
+        self.queries = []
+
+
+def begin_request():
+    timings = RequestTimings()
+    return timings, _current_timings.set(timings)
+
+
+def end_request(token):
+    _current_timings.reset(token)
+
+
+def current_timings():
+    return _current_timings.get()
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """
+    모든 SQL 실행 시간을 현재 요청의 측정값에 누적 (connection.execute_wrappers에 등록)
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        timings.db_count += 1
+        timings.db_time += duration
+        if len(timings.queries) < MAX_RECORDED_QUERIES:
+            timings.queries.append((sql, duration))
+
+
+def _install_wrapper(connection):
+    # 맨 앞(가장 바깥)에 등록: with connection.execute_wrapper(...) 블록 안에서 연결이 열려도
+    # 블록 종료 시 pop()이 이 래퍼 대신 블록의 래퍼를 제거하도록 함
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, db_execute_wrapper)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _install_wrapper(connection)
+
+
+def install_db_instrumentation():
+    # 이후 생성되는 연결과 이미 열린 연결 모두에 등록
+    connection_created.connect(_on_connection_created, dispatch_uid='core.instrumentation')
+    for connection in connections.all(initialized_only=True):
+        _install_wrapper(connection)
+
+
+class TimedTemplate(Template):
+    """
+    렌더링 시간을 현재 요청의 측정값에 누적하는 템플릿
+    """
+
+    def render(self, context=None, request=None):
+        timings = _current_timings.get()
+        if timings is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    TimedTemplate을 반환하는 Django 템플릿 백엔드 (TEMPLATES의 BACKEND로 사용)
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class LogHistogram:
+    """
+    로그 구간 히스토그램 (마이크로초 단위)
+    - 2배 구간마다 4개씩 나누어 상대 오차 약 19% 이내로 분위수 추정
+    - 메모리는 구간 수(128개)로 고정
+    """
+
+    SUB_BUCKETS = 4
+    BUCKETS = 128
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.total = 0
+        self.max_value = 0
+        self._lock = threading.Lock()
+
+    def record(self, value_us):
+        bucket = int(math.log2(value_us) * self.SUB_BUCKETS) if value_us > 1 else 0
+        bucket = min(bucket, self.BUCKETS - 1)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.total += 1
+            if value_us > self.max_value:
+                self.max_value = value_us
+
+    def percentile(self, percent):
+        # 해당 구간의 상한값 반환
+        if not self.total:
+            return 0
+        threshold = self.total * percent / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return min(2 ** ((bucket + 1) / self.SUB_BUCKETS), self.max_value)
+        return self.max_value
+
+    def summary(self):
+        return {
+            'count': self.total,
+            'p50_us': round(self.percentile(50)),
+            'p90_us': round(self.percentile(90)),
+            'p99_us': round(self.percentile(99)),
+            'max_us': round(self.max_value),
+        }
+
+
+# URL 이름별 응답 시간 히스토그램 (프로세스 단위)
+_histograms = {}
+_histograms_lock = threading.Lock()
+_last_summary_log = time.monotonic()
+
+
+def record_view_time(view_name, value_us):
+    histogram = _histograms.get(view_name)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(view_name, LogHistogram())
+    histogram.record(value_us)
+
+
+def view_time_summaries():
+    """
+    URL 이름별 응답 시간 요약 (count, p50, p90, p99, max)
+    """
+    return {view_name: histogram.summary() for view_name, histogram in list(_histograms.items())}
+
+
+def log_view_time_summaries(interval):
+    """
+    interval초마다 한 번 view_time_summaries()를 로그로 남김 (요청 처리 후 PerformanceMiddleware에서 호출)
+    - 히스토그램은 프로세스별이므로 워커마다 자신의 요약을 기록
+    """
+    global _last_summary_log
+    now = time.monotonic()
+    if now - _last_summary_log < interval:
+        return False
+    with _histograms_lock:
+        if now - _last_summary_log < interval:
+            return False
+        _last_summary_log = now
+    logger.info(f"View time summary: {json.dumps(view_time_summaries(), sort_keys=True)}")
+    return True
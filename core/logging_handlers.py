@@ -0,0 +1,230 @@
+# core/logging_handlers.py
+import atexit
+import copy
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+import weakref
+
+from django.utils.module_loading import import_string
+
+_STOP = object()
+_active_handlers = weakref.WeakSet()
+_default_formatter = logging.Formatter()
+
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    여러 레코드를 한 번에 기록하고 한 번만 flush하는 회전 파일 핸들러
+    - 파일은 처음 기록할 때 열리며 로그 디렉터리가 없으면 생성
+    - 회전된 파일은 gzip으로 압축 (django.log.1.gz)
+    """
+
+    def __init__(self, filename, mode='a', maxBytes=10 * 1024 * 1024, backupCount=5,
+                 encoding='utf-8', delay=True, compress=True):
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay)
+        if compress:
+            self.namer = self._gzip_namer
+            self.rotator = self._gzip_rotator
+
+    @staticmethod
+    def _gzip_namer(name):
+        return f'{name}.gz'
+
+    @staticmethod
+    def _gzip_rotator(source, dest):
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.baseFilename)), exist_ok=True)
+        return super()._open()
+
+    def emit_batch(self, records):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            for record in records:
+                if self.shouldRollover(record):
+                    self.doRollover()
+                self.stream.write(self.format(record) + self.terminator)
+            self.flush()
+        except Exception:
+            for record in records:
+                self.handleError(record)
+
+
+class SecurityEventThrottle:
+    """
+    같은 IP에서 반복되는 동일한 경고를 구간(interval)마다 한 번만 기록
+    - 구간 내 첫 레코드는 그대로 통과, 이후 레코드는 개수만 집계
+    - 구간이 끝나면 "repeated N times" 요약 레코드 생성
+    - client_ip 속성이 있는 WARNING 이상 레코드에만 적용
+    """
+
+    def __init__(self, interval, level=logging.WARNING):
+        self.interval = interval
+        self.level = level
+        self._events = {}
+
+    def filter(self, record, now):
+        ip = getattr(record, 'client_ip', None)
+        if ip is None or record.levelno < self.level:
+            return True
+        key = (ip, record.getMessage())
+        event = self._events.get(key)
+        if event is None:
+            # [구간 시작 시각, 억제된 개수, 마지막 억제 레코드]
+            self._events[key] = [now, 0, None]
+            return True
+        event[1] += 1
+        event[2] = record
+        return False
+
+    def expired_summaries(self, now, force=False):
+        summaries = []
+        for key, (started, suppressed, last_record) in list(self._events.items()):
+            if force or now - started >= self.interval:
+                del self._events[key]
+                if suppressed:
+                    summary = logging.makeLogRecord(last_record.__dict__)
+                    summary.msg = (
+                        f"{last_record.getMessage()} "
+                        f"(repeated {suppressed} more times from IP {key[0]} in last {int(now - started)}s)"
+                    )
+                    summary.args = None
+                    summaries.append(summary)
+        return summaries
+
+
+class QueuedHandler(logging.Handler):
+    """
+    요청 스레드는 큐에 레코드를 넣기만 하고, 백그라운드 스레드가 target 핸들러로 기록하는 핸들러
+    - target: 실제 기록을 담당할 핸들러 클래스 경로 (나머지 인자는 target 생성자로 전달)
+    - batch_size / flush_interval: 한 번에 기록할 최대 레코드 수 / 최대 대기 시간(초)
+    - throttle_interval: 0보다 크면 IP별 반복 경고를 요약 (SecurityEventThrottle)
+    - queue_size: 큐가 가득 차면 레코드를 버리고 개수를 기록
+    """
+
+    def __init__(self, target, batch_size=200, flush_interval=0.5, throttle_interval=0,
+                 queue_size=10000, **target_kwargs):
+        super().__init__()
+        self.target = import_string(target)(**target_kwargs)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.throttle = SecurityEventThrottle(throttle_interval) if throttle_interval else None
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._listener = None
+        self._listener_pid = None
+        self._start_lock = threading.Lock()
+        _active_handlers.add(self)
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        """
+        큐에 넣을 레코드 복사본 (logging.handlers.QueueHandler.prepare와 같은 방식)
+        - 같은 레코드를 처리하는 다른 핸들러에 영향이 없도록 원본은 바꾸지 않음
+        - 다른 스레드에서 포맷할 때 인자 객체가 바뀌지 않도록 메시지를 미리 확정
+        - 예외는 traceback 문자열(exc_text)로 만들고 exc_info는 스레드 사이에 넘기지 않음
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = (self.formatter or _default_formatter).formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def _ensure_listener(self):
+        # 포크된 워커에서는 스레드를 새로 시작
+        if self._listener_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener = threading.Thread(target=self._run, name='log-listener', daemon=True)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    item = self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._write(batch, force_summaries=stopping)
+
+    def _write(self, batch, force_summaries=False):
+        now = time.time()
+        if self.throttle is not None:
+            batch = [record for record in batch if self.throttle.filter(record, now)]
+            batch.extend(self.throttle.expired_summaries(now, force=force_summaries))
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        if dropped:
+            batch.append(logging.makeLogRecord({
+                'name': __name__,
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': f'Log queue full: {dropped} records dropped',
+            }))
+        if not batch:
+            return
+        emit_batch = getattr(self.target, 'emit_batch', None)
+        if emit_batch is not None:
+            emit_batch(batch)
+        else:
+            for record in batch:
+                self.target.handle(record)
+
+    def stop(self, timeout=5):
+        # 남은 레코드를 모두 기록하고 리스너 종료
+        listener = self._listener
+        if listener is None or self._listener_pid != os.getpid() or not listener.is_alive():
+            return
+        self.queue.put(_STOP)
+        listener.join(timeout)
+        self._listener_pid = None
+
+    def close(self):
+        self.stop()
+        self.target.close()
+        super().close()
+
+
+@atexit.register
+def _stop_queued_handlers():
+    for handler in list(_active_handlers):
+        handler.stop()
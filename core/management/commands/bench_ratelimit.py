@@ -0,0 +1,45 @@
+# core/management/commands/bench_ratelimit.py
+import time
+
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = '레이트 리미팅 백엔드의 요청당 오버헤드 측정'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ips', type=int, default=100000, help='서로 다른 IP 수')
+        parser.add_argument('--requests', type=int, default=300000, help='총 요청 수')
+        parser.add_argument(
+            '--backend',
+            action='append',
+            help='측정할 백엔드 경로 (여러 번 지정 가능)',
+        )
+
+    def handle(self, *args, **options):
+        ip_count = options['ips']
+        request_count = options['requests']
+        backends = options['backend'] or [
+            'core.ratelimit.LocMemRateLimitBackend',
+            'core.ratelimit.CacheRateLimitBackend',
+        ]
+
+        ips = [f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}' for i in range(ip_count)]
+
+        for backend_path in backends:
+            backend = import_string(backend_path)()
+            if hasattr(backend, 'cache_alias'):
+                caches[backend.cache_alias].clear()
+
+            start = time.perf_counter()
+            for i in range(request_count):
+                backend.hit(ips[i % ip_count])
+            elapsed = time.perf_counter() - start
+
+            per_request_us = elapsed / request_count * 1_000_000
+            self.stdout.write(
+                f'{backend_path}: {request_count} requests / {ip_count} IPs - '
+                f'{per_request_us:.2f} µs/request'
+            )
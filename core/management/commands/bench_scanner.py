@@ -0,0 +1,57 @@
+# core/management/commands/bench_scanner.py
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.scanner import RULE_SETS, get_scanner
+
+
+def legacy_scan(value, patterns):
+    # 기존 방식: 정규식 목록을 매번 re.search로 순회
+    for pattern in patterns:
+        if re.search(pattern, value, re.IGNORECASE):
+            return True
+    return False
+
+
+class Command(BaseCommand):
+    help = '공격 패턴 스캐너와 기존 정규식 루프의 처리 시간 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=5 * 1024 * 1024, help='폼 본문 크기 (bytes)')
+        parser.add_argument('--fields', type=int, default=4, help='본문을 나눌 필드 수')
+        parser.add_argument('--repeat', type=int, default=3, help='반복 횟수')
+
+    def handle(self, *args, **options):
+        words = ['중고', '상품', '판매합니다', '상태', '좋아요', '직거래', '가능', 'good', 'condition', '택배']
+        rng = random.Random(0)
+        field_size = options['size'] // options['fields']
+
+        def make_field():
+            chunks = []
+            length = 0
+            while length < field_size:
+                word = rng.choice(words)
+                chunks.append(word)
+                length += len(word) + 1
+            return ' '.join(chunks)
+
+        fields = [(f'field{i}', make_field()) for i in range(options['fields'])]
+        legacy_patterns = [rule.pattern for name in ('xss', 'sql') for rule in RULE_SETS[name]]
+        scanner = get_scanner(('xss', 'sql'))
+
+        def run_legacy():
+            return any(legacy_scan(value, legacy_patterns) for _, value in fields)
+
+        def run_scanner():
+            return scanner.scan_items(fields) is not None
+
+        for label, func in (('legacy loop', run_legacy), ('compiled scanner', run_scanner)):
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(f'{label}: best {min(timings) * 1000:.1f} ms over {options["repeat"]} runs')
@@ -0,0 +1,78 @@
+# core/management/commands/gc_media_blobs.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.media import count_references, reclaim_blobs
+from core.models import MediaBlob
+from core.storage import content_addressed_storage
+
+
+class Command(BaseCommand):
+    help = '참조가 없어진 미디어 파일(MediaBlob)을 유예 기간 후 일괄 삭제'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=None,
+                            help='참조가 없어진 뒤 삭제까지 기다릴 시간(초), 기본값 MEDIA_GC_GRACE_PERIOD')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상만 집계')
+        parser.add_argument('--recount', action='store_true', help='먼저 DB의 실제 참조로 참조 수를 다시 계산')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self.recount()
+
+        grace = options['grace']
+        if grace is None:
+            grace = getattr(settings, 'MEDIA_GC_GRACE_PERIOD', 3600)
+        cutoff = timezone.now() - timedelta(seconds=grace)
+        storage = content_addressed_storage()
+
+        reclaimed = reclaimed_bytes = repaired = 0
+        last_id = 0
+        while True:
+            blobs = list(
+                MediaBlob.objects.filter(ref_count__lte=0, updated_at__lt=cutoff, id__gt=last_id)
+                .order_by('id')[:options['batch_size']]
+            )
+            if not blobs:
+                break
+            last_id = blobs[-1].id
+
+            # 참조 수가 어긋난 경우를 대비해 실제 참조를 다시 확인
+            references = count_references([blob.name for blob in blobs])
+            for blob in blobs:
+                if references[blob.name]:
+                    MediaBlob.objects.filter(id=blob.id).update(ref_count=references[blob.name])
+                    repaired += 1
+            candidates = [blob for blob in blobs if not references[blob.name]]
+            if options['dry_run']:
+                reclaimed += len(candidates)
+                continue
+
+            count, size = reclaim_blobs(candidates, cutoff, storage=storage)
+            reclaimed += count
+            reclaimed_bytes += size
+
+        action = 'would reclaim' if options['dry_run'] else 'reclaimed'
+        self.stdout.write(
+            f'{action} {reclaimed} blobs ({reclaimed_bytes / 1024 / 1024:.1f} MB), '
+            f'repaired {repaired} reference counts'
+        )
+
+    def recount(self):
+        counts = count_references()
+        updated = 0
+        for blob in MediaBlob.objects.only('id', 'name', 'ref_count').iterator(chunk_size=2000):
+            actual = counts.pop(blob.name, 0)
+            if blob.ref_count != actual:
+                MediaBlob.objects.filter(id=blob.id).update(ref_count=actual)
+                updated += 1
+        # 참조는 있지만 행이 없는 파일 (기능 도입 전 업로드 등)
+        MediaBlob.objects.bulk_create(
+            [MediaBlob(name=name, ref_count=count) for name, count in counts.items()],
+            batch_size=1000, ignore_conflicts=True,
+        )
+        self.stdout.write(f'recount: {updated} updated, {len(counts)} created')
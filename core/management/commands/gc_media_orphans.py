@@ -0,0 +1,104 @@
+# core/management/commands/gc_media_orphans.py
+import os
+import re
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.media import blob_reclaimed, count_references
+from core.models import MediaBlob
+from core.storage import content_addressed_storage
+
+
+class Command(BaseCommand):
+    help = 'DB에서 참조하지 않는 미디어 파일을 찾아 일괄 삭제 (파일 목록과 참조 확인을 청크 단위로 처리)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=None,
+                            help='이 시간(초) 안에 수정된 파일은 건너뜀, 기본값 MEDIA_GC_GRACE_PERIOD')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 DB에서 확인할 파일 수')
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상만 집계')
+
+    def handle(self, *args, **options):
+        grace = options['grace']
+        if grace is None:
+            grace = getattr(settings, 'MEDIA_GC_GRACE_PERIOD', 3600)
+        self.cutoff = time.time() - grace
+        self.dry_run = options['dry_run']
+        self.storage = content_addressed_storage()
+
+        suffixes = '|'.join(re.escape(suffix) for suffix in getattr(settings, 'MEDIA_GC_SIDECAR_SUFFIXES', []))
+        self.sidecar_re = re.compile(rf'^(?P<root>.+)_(?:{suffixes})\.[^./]+$') if suffixes else None
+        extensions = getattr(settings, 'UPLOAD_ALLOWED_IMAGE_EXTENSIONS', ['jpg', 'jpeg', 'png', 'gif'])
+        self.original_extensions = sorted({ext for ext in extensions} | {ext.upper() for ext in extensions})
+
+        self.scanned = self.reclaimed = self.reclaimed_bytes = 0
+        batch = []
+        for directory in getattr(settings, 'MEDIA_GC_DIRECTORIES', ['product_images', 'profile_images']):
+            for name, stat in self.walk(directory):
+                self.scanned += 1
+                if stat.st_mtime >= self.cutoff:
+                    continue
+                match = self.sidecar_re.match(name) if self.sidecar_re else None
+                if match:
+                    # 파생 파일은 원본이 없을 때만 삭제 (원본이 있으면 원본과 함께 처리)
+                    if not self.original_exists(match.group('root')):
+                        self.remove(name, stat.st_size)
+                    continue
+                batch.append((name, stat.st_size))
+                if len(batch) >= options['batch_size']:
+                    self.process(batch)
+                    batch = []
+        self.process(batch)
+
+        action = 'would reclaim' if self.dry_run else 'reclaimed'
+        self.stdout.write(
+            f'scanned {self.scanned} files, {action} {self.reclaimed} files '
+            f'({self.reclaimed_bytes / 1024 / 1024:.1f} MB)'
+        )
+
+    def walk(self, directory):
+        # os.walk와 달리 디렉터리 전체 목록을 메모리에 만들지 않고 항목을 하나씩 반환
+        root = self.storage.path(directory)
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            try:
+                entries = os.scandir(path)
+            except FileNotFoundError:
+                continue
+            with entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        name = os.path.relpath(entry.path, self.storage.location).replace(os.sep, '/')
+                        yield name, entry.stat(follow_symlinks=False)
+
+    def original_exists(self, root):
+        return any(os.path.exists(self.storage.path(f'{root}.{ext}')) for ext in self.original_extensions)
+
+    def process(self, batch):
+        if not batch:
+            return
+        references = count_references([name for name, _ in batch])
+        orphans = [(name, size) for name, size in batch if not references[name]]
+        if not orphans:
+            return
+        if not self.dry_run:
+            MediaBlob.objects.filter(name__in=[name for name, _ in orphans], ref_count__lte=0).delete()
+        for name, size in orphans:
+            if self.remove(name, size) and not self.dry_run:
+                # 파생 이미지 등 함께 삭제
+                blob_reclaimed.send(sender=MediaBlob, name=name, storage=self.storage)
+
+    def remove(self, name, size):
+        if not self.dry_run:
+            try:
+                os.remove(self.storage.path(name))
+            except FileNotFoundError:
+                return False
+        self.reclaimed += 1
+        self.reclaimed_bytes += size
+        return True
@@ -0,0 +1,260 @@
+# core/media.py
+import logging
+import os
+import queue
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, FileField
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .storage import ContentAddressedStorage, content_addressed_storage
+
+logger = logging.getLogger(__name__)
+
+# 참조가 없는 파일을 삭제한 뒤 발생 (name, storage) - 파생 파일 정리용
+blob_reclaimed = Signal()
+
+# post_init 시점에 로드되지 않은(defer) 필드
+_UNKNOWN = object()
+_tracked_fields = {}
+
+
+def tracked_fields(model):
+    """
+    내용 주소 저장소를 사용하는 파일 필드의 attname 목록
+    """
+    if model not in _tracked_fields:
+        _tracked_fields[model] = [
+            field.attname for field in model._meta.concrete_fields
+            if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+        ]
+    return _tracked_fields[model]
+
+
+def tracked_models():
+    return [model for model in apps.get_models() if tracked_fields(model)]
+
+
+def _file_name(value):
+    name = getattr(value, 'name', value)
+    return name or None
+
+
+def acquire(names):
+    from .models import MediaBlob
+
+    counts = Counter(name for name in names if name)
+    if not counts:
+        return
+    MediaBlob.objects.bulk_create([MediaBlob(name=name) for name in counts], ignore_conflicts=True)
+    for increment, group in _group_by_count(counts).items():
+        MediaBlob.objects.filter(name__in=group).update(ref_count=F('ref_count') + increment, updated_at=timezone.now())
+
+
+def release(names):
+    from .models import MediaBlob
+
+    counts = Counter(name for name in names if name)
+    for decrement, group in _group_by_count(counts).items():
+        MediaBlob.objects.filter(name__in=group).update(ref_count=F('ref_count') - decrement, updated_at=timezone.now())
+    if counts and getattr(settings, 'MEDIA_DELETE_ASYNC', True):
+        # 커밋 후 참조가 0이 된 파일을 백그라운드에서 삭제
+        names = list(counts)
+        transaction.on_commit(lambda: get_deletion_worker().enqueue(names))
+
+
+def _group_by_count(counts):
+    groups = {}
+    for name, count in counts.items():
+        groups.setdefault(count, []).append(name)
+    return groups
+
+
+def _remember(sender, instance, **kwargs):
+    # 로드 시점의 파일 이름 기억 (저장 시 바뀐 파일만 참조 수 갱신)
+    instance._media_names = {
+        attname: _file_name(instance.__dict__[attname]) if attname in instance.__dict__ else _UNKNOWN
+        for attname in tracked_fields(sender)
+    }
+
+
+def _fill_unknown(sender, instance, raw=False, **kwargs):
+    # defer로 로드하지 않았던 필드는 저장 전에 DB 값 조회
+    names = getattr(instance, '_media_names', None)
+    if raw or names is None or instance._state.adding:
+        return
+    unknown = [attname for attname, name in names.items() if name is _UNKNOWN]
+    if unknown:
+        row = sender._base_manager.using(instance._state.db).filter(pk=instance.pk).values(*unknown).first() or {}
+        for attname in unknown:
+            names[attname] = row.get(attname) or None
+
+
+def _update_references(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    names = getattr(instance, '_media_names', {})
+    acquired, released = [], []
+    for field in sender._meta.concrete_fields:
+        if field.attname not in tracked_fields(sender):
+            continue
+        if update_fields is not None and field.name not in update_fields:
+            continue
+        old = None if created else names.get(field.attname)
+        new = _file_name(instance.__dict__.get(field.attname))
+        if old is _UNKNOWN or old == new:
+            continue
+        acquired.append(new)
+        released.append(old)
+        names[field.attname] = new
+    acquire(acquired)
+    release(released)
+    instance._media_names = names
+
+
+def _release_references(sender, instance, **kwargs):
+    names = getattr(instance, '_media_names', {})
+    current = []
+    for attname in tracked_fields(sender):
+        if attname in instance.__dict__:
+            current.append(_file_name(instance.__dict__[attname]))
+        elif names.get(attname) is not _UNKNOWN:
+            current.append(names.get(attname))
+    release(current)
+
+
+def connect_media_tracking():
+    """
+    내용 주소 저장소 필드가 있는 모델에 참조 수 갱신 시그널 연결
+    - 쿼리셋 일괄 삭제도 post_delete가 발생하므로 참조 수가 줄어듦
+    - QuerySet.update()로 파일 필드를 바꾸면 추적되지 않음 (gc_media_blobs --recount로 보정)
+    """
+    for model in tracked_models():
+        uid = f'core.media.{model._meta.label_lower}'
+        post_init.connect(_remember, sender=model, dispatch_uid=uid)
+        pre_save.connect(_fill_unknown, sender=model, dispatch_uid=uid)
+        post_save.connect(_update_references, sender=model, dispatch_uid=uid)
+        post_delete.connect(_release_references, sender=model, dispatch_uid=uid)
+
+
+def count_references(names=None):
+    """
+    DB에서 실제 파일 참조 수 계산 (names를 주면 해당 이름만)
+    """
+    counts = Counter()
+    for model in tracked_models():
+        for attname in tracked_fields(model):
+            queryset = model._base_manager.exclude(**{attname: ''}).exclude(**{f'{attname}__isnull': True})
+            if names is not None:
+                queryset = queryset.filter(**{f'{attname}__in': names})
+            # 파일 이름 인덱스(product_image_idx, user_profile_image_idx)로 조회, 모델 기본 정렬은 불필요
+            counts.update(queryset.order_by().values_list(attname, flat=True).iterator(chunk_size=2000))
+    return counts
+
+
+def reclaim_blobs(blobs, cutoff, file_cutoff=None, storage=None):
+    """
+    참조가 없는 MediaBlob의 파일과 행 삭제 (반환값: (삭제한 파일 수, 바이트 수))
+    - 실제 참조를 다시 확인하고, cutoff 이후 참조 수가 바뀐 행은 남김
+    - file_cutoff(기본값 cutoff) 이후 수정된 파일(업로드 중이거나 다시 업로드된 파일)도 남김
+    """
+    from .models import MediaBlob
+
+    storage = storage or content_addressed_storage()
+    file_cutoff = file_cutoff or cutoff
+    references = count_references([blob.name for blob in blobs])
+    candidates = [blob for blob in blobs if not references[blob.name]]
+    if not candidates:
+        return 0, 0
+
+    MediaBlob.objects.filter(
+        id__in=[blob.id for blob in candidates], ref_count__lte=0, updated_at__lt=cutoff
+    ).delete()
+    remaining = set(MediaBlob.objects.filter(
+        name__in=[blob.name for blob in candidates]
+    ).values_list('name', flat=True))
+
+    reclaimed = reclaimed_bytes = 0
+    for blob in candidates:
+        if blob.name in remaining:
+            continue
+        path = storage.path(blob.name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        # 같은 내용이 다시 업로드되면 저장소가 수정 시각을 갱신함
+        if stat.st_mtime >= file_cutoff.timestamp():
+            continue
+        storage.delete(blob.name)
+        blob_reclaimed.send(sender=MediaBlob, name=blob.name, storage=storage)
+        reclaimed += 1
+        reclaimed_bytes += stat.st_size
+    return reclaimed, reclaimed_bytes
+
+
+class FileDeletionWorker:
+    """
+    참조가 0이 된 파일을 요청 스레드 밖에서 삭제하는 백그라운드 작업자
+    - MEDIA_DELETE_MIN_AGE초 안에 수정된 파일(업로드 중이거나 방금 다시 업로드된 파일)은 남기고
+      gc_media_blobs가 유예 기간 후 정리
+    - 큐가 가득 차면 버림 (gc_media_blobs가 나중에 정리)
+    """
+
+    def __init__(self, queue_size=10000):
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._worker_pid = None
+        self._start_lock = threading.Lock()
+
+    def enqueue(self, names):
+        self._ensure_worker()
+        try:
+            self.queue.put_nowait(list(names))
+        except queue.Full:
+            logger.warning(f"Media deletion queue full, {len(names)} files left for gc_media_blobs")
+
+    def _ensure_worker(self):
+        # 포크된 워커에서는 스레드를 새로 시작
+        if self._worker_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._worker_pid == os.getpid():
+                return
+            threading.Thread(target=self._run, name='media-deletion', daemon=True).start()
+            self._worker_pid = os.getpid()
+
+    def _run(self):
+        from .models import MediaBlob
+
+        while True:
+            names = self.queue.get()
+            try:
+                now = timezone.now()
+                min_age = getattr(settings, 'MEDIA_DELETE_MIN_AGE', 60)
+                blobs = list(MediaBlob.objects.filter(name__in=names, ref_count__lte=0))
+                if blobs:
+                    reclaim_blobs(blobs, now, file_cutoff=now - timedelta(seconds=min_age))
+            except Exception:
+                logger.exception("Media deletion failed")
+            finally:
+                connections.close_all()
+
+
+_deletion_worker = None
+_deletion_worker_lock = threading.Lock()
+
+
+def get_deletion_worker():
+    global _deletion_worker
+    if _deletion_worker is None:
+        with _deletion_worker_lock:
+            if _deletion_worker is None:
+                _deletion_worker = FileDeletionWorker()
+    return _deletion_worker
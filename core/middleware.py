@@ -1,55 +1,153 @@
 # core/middleware.py
-import re
+import asyncio
+import contextvars
+import random
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
-from django.http import HttpResponseForbidden
-from django.urls import reverse
-from django.utils.deprecation import MiddlewareMixin
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponseBadRequest, HttpResponseForbidden
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from . import instrumentation
+from .policy import compile_policies, iter_inspected_values
+from .ratelimit import get_rate_limit_backend
+from .scanner import get_scanner
 
 logger = logging.getLogger(__name__)
 
-class SecurityMiddleware(MiddlewareMixin):
+# 큰 요청 본문 검사를 이벤트 루프 밖에서 처리하기 위한 스레드 풀 (지연 생성)
+_scan_executor = None
+
+
+def get_scan_executor():
+    global _scan_executor
+    if _scan_executor is None:
+        _scan_executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'SECURITY_SCAN_WORKERS', 4),
+            thread_name_prefix='security-scan',
+        )
+    return _scan_executor
+
+
+class SecurityMiddleware:
     """
     보안 관련 기능을 처리하는 미들웨어
     - CSRF 토큰 검증 (Django 내장)
     - XSS 공격 패턴 탐지
     - SQL 인젝션 패턴 탐지
     - Rate Limiting 적용
+    - WSGI(동기)와 ASGI(비동기) 모두에서 스레드 전환 없이 동작
     """
     
+    sync_capable = True
+    async_capable = True
+    
     def __init__(self, get_response):
         self.get_response = get_response
+        # 다음 핸들러가 코루틴이면 비동기 모드로 동작
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # process_view도 코루틴으로 등록해야 Django가 sync_to_async로 감싸지 않음
+            self.process_view = self.aprocess_view
         # 요청 제한 설정 (IP별로 1분당 최대 60회)
-        self.rate_limit = getattr(settings, 'RATE_LIMIT', 60)
-        self.time_window = 60  # 1분
-        self.ip_requests = {}
-        
+        self.rate_limiter = get_rate_limit_backend()
+        self.rate_limit = self.rate_limiter.limit
+        self.time_window = self.rate_limiter.window
+        # URL 이름별 POST 검사 정책 (시작 시 한 번만 구성)
+        self.policies, self.default_policy = compile_policies()
+        # 이 크기 이상의 본문은 스레드 풀에서 검사 (비동기 모드)
+        self.offload_bytes = getattr(settings, 'SECURITY_SCAN_OFFLOAD_BYTES', 64 * 1024)
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.process_request(request)
+        if response is None:
+            response = self.get_response(request)
+        return self.process_response(request, response)
+    
+    async def __acall__(self, request):
+        response = await self.aprocess_request(request)
+        if response is None:
+            response = await self.get_response(request)
+        return self.process_response(request, response)
+    
     def process_request(self, request):
         # IP 주소 가져오기
         ip = self.get_client_ip(request)
         
         # Rate Limiting
-        if self.is_rate_limited(ip):
-            logger.warning(f"Rate limit exceeded for IP: {ip}")
-            return HttpResponseForbidden("요청 횟수가 제한을 초과했습니다. 잠시 후 다시 시도해주세요.")
-        
+        request.rate_limit = self.rate_limiter.hit(ip)
+        return self._rate_limited_response(request, ip)
+    
+    async def aprocess_request(self, request):
+        ip = self.get_client_ip(request)
+        request.rate_limit = await self.rate_limiter.ahit(ip)
+        return self._rate_limited_response(request, ip)
+    
+    def _rate_limited_response(self, request, ip):
+        if request.rate_limit.limited:
+            logger.warning(f"Rate limit exceeded for IP: {ip}", extra={'client_ip': ip})
+            response = HttpResponseForbidden("요청 횟수가 제한을 초과했습니다. 잠시 후 다시 시도해주세요.")
+            response['Retry-After'] = max(0, request.rate_limit.reset - int(time.time()))
+            return response
+        return None
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
         # XSS 및 SQL 인젝션 공격 패턴 탐지
-        if request.method == 'POST':
-            # 로그인, 회원가입 등 민감한 페이지 제외
-            sensitive_urls = [reverse('accounts:login'), reverse('accounts:signup')]
-            if request.path not in sensitive_urls:
-                for key, value in request.POST.items():
-                    if isinstance(value, str):
-                        # XSS 패턴 검출
-                        if self.detect_xss(value):
-                            logger.warning(f"XSS attack attempt detected from IP: {ip}, path: {request.path}")
-                            return HttpResponseForbidden("잠재적인 보안 위협이 감지되었습니다.")
-                        
-                        # SQL 인젝션 패턴 검출
-                        if self.detect_sql_injection(value):
-                            logger.warning(f"SQL injection attempt detected from IP: {ip}, path: {request.path}")
-                            return HttpResponseForbidden("잠재적인 보안 위협이 감지되었습니다.")
+        if request.method != 'POST':
+            return None
+        
+        # URL 이름으로 검사 정책 조회 (로그인, 회원가입 등은 패턴 검사 제외)
+        policy = self.policies.get(request.resolver_match.view_name, self.default_policy)
+        return self.inspect(request, policy)
+    
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'POST':
+            return None
+        
+        policy = self.policies.get(request.resolver_match.view_name, self.default_policy)
+        
+        # 큰 본문은 파싱과 검사 모두 스레드 풀에서 처리해 이벤트 루프를 막지 않음
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+        if content_length < self.offload_bytes:
+            return self.inspect(request, policy)
+        loop = asyncio.get_running_loop()
+        # 작업 스레드에서도 현재 요청의 측정값(scan_time)에 누적되도록 contextvars를 복사해 실행
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(get_scan_executor(), context.run, self.inspect, request, policy)
+    
+    def inspect(self, request, policy):
+        start = time.perf_counter()
+        try:
+            return self._inspect(request, policy)
+        finally:
+            timings = instrumentation.current_timings()
+            if timings is not None:
+                timings.scan_time += time.perf_counter() - start
+    
+    def _inspect(self, request, policy):
+        # request.POST 접근 시 본문이 파싱되며 SecureUploadHandler가 파일을 검사함
+        data = request.POST
+        violation = getattr(request, 'upload_violation', None)
+        if violation:
+            ip = self.get_client_ip(request)
+            logger.warning(f"Rejected upload from IP: {ip}, path: {request.path}, reason: {violation}", extra={'client_ip': ip})
+            return HttpResponseBadRequest("허용되지 않는 파일이거나 업로드 크기 제한을 초과했습니다.")
+        
+        if not policy.scan:
+            return None
+        
+        detected = policy.scanner.scan_items(iter_inspected_values(policy, data))
+        if detected is not None:
+            key, match = detected
+            attack = 'XSS attack' if match.rule_set.startswith('xss') else 'SQL injection'
+            ip = self.get_client_ip(request)
+            logger.warning(f"{attack} attempt detected from IP: {ip}, path: {request.path}, field: {key}, rule: {match.rule}", extra={'client_ip': ip})
+            return HttpResponseForbidden("잠재적인 보안 위협이 감지되었습니다.")
         
         return None
     
@@ -59,6 +157,13 @@ class SecurityMiddleware(MiddlewareMixin):
         response['X-XSS-Protection'] = '1; mode=block'
         response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
         
+        # 레이트 리미팅 상태 헤더
+        rate_limit = getattr(request, 'rate_limit', None)
+        if rate_limit is not None:
+            response['X-RateLimit-Limit'] = rate_limit.limit
+            response['X-RateLimit-Remaining'] = rate_limit.remaining
+            response['X-RateLimit-Reset'] = rate_limit.reset
+        
         return response
     
     def get_client_ip(self, request):
@@ -70,50 +175,87 @@ class SecurityMiddleware(MiddlewareMixin):
         return ip
     
     def is_rate_limited(self, ip):
-        current_time = time.time()
-        
-        # 현재 IP의 요청 기록 가져오기
-        ip_record = self.ip_requests.get(ip, {'count': 0, 'timestamps': []})
-        
-        # 시간 초과된 타임스탬프 제거
-        ip_record['timestamps'] = [ts for ts in ip_record['timestamps'] if current_time - ts < self.time_window]
-        
-        # 현재 요청 추가
-        ip_record['timestamps'].append(current_time)
-        ip_record['count'] = len(ip_record['timestamps'])
-        
-        # 저장
-        self.ip_requests[ip] = ip_record
-        
-        # 제한 초과 여부 확인
-        return ip_record['count'] > self.rate_limit
+        return self.rate_limiter.hit(ip).limited
     
     def detect_xss(self, value):
         # XSS 공격 패턴 탐지
-        xss_patterns = [
-            r'<script.*?>',
-            r'javascript:',
-            r'on\w+\s*=',
-            r'<iframe',
-            r'<img.*?onerror',
-        ]
-        
-        for pattern in xss_patterns:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
+        return get_scanner(('xss',)).scan(value) is not None
     
     def detect_sql_injection(self, value):
         # SQL 인젝션 공격 패턴 탐지
-        sql_patterns = [
-            r'\b(select|insert|update|delete|drop|union|exec|declare)\b.*?',
-            r'--',
-            r'/\*.*?\*/',
-            r';\s*$',
-            r'(AND|OR)\s+\d+\s*=\s*\d+',
-        ]
+        return get_scanner(('sql',)).scan(value) is not None
+
+
+class PerformanceMiddleware:
+    """
+    요청별 성능 측정 미들웨어 (MIDDLEWARE의 맨 앞에 위치)
+    - 전체 처리 시간, ORM 쿼리 수/시간, 템플릿 렌더링 시간, 보안 검사 시간 측정
+    - URL 이름별 히스토그램에 기록하고 PERF_SUMMARY_LOG_INTERVAL초마다 요약을 로그로 남김
+    - PERF_SERVER_TIMING이면 Server-Timing 헤더로도 노출 (DB 쿼리 수/시간이 드러나므로 기본값은 DEBUG)
+    - 느린 요청은 일부를 샘플링하여 SQL과 함께 로그로 남김
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        if not getattr(settings, 'PERF_INSTRUMENTATION', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.server_timing = getattr(settings, 'PERF_SERVER_TIMING', settings.DEBUG)
+        self.summary_log_interval = getattr(settings, 'PERF_SUMMARY_LOG_INTERVAL', 300)
+        self.slow_request_ms = getattr(settings, 'PERF_SLOW_REQUEST_MS', 500)
+        self.slow_sample_rate = getattr(settings, 'PERF_SLOW_REQUEST_SAMPLE_RATE', 0.1)
+        instrumentation.install_db_instrumentation()
+    
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        timings, token = instrumentation.begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            instrumentation.end_request(token)
+        return self.finish(request, response, timings, start)
+    
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        timings, token = instrumentation.begin_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            instrumentation.end_request(token)
+        return self.finish(request, response, timings, start)
+    
+    def finish(self, request, response, timings, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else 'unresolved'
+        instrumentation.record_view_time(view_name, total_ms * 1000)
+        if self.summary_log_interval:
+            instrumentation.log_view_time_summaries(self.summary_log_interval)
+        
+        if self.server_timing:
+            response['Server-Timing'] = (
+                f'total;dur={total_ms:.2f}, '
+                f'db;dur={timings.db_time * 1000:.2f};desc="{timings.db_count} queries", '
+                f'tpl;dur={timings.template_time * 1000:.2f}, '
+                f'scan;dur={timings.scan_time * 1000:.2f}'
+            )
+        
+        # 느린 요청 샘플링 로그
+        if total_ms >= self.slow_request_ms and random.random() < self.slow_sample_rate:
+            slowest = sorted(timings.queries, key=lambda query: query[1], reverse=True)[:5]
+            queries = ' | '.join(f'{duration * 1000:.1f}ms {sql}' for sql, duration in slowest)
+            logger.warning(
+                f"Slow request: {request.method} {request.path} ({view_name}) {total_ms:.1f}ms, "
+                f"db {timings.db_count} queries {timings.db_time * 1000:.1f}ms, "
+                f"template {timings.template_time * 1000:.1f}ms, scan {timings.scan_time * 1000:.1f}ms; "
+                f"slowest SQL: {queries}"
+            )
         
-        for pattern in sql_patterns:
-            if re.search(pattern, value, re.IGNORECASE):
-                return True
-        return False
\ No newline at end of file
+        return response
\ No newline at end of file
@@ -0,0 +1,22 @@
+# core/models.py
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    내용 주소 저장소(core.storage)에 저장된 파일과 참조 수
+    - ref_count: 이 파일을 가리키는 모델 필드 값의 수
+    - updated_at: 참조 수가 마지막으로 바뀐 시각 (GC 유예 기간 기준)
+    """
+    name = models.CharField(max_length=255, unique=True)
+    ref_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # 참조가 없는 파일 조회 (gc_media_blobs)
+            models.Index(fields=['ref_count', 'updated_at'], name='mediablob_unreferenced_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
@@ -0,0 +1,186 @@
+# core/pagination.py
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+CURSOR_SALT = 'core.pagination.cursor'
+
+
+class CursorPage:
+    """
+    키셋 페이지네이션 결과 (django.core.paginator.Page와 비슷한 인터페이스)
+    - next_cursor / previous_cursor: 다음/이전 페이지 요청에 사용할 불투명 토큰
+    """
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    (created_at, id) 같은 정렬 키 기준 키셋(커서) 페이지네이션
+    - COUNT(*)와 OFFSET 없이 WHERE 조건과 LIMIT만으로 페이지를 가져오므로 깊은 페이지도 일정한 비용
+    - 커서는 서명된 토큰이라 클라이언트가 값을 조작할 수 없음 (잘못된 커서는 첫 페이지로 처리)
+    - 모델 인스턴스와 .values() 쿼리셋 모두 지원
+    """
+
+    def __init__(self, queryset, per_page, ordering=('-created_at', '-id')):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [name.lstrip('-') for name in self.ordering]
+        self.descending = [name.startswith('-') for name in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = []
+        for name in self.fields:
+            value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return signing.dumps({'v': values, 'd': direction}, salt=CURSOR_SALT, compress=False)
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = signing.loads(cursor, salt=CURSOR_SALT)
+            values = payload['v']
+            direction = payload['d']
+            if direction not in ('next', 'prev') or len(values) != len(self.fields):
+                return None
+            model_meta = self.queryset.model._meta
+            return [
+                model_meta.get_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ], direction
+        except (signing.BadSignature, ValidationError, KeyError, TypeError, ValueError):
+            return None
+
+    def _keyset_filter(self, values, reverse):
+        # (a, b) 이후 행: a > x OR (a = x AND b > y) (내림차순이면 부등호 반대)
+        condition = Q()
+        for index, name in enumerate(self.fields):
+            descending = self.descending[index] != reverse
+            lookup = f'{name}__lt' if descending else f'{name}__gt'
+            clause = Q(**{lookup: values[index]})
+            for prior in range(index):
+                clause &= Q(**{self.fields[prior]: values[prior]})
+            condition |= clause
+        return condition
+
+    def _ordering(self, reverse):
+        if not reverse:
+            return self.ordering
+        return tuple(name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering)
+
+    def _prepare(self, cursor):
+        # 커서 방향에 맞게 정렬/필터한 쿼리셋 (다음 페이지 존재 여부 확인용으로 1개 더 조회)
+        decoded = self.decode_cursor(cursor) if cursor else None
+        reverse = decoded is not None and decoded[1] == 'prev'
+        queryset = self.queryset.order_by(*self._ordering(reverse))
+        if decoded:
+            queryset = queryset.filter(self._keyset_filter(decoded[0], reverse))
+        return queryset[:self.per_page + 1], decoded, reverse
+
+    def _cursors(self, first, last, has_more, decoded, reverse):
+        if reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, decoded is not None
+        next_cursor = self.encode_cursor(last, 'next') if has_next else None
+        previous_cursor = self.encode_cursor(first, 'prev') if has_previous else None
+        return next_cursor, previous_cursor
+
+    def page(self, cursor=None):
+        queryset, decoded, reverse = self._prepare(cursor)
+        rows = list(queryset)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        if not rows:
+            return CursorPage(rows, self, None, None)
+        return CursorPage(rows, self, *self._cursors(rows[0], rows[-1], has_more, decoded, reverse))
+
+    def stream(self, cursor=None, chunk_size=100):
+        """
+        page()와 같은 페이지를 iterator()로 한 행씩 반환하는 CursorStream
+        """
+        return CursorStream(self, *self._prepare(cursor), chunk_size)
+
+
+class CursorStream:
+    """
+    페이지 행을 리스트로 모으지 않고 순회 (StreamingHttpResponse용)
+    - next_cursor / previous_cursor는 끝까지 순회한 뒤에 정해짐
+    - 이전 페이지는 역순으로 조회하므로 한 페이지 분량을 모아서 뒤집음
+    """
+
+    def __init__(self, paginator, queryset, decoded, reverse, chunk_size):
+        self.paginator = paginator
+        self.queryset = queryset
+        self.decoded = decoded
+        self.reverse = reverse
+        self.chunk_size = chunk_size
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def __iter__(self):
+        per_page = self.paginator.per_page
+        rows = self.queryset.iterator(chunk_size=self.chunk_size)
+        has_more = False
+        if self.reverse:
+            rows = list(rows)
+            has_more = len(rows) > per_page
+            rows = reversed(rows[:per_page])
+        first = last = None
+        for index, row in enumerate(rows):
+            if index == per_page:
+                has_more = True
+                break
+            if first is None:
+                first = row
+            last = row
+            yield row
+        if first is not None:
+            self.next_cursor, self.previous_cursor = self.paginator._cursors(
+                first, last, has_more, self.decoded, self.reverse
+            )
+
+
+def approximate_count(queryset, timeout=None):
+    """
+    쿼리셋의 전체 개수를 캐시하여 반환 (최대 timeout초만큼 오래된 값일 수 있음)
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'PAGINATION_COUNT_CACHE_TIMEOUT', 60)
+    digest = hashlib.md5(str(queryset.query).encode('utf-8')).hexdigest()
+    key = f'pagination:count:{queryset.model._meta.label_lower}:{digest}'
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
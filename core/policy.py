@@ -0,0 +1,85 @@
+# core/policy.py
+from collections import namedtuple
+
+from django.conf import settings
+
+from .scanner import get_scanner
+
+# POST 검사 정책
+# - scan: 검사 여부
+# - fields: 검사할 필드 이름 (None이면 전체 필드)
+# - exclude_fields: 검사에서 제외할 필드 이름
+# - scanner: 적용할 규칙 집합으로 컴파일된 스캐너
+# - max_bytes: 요청당 검사할 최대 바이트 수 (UTF-8 기준, None이면 제한 없음)
+InspectionPolicy = namedtuple('InspectionPolicy', ['scan', 'fields', 'exclude_fields', 'scanner', 'max_bytes'])
+
+# 모든 정책에서 항상 제외되는 필드
+ALWAYS_EXCLUDED_FIELDS = frozenset({'csrfmiddlewaretoken'})
+
+DEFAULT_POLICY = {
+    'scan': True,
+    'fields': None,
+    'exclude_fields': (),
+    'rule_sets': ('xss', 'sql'),
+    'max_bytes': None,
+}
+
+
+def _build_policy(options, base):
+    merged = dict(base)
+    merged.update(options)
+    fields = merged['fields']
+    return InspectionPolicy(
+        scan=merged['scan'],
+        fields=tuple(fields) if fields is not None else None,
+        exclude_fields=ALWAYS_EXCLUDED_FIELDS | frozenset(merged['exclude_fields']),
+        scanner=get_scanner(tuple(merged['rule_sets'])),
+        max_bytes=merged['max_bytes'],
+    )
+
+
+def compile_policies(config=None):
+    """
+    SECURITY_INSPECTION_POLICY 설정을 URL 이름('namespace:name') -> InspectionPolicy 딕셔너리로 변환
+    - 'default' 항목은 나머지 항목의 기본값이자 등록되지 않은 URL의 정책
+    - 반환값: (정책 딕셔너리, 기본 정책)
+    """
+    if config is None:
+        config = getattr(settings, 'SECURITY_INSPECTION_POLICY', {})
+    base = dict(DEFAULT_POLICY)
+    base.update(config.get('default', {}))
+    default_policy = _build_policy({}, base)
+    policies = {
+        view_name: _build_policy(options, base)
+        for view_name, options in config.items()
+        if view_name != 'default'
+    }
+    return policies, default_policy
+
+
+def iter_inspected_values(policy, data):
+    """
+    정책에 따라 검사할 (필드명, 값) 쌍을 생성
+    - max_bytes 예산(UTF-8 바이트)을 넘는 부분은 잘라서 검사하지 않음 (잘린 마지막 문자는 버림)
+    """
+    if policy.fields is not None:
+        items = ((name, data.getlist(name)) for name in policy.fields if name in data)
+    else:
+        items = data.lists()
+
+    budget = policy.max_bytes
+    for name, values in items:
+        if name in policy.exclude_fields:
+            continue
+        for value in values:
+            if not isinstance(value, str):
+                continue
+            if budget is not None:
+                if budget <= 0:
+                    return
+                encoded = value.encode('utf-8')
+                if len(encoded) > budget:
+                    encoded = encoded[:budget]
+                    value = encoded.decode('utf-8', 'ignore')
+                budget -= len(encoded)
+            yield name, value
@@ -0,0 +1,173 @@
+# core/ratelimit.py
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+# 요청 제한 판정 결과
+# - limited: 제한 초과 여부
+# - limit: 윈도우당 허용 요청 수
+# - remaining: 남은 요청 수
+# - reset: 현재 윈도우가 끝나는 시각 (epoch 초)
+RateLimitResult = namedtuple('RateLimitResult', ['limited', 'limit', 'remaining', 'reset'])
+
+
+def sliding_window_estimate(previous_count, current_count, window_start, now, window):
+    """
+    슬라이딩 윈도우 카운터 추정치 계산
+    - 직전 윈도우 요청 수를 경과 비율만큼 감쇠시켜 현재 윈도우 요청 수에 더함
+    """
+    elapsed = (now - window_start) / window
+    return previous_count * (1 - elapsed) + current_count
+
+
+class BaseRateLimitBackend:
+    """
+    레이트 리미팅 백엔드 기본 클래스
+    - 키(IP)당 카운터 2개만 유지하는 슬라이딩 윈도우 카운터 방식
+    """
+
+    def __init__(self, limit=None, window=None):
+        self.limit = limit if limit is not None else getattr(settings, 'RATE_LIMIT', 60)
+        self.window = window if window is not None else getattr(settings, 'RATE_LIMIT_WINDOW', 60)
+
+    def hit(self, key, now=None):
+        raise NotImplementedError('subclasses of BaseRateLimitBackend must provide a hit() method')
+
+    async def ahit(self, key, now=None):
+        # 비동기 버전 (기본 구현은 스레드에서 hit 실행)
+        return await sync_to_async(self.hit, thread_sensitive=False)(key, now)
+
+    def _result(self, estimate, window_start):
+        remaining = max(0, math.floor(self.limit - estimate))
+        return RateLimitResult(
+            limited=estimate > self.limit,
+            limit=self.limit,
+            remaining=remaining,
+            reset=int(window_start + self.window),
+        )
+
+
+class LocMemRateLimitBackend(BaseRateLimitBackend):
+    """
+    프로세스 내 메모리 백엔드
+    - 키당 [윈도우 시작 시각, 직전 윈도우 수, 현재 윈도우 수]만 저장
+    - LRU 방식으로 최대 키 수를 제한하고, 두 윈도우 이상 지난 키는 만료 처리
+    """
+
+    def __init__(self, limit=None, window=None, max_keys=None):
+        super().__init__(limit, window)
+        self.max_keys = max_keys if max_keys is not None else getattr(settings, 'RATE_LIMIT_MAX_KEYS', 100000)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, now=None):
+        now = time.time() if now is None else now
+        window_start = now - (now % self.window)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or window_start - entry[0] >= 2 * self.window:
+                # 새 키이거나 만료된 키
+                entry = [window_start, 0, 0]
+                self._entries[key] = entry
+            elif entry[0] != window_start:
+                # 바로 다음 윈도우로 넘어간 경우 현재 카운트를 직전 카운트로 이동
+                entry[0], entry[1], entry[2] = window_start, entry[2], 0
+            entry[2] += 1
+            self._entries.move_to_end(key)
+            self._evict(window_start)
+            estimate = sliding_window_estimate(entry[1], entry[2], window_start, now, self.window)
+
+        return self._result(estimate, window_start)
+
+    async def ahit(self, key, now=None):
+        # 잠금 구간이 매우 짧아 이벤트 루프에서 바로 실행해도 블로킹되지 않음
+        return self.hit(key, now)
+
+    def _evict(self, window_start):
+        # 가장 오래 사용되지 않은 키부터 만료 키와 초과 키를 제거
+        entries = self._entries
+        while entries:
+            oldest_key, oldest = next(iter(entries.items()))
+            if len(entries) > self.max_keys or window_start - oldest[0] >= 2 * self.window:
+                del entries[oldest_key]
+            else:
+                break
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class CacheRateLimitBackend(BaseRateLimitBackend):
+    """
+    Django 캐시 프레임워크 기반 공유 백엔드
+    - 모든 워커가 같은 카운터를 보므로 워커 수와 관계없이 제한이 적용됨
+    - RATE_LIMIT_CACHE 별칭의 캐시 사용 (운영: Redis, 테스트: locmem)
+    """
+
+    key_prefix = 'ratelimit'
+
+    def __init__(self, limit=None, window=None, cache_alias=None):
+        super().__init__(limit, window)
+        self.cache_alias = cache_alias or getattr(settings, 'RATE_LIMIT_CACHE', 'default')
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    def _keys(self, key, window_start):
+        window_index = int(window_start // self.window)
+        return (
+            f'{self.key_prefix}:{key}:{window_index}',
+            f'{self.key_prefix}:{key}:{window_index - 1}',
+        )
+
+    def hit(self, key, now=None):
+        now = time.time() if now is None else now
+        window_start = now - (now % self.window)
+        current_key, previous_key = self._keys(key, window_start)
+        cache = self.cache
+
+        # 윈도우 두 개 동안만 유지되면 충분함
+        cache.add(current_key, 0, timeout=2 * self.window)
+        try:
+            current_count = cache.incr(current_key)
+        except ValueError:
+            # add와 incr 사이에 키가 만료된 경우
+            cache.set(current_key, 1, timeout=2 * self.window)
+            current_count = 1
+        previous_count = cache.get(previous_key, 0)
+
+        estimate = sliding_window_estimate(previous_count, current_count, window_start, now, self.window)
+        return self._result(estimate, window_start)
+
+    async def ahit(self, key, now=None):
+        now = time.time() if now is None else now
+        window_start = now - (now % self.window)
+        current_key, previous_key = self._keys(key, window_start)
+        cache = self.cache
+
+        await cache.aadd(current_key, 0, timeout=2 * self.window)
+        try:
+            current_count = await cache.aincr(current_key)
+        except ValueError:
+            await cache.aset(current_key, 1, timeout=2 * self.window)
+            current_count = 1
+        previous_count = await cache.aget(previous_key, 0)
+
+        estimate = sliding_window_estimate(previous_count, current_count, window_start, now, self.window)
+        return self._result(estimate, window_start)
+
+
+def get_rate_limit_backend():
+    """
+    RATE_LIMIT_BACKEND 설정에 지정된 백엔드 인스턴스 생성
+    """
+    backend_path = getattr(settings, 'RATE_LIMIT_BACKEND', 'core.ratelimit.LocMemRateLimitBackend')
+    return import_string(backend_path)()
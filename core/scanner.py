@@ -0,0 +1,131 @@
+# core/scanner.py
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# 탐지 규칙
+# - name: 규칙 이름 (로그에 기록)
+# - pattern: 정규식 (re.IGNORECASE로 컴파일)
+# - literals: 패턴이 일치하려면 반드시 하나 이상 포함되어야 하는 소문자 문자열 (사전 필터용)
+Rule = namedtuple('Rule', ['name', 'pattern', 'literals'])
+
+# 탐지 결과 (rule_set: 규칙 집합 이름, rule: 일치한 규칙 이름)
+ScanMatch = namedtuple('ScanMatch', ['rule_set', 'rule'])
+
+RULE_SETS = {
+    # SecurityMiddleware.detect_xss
+    'xss': (
+        Rule('script_tag', r'<script.*?>', ('<script',)),
+        Rule('javascript_uri', r'javascript:', ('javascript:',)),
+        Rule('event_handler', r'on\w+\s*=', ('=',)),
+        Rule('iframe_tag', r'<iframe', ('<iframe',)),
+        Rule('img_onerror', r'<img.*?onerror', ('onerror',)),
+    ),
+    # SecurityMiddleware.detect_sql_injection
+    'sql': (
+        Rule(
+            'sql_keyword',
+            r'\b(select|insert|update|delete|drop|union|exec|declare)\b.*?',
+            ('select', 'insert', 'update', 'delete', 'drop', 'union', 'exec', 'declare'),
+        ),
+        Rule('sql_comment', r'--', ('--',)),
+        Rule('block_comment', r'/\*.*?\*/', ('/*',)),
+        Rule('trailing_semicolon', r';\s*$', (';',)),
+        Rule('tautology', r'(AND|OR)\s+\d+\s*=\s*\d+', ('=',)),
+    ),
+    # core.utils.detect_xss
+    'xss_strict': (
+        Rule('script_block', r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>', ('<script',)),
+        Rule('javascript_uri', r'javascript\s*:', ('javascript',)),
+        Rule('event_handler', r'on\w+\s*=', ('=',)),
+        Rule('data_uri', r'data\s*:', ('data',)),
+        Rule('iframe_tag', r'<iframe', ('<iframe',)),
+        Rule('embed_tag', r'<embed', ('<embed',)),
+        Rule('object_tag', r'<object', ('<object',)),
+        Rule('svg_tag', r'<svg', ('<svg',)),
+        Rule('document_access', r'document\.', ('document.',)),
+        Rule('window_access', r'window\.', ('window.',)),
+        Rule('eval_call', r'eval\(', ('eval(',)),
+        Rule('set_timeout', r'setTimeout\(', ('settimeout(',)),
+        Rule('set_interval', r'setInterval\(', ('setinterval(',)),
+        Rule('function_constructor', r'new\s+Function\(', ('function(',)),
+    ),
+}
+
+# re.IGNORECASE에서는 ASCII 문자와 같게 취급되지만 str.lower()로는 같아지지 않는 문자
+# (ſ -> s, ı/İ -> i). 이 문자가 있으면 사전 필터를 건너뛰고 전체 규칙으로 검사함
+_CASEFOLD_EXCEPTIONS = ('ſ', 'ı', 'İ')
+
+
+class PatternScanner:
+    """
+    공격 패턴 스캐너
+    - 여러 규칙 집합을 하나의 정규식(named group alternation)으로 미리 컴파일
+    - 리터럴 사전 필터로 후보 규칙을 고른 뒤 값을 한 번만 탐색
+    - 처음 일치한 규칙을 반환
+    """
+
+    def __init__(self, rule_sets=('xss', 'sql')):
+        self.rule_sets = tuple(rule_sets)
+        self._rules = []
+        for rule_set in self.rule_sets:
+            for rule in RULE_SETS[rule_set]:
+                self._rules.append((rule_set, rule))
+        self._literal_index = {}
+        for index, (_, rule) in enumerate(self._rules):
+            for literal in rule.literals:
+                self._literal_index.setdefault(literal, []).append(index)
+        self._all = tuple(range(len(self._rules)))
+
+    @lru_cache(maxsize=256)
+    def _compiled(self, indexes):
+        # 후보 규칙 조합별 정규식 (그룹 이름 r<번호>로 어떤 규칙이 일치했는지 식별)
+        alternation = '|'.join(f'(?P<r{i}>{self._rules[i][1].pattern})' for i in indexes)
+        return re.compile(alternation, re.IGNORECASE)
+
+    def _candidates(self, value):
+        if any(ch in value for ch in _CASEFOLD_EXCEPTIONS):
+            return self._all
+        lowered = value.lower()
+        found = set()
+        for literal, indexes in self._literal_index.items():
+            if literal in lowered:
+                found.update(indexes)
+        return tuple(sorted(found))
+
+    def scan(self, value):
+        """
+        값을 검사하여 처음 일치한 규칙의 ScanMatch 반환 (없으면 None)
+        """
+        if not value:
+            return None
+        candidates = self._candidates(value)
+        if not candidates:
+            return None
+        match = self._compiled(candidates).search(value)
+        if match is None:
+            return None
+        for index in candidates:
+            if match.group(f'r{index}') is not None:
+                rule_set, rule = self._rules[index]
+                return ScanMatch(rule_set, rule.name)
+        return None
+
+    def scan_items(self, items):
+        """
+        (필드명, 값) 목록을 검사하여 처음 일치한 (필드명, ScanMatch) 반환 (없으면 None)
+        """
+        for key, value in items:
+            if isinstance(value, str):
+                result = self.scan(value)
+                if result is not None:
+                    return key, result
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_scanner(rule_sets=('xss', 'sql')):
+    """
+    규칙 집합 조합별로 공유되는 스캐너 인스턴스 반환
+    """
+    return PatternScanner(tuple(rule_sets))
@@ -0,0 +1,54 @@
+# core/serialization.py
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json 모듈 사용
+    orjson = None
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def dumps(value):
+    """
+    값을 JSON bytes로 변환 (orjson이 설치되어 있으면 orjson 사용)
+    - datetime, Decimal, UUID 등은 DjangoJSONEncoder와 같은 방식으로 처리
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_encoder.default)
+    return _encoder.encode(value).encode('utf-8')
+
+
+def stream_json_object(items, batch_size=100):
+    """
+    {"키": 값, ...} JSON 객체를 조각(bytes)으로 나누어 생성 (StreamingHttpResponse용)
+    - items: (키, 값) 순서열 - 값이 리스트나 제너레이터면 JSON 배열로 batch_size개씩 묶어 내보냄
+    - 값은 callable로 전달할 수 있으며, 앞선 항목을 모두 내보낸 뒤에 호출됨 (커서처럼 순회 후 정해지는 값)
+    """
+    yield b'{'
+    for index, (key, value) in enumerate(items):
+        yield (b',' if index else b'') + dumps(key) + b':'
+        if callable(value):
+            value = value()
+        if isinstance(value, (list, tuple)) or hasattr(value, '__next__'):
+            yield from _stream_array(value, batch_size)
+        else:
+            yield dumps(value)
+    yield b'}'
+
+
+def _stream_array(values, batch_size):
+    yield b'['
+    batch = []
+    separator = b''
+    for value in values:
+        batch.append(dumps(value))
+        if len(batch) >= batch_size:
+            yield separator + b','.join(batch)
+            separator = b','
+            batch = []
+    if batch:
+        yield separator + b','.join(batch)
+    yield b']'
@@ -0,0 +1,63 @@
+# core/storage.py
+import hashlib
+import os
+import tempfile
+from functools import lru_cache
+
+from django.core.files.storage import FileSystemStorage
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    파일 내용의 SHA-256 해시로 이름을 정하는 저장소
+    - upload_to 디렉터리 아래 해시 앞 4자리로 두 단계 분산: product_images/ab/cd/abcd...ef.jpg
+    - 같은 내용은 한 번만 저장 (이미 있으면 새로 쓰지 않고 기존 이름 반환)
+    - 해시는 임시 파일에 쓰면서 함께 계산하므로 파일을 다시 읽지 않음
+    - 참조 수는 core.media가 MediaBlob에 기록하며, 파일 삭제는 gc_media_blobs 명령이 담당
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # 최종 이름은 _save에서 내용으로 결정되므로 이름 충돌 처리를 하지 않음
+        return name
+
+    def blob_name(self, name, digest):
+        directory = os.path.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+        return '/'.join(part for part in (directory, digest[:2], digest[2:4], f'{digest}{ext}') if part)
+
+    def _save(self, name, content):
+        directory = self.path(os.path.dirname(name) or '.')
+        os.makedirs(directory, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+
+            final_name = self.blob_name(name, digest.hexdigest())
+            final_path = self.path(final_name)
+            if os.path.exists(final_path):
+                # 중복 업로드: 기존 파일을 사용하고 GC 유예 기간이 다시 시작되도록 수정 시각 갱신
+                os.utime(final_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, final_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return final_name
+
+
+@lru_cache(maxsize=None)
+def content_addressed_storage():
+    """
+    FileField(storage=...)에 지정하는 저장소 (마이그레이션에는 함수 경로로 기록됨)
+    """
+    return ContentAddressedStorage()
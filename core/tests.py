@@ -0,0 +1,375 @@
+import asyncio
+import logging
+import re
+import sys
+import time
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.base import BaseHandler
+from django.db import connection
+from django.db.models import QuerySet
+from django.http import HttpResponse, QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from chat.models import ChatRoom
+from chat.summaries import record_message
+from core import instrumentation, media
+from core.logging_handlers import QueuedHandler
+from core.middleware import PerformanceMiddleware, SecurityMiddleware
+from core.policy import compile_policies, iter_inspected_values
+from core.models import MediaBlob
+from products.models import Category, Product
+from products.viewcounts import get_view_count_buffer
+from reports.models import Report
+
+SLOW_EMIT_SECONDS = 0.2
+
+
+class SlowHandler(logging.Handler):
+    # 느린 디스크/원격 로그 서버를 흉내 내는 target 핸들러
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        time.sleep(SLOW_EMIT_SECONDS)
+        self.records.append(record.getMessage())
+
+
+class QueuedHandlerTests(SimpleTestCase):
+    def setUp(self):
+        self.handler = QueuedHandler(target='core.tests.SlowHandler', flush_interval=0.05)
+        self.logger = logging.getLogger('core.tests.queued')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def test_request_latency_does_not_depend_on_log_io(self):
+        def view(request):
+            for index in range(5):
+                self.logger.info(f'request log {index}')
+            return HttpResponse('ok')
+
+        start = time.perf_counter()
+        response = view(RequestFactory().get('/'))
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(response.status_code, 200)
+        # 바로 기록했다면 5 * 0.2초가 걸렸을 요청이 한 번의 기록 시간보다도 빨리 끝남
+        self.assertLess(elapsed, SLOW_EMIT_SECONDS)
+
+        # 종료 시 큐에 남은 레코드가 모두 target에 기록됨
+        self.handler.stop()
+        self.assertEqual(self.handler.target.records, [f'request log {index}' for index in range(5)])
+
+    def test_full_queue_drops_records_instead_of_blocking(self):
+        handler = QueuedHandler(target='core.tests.SlowHandler', queue_size=1)
+        # 리스너가 바쁜 동안 큐가 가득 차도 emit은 기다리지 않음
+        handler._ensure_listener()
+        start = time.perf_counter()
+        for index in range(20):
+            handler.emit(logging.makeLogRecord({'msg': f'record {index}', 'levelno': logging.INFO}))
+        self.assertLess(time.perf_counter() - start, SLOW_EMIT_SECONDS)
+        self.assertGreater(handler.dropped, 0)
+        handler.close()
+
+        # 버린 레코드 수는 경고 레코드로 빠짐 없이 기록됨
+        written = [message for message in handler.target.records if message.startswith('record ')]
+        dropped = [
+            int(re.search(r'(\d+) records dropped', message).group(1))
+            for message in handler.target.records if 'records dropped' in message
+        ]
+        self.assertEqual(len(written) + sum(dropped), 20)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_prepare_copies_the_record(self):
+        try:
+            raise ValueError('잘못된 값')
+        except ValueError:
+            record = self.logger.makeRecord(
+                self.logger.name, logging.ERROR, __file__, 0, 'failed: %s', ('args',), sys.exc_info()
+            )
+        exc_info = record.exc_info
+
+        prepared = self.handler.prepare(record)
+
+        # 같은 레코드를 받는 다른 핸들러가 보는 원본은 그대로
+        self.assertEqual((record.msg, record.args, record.exc_info), ('failed: %s', ('args',), exc_info))
+        self.assertIsNot(prepared, record)
+        self.assertEqual((prepared.msg, prepared.args, prepared.exc_info), ('failed: args', None, None))
+        self.assertIn("ValueError: 잘못된 값", prepared.exc_text)
+        self.assertIn("ValueError: 잘못된 값", logging.Formatter().format(prepared))
+
+
+class DbInstrumentationTests(SimpleTestCase):
+    def test_wrapper_installed_inside_execute_wrapper_block_survives_pop(self):
+        def outer_wrapper(execute, sql, params, many, context):
+            return execute(sql, params, many, context)
+
+        saved = list(connection.execute_wrappers)
+        connection.execute_wrappers[:] = []
+        try:
+            # 블록 안에서 연결이 새로 열린 경우 (connection_created 시점에 등록)
+            with connection.execute_wrapper(outer_wrapper):
+                instrumentation._install_wrapper(connection)
+            self.assertEqual(connection.execute_wrappers, [instrumentation.db_execute_wrapper])
+        finally:
+            connection.execute_wrappers[:] = saved
+
+
+class InspectionPolicyTests(SimpleTestCase):
+    def test_max_bytes_counts_utf8_bytes(self):
+        _, policy = compile_policies({'default': {'max_bytes': 10}})
+        data = QueryDict(mutable=True)
+        data.setlist('title', ['가나다라마'])
+        data.setlist('description', ['abc'])
+
+        # 한글은 한 글자에 3바이트: 10바이트 예산에서 세 글자(9바이트)까지만 검사하고 잘린 글자는 버림
+        self.assertEqual(list(iter_inspected_values(policy, data)), [('title', '가나다')])
+
+        data.setlist('title', ['가나다'])
+        self.assertEqual(list(iter_inspected_values(policy, data)), [('title', '가나다'), ('description', 'a')])
+
+
+class PerformanceMiddlewareTests(SimpleTestCase):
+    def respond(self, **settings_overrides):
+        with override_settings(**settings_overrides):
+            middleware = PerformanceMiddleware(lambda request: HttpResponse('ok'))
+            return middleware(RequestFactory().get('/'))
+
+    def test_server_timing_is_opt_in(self):
+        self.assertNotIn('Server-Timing', self.respond(PERF_SERVER_TIMING=False))
+        self.assertIn('db;dur=', self.respond(PERF_SERVER_TIMING=True)['Server-Timing'])
+
+    def test_view_time_summaries_are_logged_periodically(self):
+        with mock.patch.object(instrumentation, '_last_summary_log', time.monotonic() - 600):
+            with self.assertLogs('core.instrumentation', 'INFO') as logs:
+                self.respond(PERF_SUMMARY_LOG_INTERVAL=300)
+            self.assertIn('"unresolved": {"count": ', logs.output[0])
+            # 간격 안에서는 다시 기록하지 않음
+            self.assertFalse(instrumentation.log_view_time_summaries(300))
+
+
+class SyncOnlyMiddleware:
+    # 비동기를 지원하지 않는 미들웨어 (어댑터 감지 확인용)
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+
+class AsyncMiddlewareTests(SimpleTestCase):
+    @staticmethod
+    def adapted_project_handlers(middleware=None):
+        # load_middleware가 sync_to_async로 감싼 이 프로젝트의 미들웨어/메서드 (Django 내장 미들웨어는 제외)
+        with mock.patch('django.core.handlers.base.sync_to_async', wraps=sync_to_async) as adapt:
+            if middleware is None:
+                BaseHandler().load_middleware(is_async=True)
+            else:
+                with override_settings(MIDDLEWARE=middleware):
+                    BaseHandler().load_middleware(is_async=True)
+        adapted = []
+        for call in adapt.call_args_list:
+            handler = call.args[0]
+            owner = getattr(handler, '__self__', handler)
+            if not type(owner).__module__.startswith('django.'):
+                adapted.append(type(owner).__qualname__)
+        return adapted
+
+    def test_async_middleware_chain_needs_no_thread_adaptation(self):
+        self.assertEqual(self.adapted_project_handlers(), [])
+        # 비동기를 지원하지 않는 미들웨어가 끼면 앞의 SecurityMiddleware도 동기 모드로 바뀌어 감지됨
+        self.assertIn('SecurityMiddleware', self.adapted_project_handlers(
+            settings.MIDDLEWARE + ['core.tests.SyncOnlyMiddleware']
+        ))
+
+    @override_settings(SECURITY_SCAN_OFFLOAD_BYTES=1)
+    def test_offloaded_scan_time_is_recorded(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = SecurityMiddleware(get_response)
+        request = RequestFactory().post(reverse('products:product_create'), {'title': '상품' * 1000})
+        request.resolver_match = resolve(request.path)
+
+        async def scan():
+            timings, token = instrumentation.begin_request()
+            try:
+                response = await middleware.aprocess_view(request, None, (), {})
+            finally:
+                instrumentation.end_request(token)
+            return response, timings
+
+        response, timings = asyncio.run(scan())
+        self.assertIsNone(response)
+        # 스레드 풀에서 검사해도 요청의 측정값에 반영됨
+        self.assertGreater(timings.scan_time, 0)
+
+
+class MediaRefCountTests(TestCase):
+    @override_settings(MEDIA_DELETE_ASYNC=False)
+    def test_ref_count_changes_restart_gc_grace_period(self):
+        name = 'product_images/test.jpg'
+        media.acquire([name])
+        # 참조 수가 마지막으로 바뀐 지 오래된 파일
+        MediaBlob.objects.filter(name=name).update(updated_at=timezone.now() - timedelta(days=1))
+
+        media.release([name])
+
+        blob = MediaBlob.objects.get(name=name)
+        self.assertEqual(blob.ref_count, 0)
+        # 유예 기간은 참조 수가 0이 된 시점부터 계산
+        self.assertGreater(blob.updated_at, timezone.now() - timedelta(minutes=1))
+
+    def test_reference_check_uses_file_name_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('이 검사는 SQLite 실행 계획 형식을 기준으로 합니다.')
+        names = [f'product_images/{index}.jpg' for index in range(1000)]
+        with CaptureQueriesContext(connection) as queries:
+            media.count_references(names)
+
+        # 배치마다 상품/사용자 테이블 전체를 읽지 않고 파일 이름 인덱스로 조회
+        plans = {}
+        for query in queries.captured_queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plans[query['sql']] = ' '.join(row[-1] for row in cursor.fetchall())
+        indexes = ['product_image_idx', 'user_profile_image_idx']
+        used = {name for plan in plans.values() for name in indexes if name in plan}
+        self.assertEqual(used, {'product_image_idx', 'user_profile_image_idx'})
+        for sql, plan in plans.items():
+            self.assertNotRegex(plan, r'\bSCAN (products_product|accounts_user)\b(?! USING)', sql)
+            self.assertNotIn('TEMP B-TREE', plan, sql)
+
+
+# 실행 계획 단계 중 테이블을 순차로 읽는 단계 (SCAN ... USING INDEX는 인덱스 순서로 읽으므로 제외)
+SCAN_RE = re.compile(r'\bSCAN (\S+)(.*)$')
+# 전체를 읽는 것이 정상인 작은 테이블 (카테고리 목록)
+SCAN_ALLOWED = {'products_category'}
+VIEW_MODULES = ['accounts.views', 'chat.views', 'products.views', 'reports.views']
+
+
+def evaluate_context(request, template_name, context=None, *args, **kwargs):
+    # 템플릿 대신 컨텍스트의 쿼리셋/페이지를 평가해 뷰가 실행하는 쿼리를 모두 발생시킴
+    for value in (context or {}).values():
+        if isinstance(value, QuerySet) or hasattr(value, 'object_list'):
+            list(value)
+    response = HttpResponse(template_name)
+    response.context_data = context
+    return response
+
+
+class QueryPlanTests(TestCase):
+    """
+    주요 화면의 뷰가 실제로 실행하는 쿼리의 EXPLAIN QUERY PLAN에 테이블 전체 스캔이 없는지 확인 (SQLite)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.seller = User.objects.create_user(username='seller', password='password')
+        cls.buyer = User.objects.create_user(username='buyer', password='password')
+        cls.staff = User.objects.create_user(username='staff', password='password', is_staff=True)
+        cls.category = Category.objects.create(name='전자기기', slug='electronics')
+        # 목록/내 상품 화면에 다음 페이지가 생기도록 페이지 크기보다 많이 생성
+        cls.products = [
+            Product.objects.create(
+                title=f'상품 {index}', description='설명', price=1000, seller=cls.seller,
+                category=cls.category, image='product_images/test.jpg'
+            )
+            for index in range(14)
+        ]
+        cls.room = ChatRoom.objects.create(initiator=cls.buyer, counterpart=cls.seller, product=cls.products[0])
+        cls.room.participants.add(cls.buyer, cls.seller)
+        cls.messages = [record_message(cls.room.id, cls.buyer, f'메시지 {index}') for index in range(3)]
+        Report.objects.create(reporter=cls.buyer, target_product=cls.products[0], reason='fraud', detail='신고')
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('이 검사는 SQLite 실행 계획 형식을 기준으로 합니다.')
+        for module in VIEW_MODULES:
+            patcher = mock.patch(f'{module}.render', evaluate_context)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def table_scans(sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [row[-1] for row in cursor.fetchall()]
+        scans = []
+        for line in plan:
+            match = SCAN_RE.search(line)
+            if match and 'USING' not in match.group(2) and match.group(1) not in SCAN_ALLOWED | {'CONSTANT'}:
+                scans.append(match.group(1))
+        return scans
+
+    def assertNoTableScans(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        for query in queries.captured_queries:
+            if query['sql'].startswith('SELECT'):
+                scans = self.table_scans(query['sql'])
+                self.assertEqual(scans, [], f"{url}: full scan of {', '.join(scans)}\n{query['sql']}")
+        return response
+
+    def test_product_pages(self):
+        self.client.force_login(self.seller)
+        response = self.assertNoTableScans(reverse('products:product_list'))
+        next_cursor = response.context_data['page_obj'].next_cursor
+        self.assertIsNotNone(next_cursor)
+        self.assertNoTableScans(reverse('products:product_list') + f'?cursor={next_cursor}')
+        self.assertNoTableScans(reverse('products:product_list') + '?category=electronics')
+        self.assertNoTableScans(reverse('products:product_list_api'))
+        self.assertNoTableScans(reverse('products:product_detail', args=[self.products[0].id]))
+        get_view_count_buffer().flush()
+        self.assertNoTableScans(reverse('products:my_products'))
+        self.assertNoTableScans(reverse('products:my_products') + '?status=sold')
+        self.assertNoTableScans(reverse('accounts:profile'))
+
+    def test_available_products_use_partial_indexes_with_bound_status(self):
+        # 캡처한 SQL은 값이 채워진 문자열이므로 실제 실행과 같이 status를 바인딩한 채로 실행 계획 확인
+        available = Product.objects.filter(status='available').order_by('-created_at', '-id')
+        for queryset, index in [
+            (available, 'product_available_recent_idx'),
+            (available.filter(category=self.category), 'product_available_category_idx'),
+        ]:
+            sql, params = queryset[:13].query.sql_with_params()
+            self.assertIn('available', params)
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = ' '.join(row[-1] for row in cursor.fetchall())
+            self.assertIn(index, plan)
+            self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_chat_pages(self):
+        self.client.force_login(self.seller)
+        self.assertNoTableScans(reverse('chat:chat_list'))
+        self.assertNoTableScans(reverse('chat:chat_room', args=[self.room.id]))
+        self.assertNoTableScans(
+            reverse('chat:chat_history', args=[self.room.id]) + f'?before={self.messages[-1].id}'
+        )
+
+    def test_report_pages(self):
+        self.client.force_login(self.buyer)
+        self.assertNoTableScans(reverse('reports:my_reports'))
+        self.client.force_login(self.staff)
+        response = self.assertNoTableScans(reverse('reports:admin_report_list'))
+        self.assertEqual(len(response.context_data['reports']), 1)
+        self.assertNoTableScans(reverse('reports:admin_report_list') + '?status=pending')
@@ -0,0 +1,76 @@
+# core/uploadhandlers.py
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+# 허용 이미지 형식의 시그니처 (매직 바이트)
+IMAGE_SIGNATURES = (
+    b'\xff\xd8\xff',  # JPEG
+    b'\x89PNG\r\n\x1a\n',  # PNG
+    b'GIF87a',  # GIF
+    b'GIF89a',  # GIF
+)
+SIGNATURE_LENGTH = max(len(signature) for signature in IMAGE_SIGNATURES)
+
+
+class SecureUploadHandler(FileUploadHandler):
+    """
+    업로드 스트림을 청크 단위로 검사하는 핸들러
+    - 파일 확장자, 크기, 이미지 매직 바이트를 메모리/임시 파일에 쌓이기 전에 확인
+    - 위반 시 나머지 본문을 읽지 않고 업로드를 중단하며 request.upload_violation에 사유 기록
+    - FILE_UPLOAD_HANDLERS의 맨 앞에 두어야 함
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_size = getattr(settings, 'UPLOAD_MAX_IMAGE_SIZE', 5 * 1024 * 1024)
+        self.allowed_extensions = set(getattr(settings, 'UPLOAD_ALLOWED_IMAGE_EXTENSIONS', ['jpg', 'jpeg', 'png', 'gif']))
+        self.header = b''
+
+    def has_image_signature(self):
+        return any(self.header.startswith(signature) for signature in IMAGE_SIGNATURES)
+
+    def reject(self, reason):
+        # 업로드 중단 (이후 SecurityMiddleware가 요청을 거부)
+        if self.request is not None:
+            self.request.upload_violation = reason
+        raise StopUpload(connection_reset=True)
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        # 파일 + 일반 필드 허용량을 넘는 본문은 파싱 자체를 하지 않음
+        max_body = self.max_size + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+        if content_length > max_body:
+            if self.request is not None:
+                self.request.upload_violation = f'request body too large ({content_length} bytes)'
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.header = b''
+
+        ext = file_name.rsplit('.', 1)[-1].lower() if '.' in file_name else ''
+        if ext not in self.allowed_extensions:
+            self.reject(f'extension not allowed ({field_name}: {ext or "none"})')
+        if content_length is not None and content_length > self.max_size:
+            self.reject(f'file too large ({field_name}: {content_length} bytes)')
+
+    def receive_data_chunk(self, raw_data, start):
+        # 누적 크기 확인
+        if start + len(raw_data) > self.max_size:
+            self.reject(f'file too large ({self.field_name}: over {self.max_size} bytes)')
+
+        # 파일 앞부분으로 이미지 형식 확인
+        if len(self.header) < SIGNATURE_LENGTH:
+            self.header += raw_data[:SIGNATURE_LENGTH - len(self.header)]
+            if len(self.header) >= SIGNATURE_LENGTH and not self.has_image_signature():
+                self.reject(f'invalid image signature ({self.field_name})')
+
+        return raw_data
+
+    def file_complete(self, file_size):
+        # 너무 짧아 시그니처를 끝까지 확인하지 못한 파일 처리
+        if not self.has_image_signature():
+            self.reject(f'invalid image signature ({self.field_name})')
+        return None
@@ -2,6 +2,8 @@
 import re
 from django.utils.html import escape
 
+from .scanner import get_scanner
+
 def clean_input(input_str):
     """
     입력값 이스케이프 처리 및 공백 정리
@@ -20,28 +22,7 @@ def detect_xss(input_str):
     if not input_str:
         return False
     
-    dangerous_patterns = [
-        r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>',
-        r'javascript\s*:',
-        r'on\w+\s*=',
-        r'data\s*:',
-        r'<iframe',
-        r'<embed',
-        r'<object',
-        r'<svg',
-        r'document\.',
-        r'window\.',
-        r'eval\(',
-        r'setTimeout\(',
-        r'setInterval\(',
-        r'new\s+Function\('
-    ]
-    
-    for pattern in dangerous_patterns:
-        if re.search(pattern, input_str, re.IGNORECASE):
-            return True
-    
-    return False
+    return get_scanner(('xss_strict',)).scan(input_str) is not None
 
 def validate_password_strength(password):
     """
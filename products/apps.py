@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.models.signals import post_migrate
+
+
+def create_search_index(sender, using, **kwargs):
+    # 마이그레이션 후 검색 테이블이 새로 만들어졌다면 기존 상품으로 채움
+    from .models import Product
+    from .search import ensure_search_index, rebuild_index
+
+    # 상품 테이블이 아직 없는 부분 마이그레이션 (예: migrate accounts 0001)
+    if Product._meta.db_table not in connections[using].introspection.table_names():
+        return
+    available, created = ensure_search_index(using)
+    if available and created:
+        rebuild_index(using)
 
 
 class ProductsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'products'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(create_search_index, sender=self)
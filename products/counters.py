@@ -0,0 +1,99 @@
+# products/counters.py
+from collections import Counter
+
+from django.db.models import Count, F
+
+from .models import CategoryProductCount, Product
+
+COUNTED_STATUSES = CategoryProductCount.COUNTED_STATUSES
+# post_init 시점에 로드되지 않은(defer) 필드
+_UNKNOWN = object()
+
+
+def apply_changes(changes, using=None):
+    """
+    {(category_id, status): 증감} 을 카운터 테이블에 반영 (집계 대상이 아닌 상태/카테고리 없음은 무시)
+    """
+    by_category = {}
+    for (category_id, status), delta in changes.items():
+        if category_id is None or status not in COUNTED_STATUSES or not delta:
+            continue
+        by_category.setdefault(category_id, {})[status] = delta
+    if not by_category:
+        return False
+
+    manager = CategoryProductCount.objects.using(using) if using else CategoryProductCount.objects
+    manager.bulk_create(
+        [CategoryProductCount(category_id=category_id) for category_id in by_category],
+        ignore_conflicts=True,
+    )
+    for category_id, deltas in by_category.items():
+        manager.filter(category_id=category_id).update(
+            **{status: F(status) + delta for status, delta in deltas.items()}
+        )
+    return True
+
+
+def remember_state(instance):
+    # 로드 시점의 (카테고리, 상태) 기억
+    values = instance.__dict__
+    if 'category_id' in values and 'status' in values:
+        instance._counter_state = (values['category_id'], values['status'])
+    else:
+        instance._counter_state = _UNKNOWN
+
+
+def load_unknown_state(instance):
+    # defer로 로드하지 않았던 경우 저장 전에 DB 값 조회
+    if getattr(instance, '_counter_state', None) is _UNKNOWN and not instance._state.adding:
+        row = Product._base_manager.using(instance._state.db).filter(pk=instance.pk).values_list(
+            'category_id', 'status').first()
+        instance._counter_state = row
+
+
+def record_save(instance, created, using=None):
+    old = None if created else getattr(instance, '_counter_state', None)
+    new = (instance.category_id, instance.status)
+    if old is _UNKNOWN or old == new:
+        return False
+    changes = Counter()
+    if old is not None:
+        changes[old] -= 1
+    changes[new] += 1
+    instance._counter_state = new
+    return apply_changes(changes, using)
+
+
+def record_delete(instance, using=None):
+    state = getattr(instance, '_counter_state', None)
+    if state is _UNKNOWN or state is None:
+        state = (instance.__dict__.get('category_id'), instance.__dict__.get('status'))
+    return apply_changes(Counter({state: -1}), using)
+
+
+def reconcile():
+    """
+    상품 테이블에서 카테고리별 상태별 개수를 다시 계산해 카운터 보정 (반환값: 보정한 카테고리 수)
+    """
+    actual = {}
+    rows = (
+        Product.objects.filter(category__isnull=False, status__in=COUNTED_STATUSES)
+        .order_by().values('category_id', 'status').annotate(count=Count('id'))
+    )
+    for row in rows:
+        actual.setdefault(row['category_id'], dict.fromkeys(COUNTED_STATUSES, 0))[row['status']] = row['count']
+
+    from .models import Category
+
+    fixed = 0
+    existing = {counter.category_id: counter for counter in CategoryProductCount.objects.all()}
+    for category_id in Category.objects.values_list('id', flat=True):
+        counts = actual.get(category_id, dict.fromkeys(COUNTED_STATUSES, 0))
+        counter = existing.get(category_id)
+        if counter is None:
+            CategoryProductCount.objects.create(category_id=category_id, **counts)
+            fixed += 1
+        elif any(getattr(counter, status) != counts[status] for status in COUNTED_STATUSES):
+            CategoryProductCount.objects.filter(category_id=category_id).update(**counts)
+            fixed += 1
+    return fixed
@@ -2,6 +2,12 @@
 from django import forms
 from .models import Product, Category
 
+# 상품 등록 검증 규칙 (import_products 명령도 같은 값을 사용)
+TITLE_MIN_LENGTH = 2
+DESCRIPTION_MIN_LENGTH = 10
+IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif']
+IMAGE_MAX_SIZE = 5 * 1024 * 1024  # 5MB
+
 class ProductForm(forms.ModelForm):
     class Meta:
         model = Product
@@ -13,13 +19,13 @@ class ProductForm(forms.ModelForm):
     
     def clean_title(self):
         title = self.cleaned_data.get('title')
-        if len(title) < 2:
+        if len(title) < TITLE_MIN_LENGTH:
             raise forms.ValidationError('제목은 최소 2자 이상이어야 합니다.')
         return title
     
     def clean_description(self):
         description = self.cleaned_data.get('description')
-        if len(description) < 10:
+        if len(description) < DESCRIPTION_MIN_LENGTH:
             raise forms.ValidationError('상품 설명은 최소 10자 이상이어야 합니다.')
         return description
     
@@ -27,12 +33,11 @@ class ProductForm(forms.ModelForm):
         image = self.cleaned_data.get('image')
         if image:
             # 파일 확장자 확인
-            valid_extensions = ['jpg', 'jpeg', 'png', 'gif']
             ext = image.name.split('.')[-1].lower()
-            if ext not in valid_extensions:
+            if ext not in IMAGE_EXTENSIONS:
                 raise forms.ValidationError('JPG, PNG, GIF 형식의 이미지만 업로드 가능합니다.')
             
             # 파일 크기 제한 (5MB)
-            if image.size > 5 * 1024 * 1024:
+            if image.size > IMAGE_MAX_SIZE:
                 raise forms.ValidationError('이미지 크기는 5MB 이하여야 합니다.')
         return image
\ No newline at end of file
@@ -0,0 +1,129 @@
+# products/listcache.py
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+
+# 카탈로그 세대 번호 행 (products.models.CatalogGeneration)
+GENERATION_ID = 1
+# 캐시가 비어 있을 때 기다리는 최대 시간과 확인 간격 (초)
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+
+def get_cache():
+    # PRODUCT_LIST_CACHE 별칭의 캐시 사용 (locmem: 워커별, Redis: 워커 간 공유)
+    return caches[getattr(settings, 'PRODUCT_LIST_CACHE', 'default')]
+
+
+def catalog_generation():
+    """
+    상품/카테고리가 바뀔 때마다 증가하는 카탈로그 세대 번호
+    - DB에 보관하므로 다른 워커나 관리 명령에서 올린 세대도 바로 반영됨
+    """
+    from .models import CatalogGeneration
+
+    generation = CatalogGeneration.objects.filter(id=GENERATION_ID).values_list('value', flat=True).first()
+    if generation is None:
+        # DB를 새로 만들어도 공유 캐시에 남은 예전 세대의 키를 다시 쓰지 않도록 현재 시각(ms)에서 시작
+        generation = CatalogGeneration.objects.get_or_create(
+            id=GENERATION_ID, defaults={'value': int(time.time() * 1000)}
+        )[0].value
+    return generation
+
+
+def bump_catalog_generation():
+    """
+    상품 목록 캐시 전체 무효화 (이전 세대의 키는 더 이상 조회되지 않고 만료됨)
+    """
+    from .models import CatalogGeneration
+
+    if not CatalogGeneration.objects.filter(id=GENERATION_ID).update(value=F('value') + 1):
+        catalog_generation()
+
+
+def make_key(prefix, *parts, generation=None):
+    if generation is None:
+        generation = catalog_generation()
+    digest = hashlib.md5('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'products:{prefix}:{generation}:{digest}'
+
+
+def get_or_compute(key, compute, timeout=None):
+    """
+    캐시 값을 반환하고, 없으면 한 요청만 compute()를 실행해 저장 (캐시 스탬피드 방지)
+    - 다른 요청은 LOCK_WAIT초까지 결과가 저장되기를 기다렸다가 사용
+    - 기다려도 없으면 직접 계산 (저장은 하지 않음)
+    """
+    cache = get_cache()
+    if timeout is None:
+        timeout = getattr(settings, 'PRODUCT_LIST_CACHE_TIMEOUT', 300)
+
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, timeout=max(1, int(LOCK_WAIT * 5))):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+    return compute()
+
+
+# 프로세스별 카테고리 스냅샷: (카탈로그 세대, 조회 시각, 카테고리 목록)
+_category_snapshot = (None, 0.0, [])
+
+
+def category_snapshot(generation=None, refresh=False):
+    """
+    상태별 상품 수가 붙은 전체 카테고리 목록 (available_count, reserved_count, sold_count)
+    - 프로세스 메모리에 보관하고 카탈로그 세대가 바뀌었거나 PRODUCT_CATEGORY_SNAPSHOT_MAX_AGE초가 지나면 다시 조회
+    - 상품 저장/삭제와 카테고리 변경은 모두 세대를 올리므로 개수 변경도 반영됨
+    """
+    global _category_snapshot
+    from .models import Category
+
+    if generation is None:
+        generation = catalog_generation()
+    max_age = getattr(settings, 'PRODUCT_CATEGORY_SNAPSHOT_MAX_AGE', 60)
+    snapshot_generation, loaded_at, categories = _category_snapshot
+    if not refresh and snapshot_generation == generation and time.monotonic() - loaded_at < max_age:
+        return categories
+
+    categories = list(Category.objects.select_related('product_count'))
+    for category in categories:
+        counts = getattr(category, 'product_count', None)
+        category.available_count = counts.available if counts else 0
+        category.reserved_count = counts.reserved if counts else 0
+        category.sold_count = counts.sold if counts else 0
+    _category_snapshot = (generation, time.monotonic(), categories)
+    return categories
+
+
+def find_category(slug, generation=None):
+    """
+    카테고리 스냅샷에서 slug로 카테고리 조회
+    - 스냅샷에 없으면 DB를 확인해 새로 생긴 카테고리면 스냅샷을 다시 만든 뒤 조회
+    - 반환값: (전체 카테고리 목록, 카테고리 또는 None)
+    """
+    from .models import Category
+
+    categories = category_snapshot(generation)
+    category = next((c for c in categories if c.slug == slug), None)
+    if category is None and Category.objects.filter(slug=slug).exists():
+        categories = category_snapshot(generation, refresh=True)
+        category = next((c for c in categories if c.slug == slug), None)
+    return categories, category
@@ -0,0 +1,60 @@
+# products/management/commands/bench_product_api.py
+import time
+import tracemalloc
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import TemplateDoesNotExist
+from django.test import RequestFactory
+
+from products.views import product_list, product_list_api
+
+
+class Command(BaseCommand):
+    help = '상품 목록 HTML 페이지와 JSON API의 요청당 CPU 시간/메모리 최대 사용량 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--limit', type=int, default=12, help='API 페이지 크기 (HTML 목록은 12개)')
+        parser.add_argument('--category', default=None, help='카테고리 slug')
+        parser.add_argument('--search', default=None, help='검색어')
+
+    def handle(self, *args, **options):
+        params = {key: options[key] for key in ('category', 'search') if options[key]}
+        factory = RequestFactory()
+
+        def html():
+            response = product_list(self.build_request(factory, '/products/', params))
+            return len(response.content)
+
+        def api():
+            request = self.build_request(factory, '/products/api/', dict(params, limit=options['limit']))
+            return sum(len(chunk) for chunk in product_list_api(request).streaming_content)
+
+        for label, run in (('html', html), ('api', api)):
+            try:
+                size = run()
+            except TemplateDoesNotExist as e:
+                self.stderr.write(f'{label}: 템플릿이 없어 건너뜀 ({e})')
+                continue
+            cpu, peaks = [], []
+            for _ in range(options['repeat']):
+                tracemalloc.start()
+                start = time.process_time()
+                run()
+                cpu.append(time.process_time() - start)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            cpu.sort()
+            peaks.sort()
+            self.stdout.write(
+                f'{label}: {size / 1024:.1f} KB, cpu median {cpu[len(cpu) // 2] * 1000:.2f} ms, '
+                f'peak memory median {peaks[len(peaks) // 2] / 1024:.0f} KB'
+            )
+
+    def build_request(self, factory, path, params):
+        # 조건부 요청(304)이 아닌 전체 응답을 측정
+        request = factory.get(path, params)
+        request.user = AnonymousUser()
+        request.session = {}
+        return request
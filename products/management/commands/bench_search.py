@@ -0,0 +1,44 @@
+# products/management/commands/bench_search.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from products.models import Product
+from products.search import search_index_available, search_products
+
+
+class Command(BaseCommand):
+    help = '상품 검색 색인(FTS5)과 기존 icontains 검색의 응답 시간 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='+', help='검색어')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--limit', type=int, default=12, help='한 페이지 상품 수')
+
+    def handle(self, *args, **options):
+        if not search_index_available():
+            self.stderr.write('FTS5 검색 색인을 사용할 수 없습니다.')
+            return
+
+        base = Product.objects.filter(status='available')
+        total = base.count()
+        self.stdout.write(f'available products: {total}')
+
+        def icontains(query):
+            return base.filter(Q(title__icontains=query) | Q(description__icontains=query))
+
+        for query in options['queries']:
+            for label, build in (('icontains', icontains), ('fts5', lambda q: search_products(base, q))):
+                timings = []
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    queryset = build(query)
+                    list(queryset[:options['limit']])
+                    queryset.count()
+                    timings.append(time.perf_counter() - start)
+                timings.sort()
+                self.stdout.write(
+                    f'{query!r} {label}: median {timings[len(timings) // 2] * 1000:.2f} ms, '
+                    f'max {timings[-1] * 1000:.2f} ms'
+                )
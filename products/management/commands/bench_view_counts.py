@@ -0,0 +1,60 @@
+# products/management/commands/bench_view_counts.py
+import random
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Sum
+
+from products.models import Product
+from products.viewcounts import ViewCountBuffer
+
+
+class Command(BaseCommand):
+    help = '여러 스레드에서 조회수를 기록한 뒤 유실된 조회수와 DB 쓰기 횟수 확인'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', type=int, default=20000, help='스레드당 조회 수')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--products', type=int, default=100, help='조회 대상 상품 수')
+
+    def handle(self, *args, **options):
+        product_ids = list(Product.objects.values_list('id', flat=True)[:options['products']])
+        if not product_ids:
+            self.stderr.write('상품이 없습니다.')
+            return
+
+        before = Product.objects.filter(id__in=product_ids).aggregate(total=Sum('views'))['total']
+        buffer = ViewCountBuffer(flush_interval=0.2, flush_threshold=5000)
+        flush_updates = []
+        original_flush = buffer.flush
+
+        def counting_flush():
+            updates = original_flush()
+            flush_updates.append(updates)
+            return updates
+
+        buffer.flush = counting_flush
+
+        def worker():
+            rng = random.Random()
+            for _ in range(options['views']):
+                buffer.record(rng.choice(product_ids))
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        buffer.flush()
+
+        expected = options['views'] * options['threads']
+        after = Product.objects.filter(id__in=product_ids).aggregate(total=Sum('views'))['total']
+        self.stdout.write(
+            f'views recorded: {expected} in {elapsed * 1000:.1f} ms '
+            f'({elapsed / expected * 1e6:.2f} us/view)'
+        )
+        self.stdout.write(f'views persisted: {after - before} (lost: {expected - (after - before)})')
+        self.stdout.write(f'UPDATE statements: {sum(flush_updates)} (per-view save: {expected})')
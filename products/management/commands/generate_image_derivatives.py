@@ -0,0 +1,58 @@
+# products/management/commands/generate_image_derivatives.py
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from products.models import Product
+from products.thumbnails import derivative_name, derivatives_ready, generate_derivatives, mark_derivatives_ready
+
+
+def decode_time(name):
+    from PIL import Image
+
+    start = time.perf_counter()
+    with default_storage.open(name, 'rb') as f:
+        with Image.open(f) as image:
+            image.load()
+    return time.perf_counter() - start
+
+
+class Command(BaseCommand):
+    help = '기존 상품 이미지의 목록/상세/카드용 파생 이미지 생성(생성 여부를 상품에 기록) 및 목록 이미지 크기/디코딩 시간 비교'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='이미 생성된 파생 이미지도 다시 생성')
+
+    def handle(self, *args, **options):
+        generated = failed = 0
+        original_bytes = list_bytes = 0
+        original_decode = list_decode = 0.0
+
+        for product in Product.objects.exclude(image='').only('id', 'image').iterator():
+            name = product.image.name
+            if not default_storage.exists(name):
+                continue
+            try:
+                if options['force'] or not derivatives_ready(name):
+                    generate_derivatives(name)
+                    generated += 1
+                # 이미 있던 파생 이미지도 화면에서 사용하도록 기록
+                mark_derivatives_ready(name)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f'{name}: {e}')
+                continue
+
+            list_name = derivative_name(name, 'list', 'webp')
+            original_bytes += default_storage.size(name)
+            list_bytes += default_storage.size(list_name)
+            original_decode += decode_time(name)
+            list_decode += decode_time(list_name)
+
+        self.stdout.write(f'generated: {generated}, failed: {failed}')
+        if list_bytes:
+            self.stdout.write(
+                f'list images: {original_bytes / 1024:.0f} KB -> {list_bytes / 1024:.0f} KB (webp), '
+                f'decode {original_decode * 1000:.0f} ms -> {list_decode * 1000:.0f} ms'
+            )
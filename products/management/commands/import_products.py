@@ -0,0 +1,242 @@
+# products/management/commands/import_products.py
+import csv
+import json
+import os
+import time
+from collections import Counter
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import transaction
+from django.utils.html import escape
+
+from core.media import acquire
+from core.storage import content_addressed_storage
+from products import counters, search
+from products.forms import DESCRIPTION_MIN_LENGTH, IMAGE_EXTENSIONS, IMAGE_MAX_SIZE, TITLE_MIN_LENGTH
+from products.listcache import bump_catalog_generation
+from products.models import Category, Product, product_image_path
+
+TITLE_MAX_LENGTH = Product._meta.get_field('title').max_length
+_price_validators = Product._meta.get_field('price').validators
+PRICE_MIN = max(v.limit_value for v in _price_validators if isinstance(v, MinValueValidator))
+PRICE_MAX = min(v.limit_value for v in _price_validators if isinstance(v, MaxValueValidator))
+
+
+def read_rows(path, input_format):
+    """
+    CSV/JSONL 파일을 한 행씩 읽는 제너레이터 (파일 전체를 메모리에 올리지 않음)
+    - JSONL에서 해석할 수 없는 줄은 None
+    """
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if input_format == 'csv':
+            yield from csv.DictReader(f)
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else None
+
+
+class Command(BaseCommand):
+    help = (
+        'CSV/JSONL 파일의 상품을 일괄 등록 (ProductForm과 같은 검증 규칙, 청크 단위 bulk_create, '
+        '체크포인트로 이어서 실행, 처리량(rows/sec) 출력)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='상품 파일 (열: title, description, price, category, image)')
+        parser.add_argument('--seller', required=True, help='상품을 등록할 판매자 username')
+        parser.add_argument('--images-dir', default=None, help='image 열의 상대 경로 기준 디렉터리, 기본값은 파일 위치')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], default=None, help='기본값은 확장자로 판단')
+        parser.add_argument('--chunk-size', type=int, default=500, help='한 트랜잭션에서 등록할 상품 수')
+        parser.add_argument('--checkpoint', default=None, help='진행 상황 파일, 기본값 <path>.checkpoint')
+        parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 처음부터 등록')
+        parser.add_argument('--dry-run', action='store_true', help='등록하지 않고 검증만 수행')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'파일이 없습니다: {path}')
+        input_format = options['format'] or ('jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv')
+        chunk_size = max(1, options['chunk_size'])
+        self.dry_run = options['dry_run']
+        self.images_dir = os.path.realpath(options['images_dir'] or os.path.dirname(os.path.abspath(path)))
+        self.storage = content_addressed_storage()
+
+        try:
+            self.seller = get_user_model().objects.only('id').get(username=options['seller'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"판매자를 찾을 수 없습니다: {options['seller']}")
+
+        # 카테고리는 slug와 이름 모두 한 번의 조회로 매핑
+        self.categories = {}
+        for category_id, slug, name in Category.objects.values_list('id', 'slug', 'name'):
+            self.categories.setdefault(name.casefold(), category_id)
+            self.categories[slug.casefold()] = category_id
+
+        self.checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+        stat = os.stat(path)
+        self.source = {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+        progress = {'rows': 0, 'imported': 0, 'failed': 0}
+        if not options['restart'] and not self.dry_run:
+            progress = self.load_checkpoint() or progress
+            if progress['rows']:
+                self.stdout.write(f"resuming after row {progress['rows']} ({progress['imported']} imported)")
+
+        rows = islice(read_rows(path, input_format), progress['rows'], None)
+        row_number = progress['rows']
+        started = time.perf_counter()
+        processed = imported = failed = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            products, errors = self.build_chunk(chunk, row_number)
+            for number, message in errors:
+                self.stderr.write(f'row {number}: {message}')
+            if products and not self.dry_run:
+                self.insert_chunk(products)
+            row_number += len(chunk)
+            processed += len(chunk)
+            imported += len(products)
+            failed += len(errors)
+            if not self.dry_run:
+                progress = {
+                    'rows': row_number,
+                    'imported': progress['imported'] + len(products),
+                    'failed': progress['failed'] + len(errors),
+                }
+                self.save_checkpoint(progress)
+            if options['verbosity'] >= 2:
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f'{row_number} rows, {processed / elapsed:.0f} rows/sec')
+
+        elapsed = time.perf_counter() - started
+        action = 'validated' if self.dry_run else 'imported'
+        self.stdout.write(
+            f'{action} {imported} products, {failed} rows failed, {processed} rows in {elapsed:.1f}s '
+            f'({processed / elapsed if elapsed else 0:.0f} rows/sec)'
+        )
+        if imported and not self.dry_run:
+            self.stdout.write('목록/상세용 이미지는 generate_image_derivatives 명령으로 생성하세요.')
+
+    def build_chunk(self, chunk, offset):
+        """
+        청크의 행을 검증해 저장할 Product 목록과 (행 번호, 오류) 목록 반환
+        - 검증 규칙은 ProductForm과 같고, 카테고리/이미지 확인에 행마다 쿼리를 보내지 않음
+        - 같은 청크에서 같은 이미지를 가리키는 행은 한 번만 복사
+        """
+        products, errors = [], []
+        stored = {}
+        for index, row in enumerate(chunk, start=offset + 1):
+            if row is None:
+                errors.append((index, '행을 해석할 수 없습니다.'))
+                continue
+            message, values = self.clean_row(row)
+            if message is None:
+                image_path = values.pop('image_path')
+            if message is None and not self.dry_run:
+                if image_path not in stored:
+                    stored[image_path] = self.store_image(image_path)
+                values['image'] = stored[image_path]
+                if values['image'] is None:
+                    message = '이미지 파일을 읽을 수 없습니다.'
+            if message is not None:
+                errors.append((index, message))
+                continue
+            products.append(Product(seller=self.seller, **values))
+        return products, errors
+
+    def clean_row(self, row):
+        # ProductForm(clean_title / clean_description / clean_image)과 모델 검증 규칙
+        title = str(row.get('title') or '').strip()
+        if not TITLE_MIN_LENGTH <= len(title) <= TITLE_MAX_LENGTH:
+            return f'제목은 {TITLE_MIN_LENGTH}자 이상 {TITLE_MAX_LENGTH}자 이하여야 합니다.', None
+        description = str(row.get('description') or '').strip()
+        if len(description) < DESCRIPTION_MIN_LENGTH:
+            return f'상품 설명은 최소 {DESCRIPTION_MIN_LENGTH}자 이상이어야 합니다.', None
+        try:
+            price = int(str(row.get('price')).strip())
+        except ValueError:
+            return '가격은 숫자여야 합니다.', None
+        if not PRICE_MIN <= price <= PRICE_MAX:
+            return f'가격은 {PRICE_MIN}원 이상 {PRICE_MAX}원 이하여야 합니다.', None
+
+        category = str(row.get('category') or '').strip()
+        category_id = None
+        if category:
+            category_id = self.categories.get(category.casefold())
+            if category_id is None:
+                return f'카테고리를 찾을 수 없습니다: {category}', None
+
+        image = str(row.get('image') or '').strip()
+        if not image:
+            return '이미지가 필요합니다.', None
+        if image.rsplit('.', 1)[-1].lower() not in IMAGE_EXTENSIONS:
+            return 'JPG, PNG, GIF 형식의 이미지만 업로드 가능합니다.', None
+        # 이미지 디렉터리 밖의 파일은 허용하지 않음
+        image_path = os.path.realpath(os.path.join(self.images_dir, image))
+        if os.path.commonpath([self.images_dir, image_path]) != self.images_dir or not os.path.isfile(image_path):
+            return f'이미지 파일이 없습니다: {image}', None
+        if os.path.getsize(image_path) > IMAGE_MAX_SIZE:
+            return '이미지 크기는 5MB 이하여야 합니다.', None
+
+        return None, {
+            # XSS 방지 (product_create와 같은 처리)
+            'title': escape(title),
+            'description': escape(description),
+            'price': price,
+            'category_id': category_id,
+            'image_path': image_path,
+        }
+
+    def store_image(self, image_path):
+        """
+        이미지를 확인한 뒤 상품 이미지 저장소로 복사 (같은 내용은 한 번만 저장)
+        - ImageField와 같이 Pillow로 열 수 없는 파일은 거부 (반환값 None)
+        """
+        from PIL import Image
+
+        try:
+            with Image.open(image_path) as image:
+                image.verify()
+        except Exception:
+            return None
+        with open(image_path, 'rb') as f:
+            return self.storage.save(product_image_path(None, os.path.basename(image_path)), File(f))
+
+    def insert_chunk(self, products):
+        with transaction.atomic():
+            created = Product.objects.bulk_create(products)
+            # bulk_create는 시그널을 보내지 않으므로 저장 시그널이 하던 갱신을 청크 단위로 처리
+            acquire(product.image.name for product in created)
+            search.index_products(created)
+            counters.apply_changes(Counter((product.category_id, product.status) for product in created))
+            transaction.on_commit(bump_catalog_generation)
+
+    def load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get('source') != self.source:
+            raise CommandError(
+                f'체크포인트가 다른 파일의 것입니다: {self.checkpoint_path} (--restart로 처음부터 등록)'
+            )
+        return checkpoint['progress']
+
+    def save_checkpoint(self, progress):
+        # 청크 커밋 직후 기록 (그 사이에 중단되면 마지막 청크가 다시 등록될 수 있음)
+        temp_path = f'{self.checkpoint_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': self.source, 'progress': progress}, f)
+        os.replace(temp_path, self.checkpoint_path)
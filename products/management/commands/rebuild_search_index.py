@@ -0,0 +1,20 @@
+# products/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from products.search import rebuild_index, search_index_available
+
+
+class Command(BaseCommand):
+    help = '상품 검색 색인(FTS5)을 전체 상품으로 다시 구성'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        if not search_index_available(using):
+            self.stderr.write('이 데이터베이스는 FTS5 검색 색인을 지원하지 않습니다.')
+            return
+        count = rebuild_index(using)
+        self.stdout.write(self.style.SUCCESS(f'{count}개 상품을 색인했습니다.'))
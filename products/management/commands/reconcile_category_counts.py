@@ -0,0 +1,16 @@
+# products/management/commands/reconcile_category_counts.py
+from django.core.management.base import BaseCommand
+
+from products.counters import reconcile
+from products.listcache import bump_catalog_generation
+
+
+class Command(BaseCommand):
+    help = '카테고리별 상품 수 카운터를 상품 테이블 기준으로 다시 계산 (주기 실행용)'
+
+    def handle(self, *args, **options):
+        fixed = reconcile()
+        if fixed:
+            # 모든 워커의 카테고리 스냅샷과 목록 캐시 갱신 (세대 번호는 DB에 보관)
+            bump_catalog_generation()
+        self.stdout.write(f'reconciled category counts: {fixed} categories fixed')
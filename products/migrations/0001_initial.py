@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:57
+
+import django.core.validators
+import django.db.models.deletion
+import products.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Category',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Categories',
+            },
+        ),
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=50)),
+                ('description', models.TextField()),
+                ('price', models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(100000000)])),
+                ('status', models.CharField(choices=[('available', '판매중'), ('reserved', '예약중'), ('sold', '판매완료'), ('blocked', '차단됨')], default='available', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('image', models.ImageField(upload_to=products.models.product_image_path)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='products.category')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='products', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', '-created_at', '-id'], name='product_status_recent_idx'), models.Index(fields=['category', 'status', '-created_at'], name='product_category_status_idx'), models.Index(fields=['seller', 'status', '-created_at'], name='product_seller_status_idx'), models.Index(fields=['seller', '-created_at', '-id'], name='product_seller_recent_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:00
+
+import core.storage
+import products.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='image',
+            field=models.ImageField(storage=core.storage.content_addressed_storage, upload_to=products.models.product_image_path),
+        ),
+    ]
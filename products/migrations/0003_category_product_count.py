@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_counts(apps, schema_editor):
+    # 기존 상품으로 카테고리별 상태별 개수 채우기
+    Category = apps.get_model('products', 'Category')
+    Product = apps.get_model('products', 'Product')
+    CategoryProductCount = apps.get_model('products', 'CategoryProductCount')
+    statuses = ('available', 'reserved', 'sold')
+    counts = {category_id: dict.fromkeys(statuses, 0) for category_id in Category.objects.values_list('id', flat=True)}
+    rows = (
+        Product.objects.filter(category__isnull=False, status__in=statuses)
+        .order_by().values('category_id', 'status').annotate(count=Count('id'))
+    )
+    for row in rows:
+        counts[row['category_id']][row['status']] = row['count']
+    CategoryProductCount.objects.bulk_create(
+        [CategoryProductCount(category_id=category_id, **values) for category_id, values in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_alter_product_image'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryProductCount',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='product_count', serialize=False, to='products.category')),
+                ('available', models.IntegerField(default=0)),
+                ('reserved', models.IntegerField(default=0)),
+                ('sold', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_media_reference_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_status_recent_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='product_category_status_idx',
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['-created_at', '-id'], name='product_available_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('status', 'available')), fields=['category', '-created_at', '-id'], name='product_available_category_idx'),
+        ),
+    ]
@@ -1,8 +1,10 @@
 # products/models.py
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils.text import slugify
 from django.core.validators import MinValueValidator, MaxValueValidator
+from core.storage import content_addressed_storage
 import os
 
 def product_image_path(instance, filename):
@@ -44,17 +46,73 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     views = models.PositiveIntegerField(default=0)
-    image = models.ImageField(upload_to=product_image_path)
+    # 같은 이미지는 한 번만 저장 (참조가 없어진 파일은 gc_media_blobs가 정리)
+    image = models.ImageField(upload_to=product_image_path, storage=content_addressed_storage)
+    # 목록/상세/카드용 파생 이미지 생성 완료 여부 (products.thumbnails에서 기록, 완료 전에는 원본 사용)
+    image_derivatives_ready = models.BooleanField(default=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # 상품 목록 / 카테고리별 상품 목록: 판매중 상품만 담는 부분 인덱스 (커서 페이지네이션 키 포함)
+            # SQLite는 status = %s 처럼 값이 바인딩된 쿼리에도 바인딩된 값으로 부분 인덱스 사용 여부를 판단
+            models.Index(
+                fields=['-created_at', '-id'], condition=Q(status='available'), name='product_available_recent_idx'
+            ),
+            models.Index(
+                fields=['category', '-created_at', '-id'], condition=Q(status='available'),
+                name='product_available_category_idx'
+            ),
+            # 내 상품 / 판매자의 다른 상품 (상태 필터 유무 모두)
+            models.Index(fields=['seller', 'status', '-created_at'], name='product_seller_status_idx'),
+            models.Index(fields=['seller', '-created_at', '-id'], name='product_seller_recent_idx'),
+            # 미디어 GC의 파일 참조 확인 (core.media.count_references)
+            models.Index(fields=['image'], name='product_image_idx'),
+        ]
     
     def __str__(self):
         return self.title
     
-    def delete(self, *args, **kwargs):
-        # 상품 삭제 시 이미지 함께 삭제
-        if self.image:
-            if os.path.isfile(self.image.path):
-                os.remove(self.image.path)
-        super().delete(*args, **kwargs)
\ No newline at end of file
+    # 용도별 이미지 URL (파생 이미지가 생성되기 전에는 원본)
+    def image_url(self, size, image_format='jpeg'):
+        from .thumbnails import image_url
+        return image_url(self.image, size, image_format, self.image_derivatives_ready)
+    
+    @property
+    def list_image_url(self):
+        return self.image_url('list')
+    
+    @property
+    def detail_image_url(self):
+        return self.image_url('detail')
+    
+    @property
+    def card_image_url(self):
+        return self.image_url('card')
+
+class CategoryProductCount(models.Model):
+    """
+    카테고리별 상태별 상품 수 (products.counters가 상품 저장/삭제 시 갱신)
+    - 목록 페이지에서 GROUP BY 없이 카테고리별 개수 표시
+    - reconcile_category_counts 명령으로 실제 값과 주기적으로 맞춤
+    """
+    category = models.OneToOneField(Category, on_delete=models.CASCADE, primary_key=True, related_name='product_count')
+    available = models.IntegerField(default=0)
+    reserved = models.IntegerField(default=0)
+    sold = models.IntegerField(default=0)
+    
+    # 집계하는 상품 상태
+    COUNTED_STATUSES = ('available', 'reserved', 'sold')
+    
+    def __str__(self):
+        return f"{self.category}: {self.available}/{self.reserved}/{self.sold}"
+
+class CatalogGeneration(models.Model):
+    """
+    상품 목록 캐시와 카테고리 스냅샷의 세대 번호 (products.listcache, 행 1개)
+    - 웹 워커와 관리 명령이 모두 같은 값을 보도록 캐시가 아닌 DB에 보관
+    """
+    value = models.BigIntegerField()
+    
+    def __str__(self):
+        return str(self.value)
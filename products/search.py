@@ -0,0 +1,143 @@
+# products/search.py
+import logging
+import re
+
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+# 상품 검색용 SQLite FTS5 테이블 (rowid = Product.id)
+SEARCH_TABLE = 'products_product_search'
+# bm25 컬럼 가중치 (제목, 설명)
+RANK_EXPRESSION = f'bm25({SEARCH_TABLE}, 10.0, 1.0)'
+
+_WORD_RE = re.compile(r'[^\W_]+')
+_available = {}
+
+
+def ngram_tokens(text, n=2):
+    """
+    텍스트를 단어별 n-gram 토큰으로 분리
+    - 한국어는 띄어쓰기 단위가 검색어 단위와 다르므로 음절 n-gram으로 색인
+    - 예: '책상의자' -> ['책상', '상의', '의자']
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        if len(word) <= n:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+def index_text(text):
+    return ' '.join(ngram_tokens(text or ''))
+
+
+def build_match_query(query):
+    """
+    검색어를 FTS5 MATCH 식으로 변환 (단어마다 연속된 n-gram 구문, 단어끼리는 AND)
+    - 한 글자 단어는 해당 글자로 시작하는 토큰의 접두어 검색으로 처리
+    """
+    phrases = []
+    for word in _WORD_RE.findall(query.lower()):
+        if len(word) == 1:
+            phrases.append(f'"{word}"*')
+        else:
+            phrases.append('"' + ' '.join(ngram_tokens(word)) + '"')
+    return ' AND '.join(phrases)
+
+
+def ensure_search_index(using=DEFAULT_DB_ALIAS):
+    """
+    검색 테이블이 없으면 생성 (SQLite FTS5를 지원하지 않으면 False)
+    - 반환값: (사용 가능 여부, 새로 생성했는지 여부)
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False, False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [SEARCH_TABLE])
+            if cursor.fetchone():
+                return True, False
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(title, description, tokenize = 'unicode61')"
+            )
+    except OperationalError as e:
+        logger.warning(f"Product search index unavailable, falling back to icontains: {e}")
+        return False, False
+    return True, True
+
+
+def search_index_available(using=DEFAULT_DB_ALIAS):
+    # 프로세스당 한 번만 확인
+    if using not in _available:
+        _available[using] = ensure_search_index(using)[0]
+    return _available[using]
+
+
+def index_product(product, using=DEFAULT_DB_ALIAS):
+    index_products([product], using)
+
+
+def index_products(products, using=DEFAULT_DB_ALIAS):
+    if not search_index_available(using):
+        return
+    rows = [(p.id, index_text(p.title), index_text(p.description)) for p in products]
+    if not rows:
+        return
+    with connections[using].cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+        cursor.executemany(f'INSERT INTO {SEARCH_TABLE} (rowid, title, description) VALUES (%s, %s, %s)', rows)
+
+
+def remove_product(product_id, using=DEFAULT_DB_ALIAS):
+    if not search_index_available(using):
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [product_id])
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS, chunk_size=2000):
+    """
+    전체 상품으로 검색 테이블을 다시 구성 (반환값: 색인한 상품 수)
+    """
+    from .models import Product
+
+    if not search_index_available(using):
+        return 0
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    count = 0
+    batch = []
+    products = Product.objects.using(using).only('id', 'title', 'description').iterator(chunk_size=chunk_size)
+    for product in products:
+        batch.append(product)
+        if len(batch) >= chunk_size:
+            index_products(batch, using)
+            count += len(batch)
+            batch = []
+    index_products(batch, using)
+    return count + len(batch)
+
+
+def search_products(queryset, query):
+    """
+    상품 쿼리셋에 검색 조건을 적용하고 관련도 순으로 정렬
+    - FTS5를 사용할 수 없는 DB에서는 기존 icontains 검색으로 대체
+    """
+    match = build_match_query(query)
+    if not match:
+        return queryset.none()
+    if not search_index_available(queryset.db):
+        return queryset.filter(Q(title__icontains=query) | Q(description__icontains=query))
+    table = queryset.model._meta.db_table
+    return queryset.extra(
+        select={'search_rank': RANK_EXPRESSION},
+        tables=[SEARCH_TABLE],
+        where=[f'{SEARCH_TABLE}.rowid = {table}.id', f'{SEARCH_TABLE} MATCH %s'],
+        params=[match],
+        order_by=['search_rank', '-created_at'],
+    )
@@ -0,0 +1,84 @@
+# products/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from core.media import blob_reclaimed
+from . import counters, search, thumbnails
+from .listcache import bump_catalog_generation
+from .models import Category, Product
+
+# 검색 색인에 영향을 주는 필드
+SEARCH_FIELDS = {'title', 'description'}
+
+
+@receiver(post_save, sender=Product)
+def update_search_index(sender, instance, created, update_fields=None, raw=False, using=None, **kwargs):
+    # 제목/설명이 바뀌지 않는 저장(조회수, 상태 변경 등)은 색인을 건드리지 않음
+    if raw:
+        return
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    search.index_product(instance, using=using)
+
+
+@receiver(post_delete, sender=Product)
+def remove_from_search_index(sender, instance, using=None, **kwargs):
+    search.remove_product(instance.id, using=using)
+
+
+@receiver(post_save, sender=Product)
+def generate_image_derivatives(sender, instance, update_fields=None, raw=False, **kwargs):
+    # 새 이미지가 저장되면 목록/상세/카드용 이미지를 백그라운드에서 생성
+    if raw or not instance.image:
+        return
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    # 이미지가 바뀌었을 수 있으므로 저장할 때만 저장소를 확인해 생성 여부 기록 (렌더링 시에는 확인하지 않음)
+    ready = thumbnails.derivatives_ready(instance.image.name)
+    if ready != instance.image_derivatives_ready:
+        sender.objects.filter(pk=instance.pk).update(image_derivatives_ready=ready)
+        instance.image_derivatives_ready = ready
+    if not ready:
+        thumbnails.schedule_derivatives(instance.image.name)
+
+
+@receiver(blob_reclaimed)
+def delete_image_derivatives(sender, name, **kwargs):
+    # 원본 파일이 정리되면 파생 이미지도 삭제
+    if name.startswith('product_images/'):
+        thumbnails.delete_derivatives(name)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_product_list_cache(sender, raw=False, **kwargs):
+    # 상품 목록 캐시 무효화 (조회수 반영은 update()라 여기에 해당하지 않음)
+    if raw:
+        return
+    transaction.on_commit(bump_catalog_generation)
+
+
+@receiver(post_init, sender=Product)
+def remember_counter_state(sender, instance, **kwargs):
+    counters.remember_state(instance)
+
+
+@receiver(pre_save, sender=Product)
+def load_counter_state(sender, instance, raw=False, **kwargs):
+    if not raw:
+        counters.load_unknown_state(instance)
+
+
+@receiver(post_save, sender=Product)
+def update_category_counts(sender, instance, created, raw=False, using=None, **kwargs):
+    # 생성, 카테고리/상태 변경(change_product_status 포함) 시 카테고리별 개수 갱신
+    if not raw:
+        counters.record_save(instance, created, using)
+
+
+@receiver(post_delete, sender=Product)
+def decrease_category_counts(sender, instance, using=None, **kwargs):
+    counters.record_delete(instance, using)
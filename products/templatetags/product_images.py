@@ -0,0 +1,36 @@
+# products/templatetags/product_images.py
+from django import template
+from django.utils.html import format_html
+
+from ..thumbnails import image_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def product_image_url(product, size='list', image_format='jpeg'):
+    """
+    {% product_image_url product 'list' %} -> 용도별 이미지 URL (없으면 원본)
+    """
+    return image_url(product.image, size, image_format, product.image_derivatives_ready)
+
+
+@register.simple_tag
+def product_picture(product, size='list', css_class=''):
+    """
+    {% product_picture product 'list' 'card-img-top' %}
+    - WebP를 지원하는 브라우저에는 WebP, 나머지는 JPEG 제공
+    - 파생 이미지가 아직 없으면 원본 이미지 한 장만 사용
+    """
+    if not product.image:
+        return ''
+    if not product.image_derivatives_ready:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="lazy">', product.image.url, product.title, css_class
+        )
+    return format_html(
+        '<picture><source srcset="{}" type="image/webp">'
+        '<img src="{}" alt="{}" class="{}" loading="lazy" decoding="async"></picture>',
+        image_url(product.image, size, 'webp', True), image_url(product.image, size, 'jpeg', True),
+        product.title, css_class,
+    )
@@ -1,3 +1,203 @@
+import json
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import thumbnails
+from .listcache import catalog_generation, category_snapshot
+from .models import Category, CategoryProductCount, Product
+from .templatetags.product_images import product_picture
+
+
+class CategorySnapshotTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = get_user_model().objects.create_user(username='seller', password='password')
+        cls.category = Category.objects.create(name='전자기기', slug='electronics')
+        Product.objects.create(
+            title='노트북', description='설명', price=1000, seller=cls.seller,
+            category=cls.category, image='product_images/test.jpg'
+        )
+
+    def list_api(self, **params):
+        response = self.client.get(reverse('products:product_list_api'), params)
+        if response.status_code != 200:
+            return response.status_code, json.loads(response.content)
+        return response.status_code, json.loads(b''.join(response.streaming_content))
+
+    def test_category_created_elsewhere_is_found_before_404(self):
+        category_snapshot()
+        # 세대 번호를 올리지 않는 경로로 생성된 카테고리 (다른 워커의 스냅샷에는 없는 상태와 같음)
+        Category.objects.bulk_create([Category(name='가구', slug='furniture')])
+
+        status, body = self.list_api(category='furniture')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['results'], [])
+        self.assertIn('furniture', [category.slug for category in category_snapshot()])
+
+        status, _ = self.list_api(category='missing')
+        self.assertEqual(status, 404)
+
+    def test_reconcile_command_invalidates_snapshot_for_every_process(self):
+        generation = catalog_generation()
+        CategoryProductCount.objects.filter(category=self.category).update(available=0)
+        category_snapshot()
+
+        call_command('reconcile_category_counts', stdout=StringIO())
+
+        # 세대 번호는 DB에 있으므로 명령을 실행한 프로세스 밖에서도 새 값이 보임
+        self.assertGreater(catalog_generation(), generation)
+        snapshot = {category.slug: category for category in category_snapshot()}
+        self.assertEqual(snapshot['electronics'].available_count, 1)
+
+
+class ProductStatusPermissionTests(TestCase):
+    """
+    상품 상태 변경 권한 (change_status와 bulk_change_status는 같은 규칙)
+    - 판매자는 자기 상품의 상태만 변경 가능
+    - 차단(blocked) 처리와 차단 해제는 관리자만 가능 (판매자가 단일 변경으로 차단을 풀 수 없음)
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.seller = User.objects.create_user(username='seller', password='password')
+        cls.other = User.objects.create_user(username='other', password='password')
+        cls.staff = User.objects.create_user(username='staff', password='password', is_staff=True)
+        cls.product, cls.blocked = [
+            Product.objects.create(
+                title=title, description='설명', price=1000, seller=cls.seller,
+                status=status, image='product_images/test.jpg'
+            )
+            for title, status in [('판매중 상품', 'available'), ('차단된 상품', 'blocked')]
+        ]
+
+    def change_status(self, product, status):
+        return self.client.post(reverse('products:change_status', args=[product.id]), {'status': status}).status_code
+
+    def bulk_change_status(self, products, status):
+        response = self.client.post(
+            reverse('products:bulk_change_status'), {'ids': [product.id for product in products], 'status': status}
+        )
+        return json.loads(response.content)['results']
+
+    def assertStatus(self, product, status):
+        product.refresh_from_db()
+        self.assertEqual(product.status, status)
+
+    def test_single_endpoint_seller_cannot_block_or_unblock(self):
+        self.client.force_login(self.seller)
+        self.assertEqual(self.change_status(self.product, 'reserved'), 200)
+        self.assertStatus(self.product, 'reserved')
+
+        self.assertEqual(self.change_status(self.product, 'blocked'), 403)
+        self.assertStatus(self.product, 'reserved')
+        self.assertEqual(self.change_status(self.blocked, 'available'), 403)
+        self.assertStatus(self.blocked, 'blocked')
+
+    def test_single_endpoint_other_user_forbidden_and_staff_allowed(self):
+        self.client.force_login(self.other)
+        self.assertEqual(self.change_status(self.product, 'sold'), 403)
+        self.assertStatus(self.product, 'available')
+
+        self.client.force_login(self.staff)
+        self.assertEqual(self.change_status(self.blocked, 'available'), 200)
+        self.assertStatus(self.blocked, 'available')
+        self.assertEqual(self.change_status(self.product, 'blocked'), 200)
+        self.assertStatus(self.product, 'blocked')
+
+    def test_bulk_endpoint_seller_cannot_block_or_unblock(self):
+        self.client.force_login(self.seller)
+        self.assertEqual(self.bulk_change_status([self.product, self.blocked], 'available'), {
+            str(self.product.id): 'unchanged', str(self.blocked.id): 'forbidden',
+        })
+        self.assertEqual(self.bulk_change_status([self.product], 'blocked'), {str(self.product.id): 'forbidden'})
+        self.assertStatus(self.product, 'available')
+        self.assertStatus(self.blocked, 'blocked')
+
+    def test_bulk_endpoint_other_user_forbidden_and_staff_allowed(self):
+        self.client.force_login(self.other)
+        self.assertEqual(self.bulk_change_status([self.product], 'sold'), {str(self.product.id): 'forbidden'})
+
+        self.client.force_login(self.staff)
+        self.assertEqual(self.bulk_change_status([self.product, self.blocked], 'reserved'), {
+            str(self.product.id): 'updated', str(self.blocked.id): 'updated',
+        })
+        self.assertStatus(self.blocked, 'reserved')
+
+
+class ProductListCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = get_user_model().objects.create_user(username='seller', password='password')
+        Product.objects.bulk_create([
+            Product(title=f'상품 {index}', description='설명', price=1000, seller=seller, image='product_images/test.jpg')
+            for index in range(30)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def product_list(self, **params):
+        context = {}
+
+        def capture(request, template_name, data=None, *args, **kwargs):
+            context.update(data)
+            return HttpResponse(template_name)
+
+        with mock.patch('products.views.render', capture), CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('products:product_list'), params)
+        counts = [query['sql'] for query in queries.captured_queries if 'COUNT(' in query['sql']]
+        return context, counts
+
+    def test_total_count_is_shared_across_cursor_pages(self):
+        context, counts = self.product_list()
+        self.assertEqual((context['total_count'], len(counts)), (30, 1))
+
+        context, counts = self.product_list(cursor=context['page_obj'].next_cursor)
+        self.assertEqual(len(context['page_obj']), 12)
+        # 다음 페이지는 캐시된 개수를 사용 (COUNT 쿼리 없음)
+        self.assertEqual((context['total_count'], counts), (30, []))
+
+
+class ProductImageUrlTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = get_user_model().objects.create_user(username='seller', password='password')
+        cls.image = 'product_images/ab/cd/abcd.jpg'
+        cls.products = Product.objects.bulk_create([
+            Product(title=f'상품 {index}', description='설명', price=1000, seller=seller, image=cls.image)
+            for index in range(2)
+        ])
+
+    def test_urls_are_built_without_storage_lookups(self):
+        product = self.products[0]
+        with mock.patch('django.core.files.storage.FileSystemStorage.exists') as exists:
+            self.assertNotIn('<picture>', product_picture(product, 'list'))
+            self.assertEqual(product.list_image_url, product.image.url)
+
+            product.image_derivatives_ready = True
+            html = product_picture(product, 'list')
+            self.assertIn('abcd_list.webp', html)
+            self.assertIn('abcd_list.jpg', html)
+            self.assertTrue(product.detail_image_url.endswith('abcd_detail.jpg'))
+        # 상품 수와 관계없이 렌더링 중 파일 존재 여부를 확인하지 않음
+        exists.assert_not_called()
+
+    def test_generation_marks_every_product_using_the_image(self):
+        with mock.patch.object(thumbnails, 'generate_derivatives', return_value=6):
+            with self.assertLogs('products.thumbnails', 'INFO'):
+                thumbnails._generate_safely(self.image)
 
-# Create your tests here.
+        self.assertEqual(Product.objects.filter(image_derivatives_ready=True).count(), 2)
+        response = self.client.get(reverse('products:product_list_api'), {'fields': 'id,image'})
+        results = json.loads(b''.join(response.streaming_content))['results']
+        self.assertTrue(all(item['image'].endswith('abcd_list.webp') for item in results))
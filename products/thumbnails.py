@@ -0,0 +1,151 @@
+# products/thumbnails.py
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# 용도별 최대 크기 (가로, 세로) - 비율은 유지
+DEFAULT_SIZES = {
+    'card': (160, 160),  # 채팅방 상품 카드
+    'list': (400, 400),  # 상품 목록
+    'detail': (1080, 1080),  # 상품 상세
+}
+# 형식별 (확장자, PIL 형식, 저장 옵션)
+FORMATS = {
+    'webp': ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_sizes():
+    # 큰 크기부터 (작은 크기는 앞 결과를 다시 줄여서 생성)
+    sizes = getattr(settings, 'PRODUCT_IMAGE_SIZES', DEFAULT_SIZES)
+    return sorted(sizes.items(), key=lambda item: -item[1][0] * item[1][1])
+
+
+def derivative_name(name, size, image_format='jpeg'):
+    """
+    원본 옆에 저장되는 파생 이미지 경로
+    - 예: product_images/abc.png -> product_images/abc_list.webp
+    """
+    root = os.path.splitext(name)[0]
+    return f'{root}_{size}.{FORMATS[image_format][0]}'
+
+
+def derivative_names(name):
+    return [derivative_name(name, size, image_format) for size, _ in get_sizes() for image_format in FORMATS]
+
+
+def derivatives_ready(name, storage=default_storage):
+    # 가장 마지막에 저장되는 파일로 완료 여부 판단 (저장소 조회, 화면 렌더링에서는 Product.image_derivatives_ready 사용)
+    return storage.exists(derivative_names(name)[-1])
+
+
+def mark_derivatives_ready(name, ready=True):
+    # 같은 이미지(내용 주소 저장소라 이름이 같음)를 쓰는 모든 상품에 파생 이미지 생성 여부 기록
+    from .models import Product
+
+    return Product.objects.filter(image=name).update(image_derivatives_ready=ready)
+
+
+def generate_derivatives(name, storage=default_storage):
+    """
+    원본 이미지로 모든 크기/형식의 파생 이미지 생성 (반환값: 생성한 파일 수)
+    - EXIF 회전 정보를 반영하고 메타데이터는 제거
+    - 원본보다 큰 크기로는 확대하지 않음
+    """
+    from PIL import Image, ImageOps
+
+    with storage.open(name, 'rb') as f:
+        with Image.open(f) as source:
+            source = ImageOps.exif_transpose(source)
+            if source.mode not in ('RGB', 'L'):
+                # 투명 배경은 흰색으로 채움 (JPEG는 알파 채널을 지원하지 않음)
+                background = Image.new('RGB', source.size, (255, 255, 255))
+                rgba = source.convert('RGBA')
+                background.paste(rgba, mask=rgba.getchannel('A'))
+                source = background
+
+            count = 0
+            image = source
+            for size, bounds in get_sizes():
+                image = image.copy()
+                image.thumbnail(bounds, Image.Resampling.LANCZOS)
+                for image_format, (ext, pil_format, options) in FORMATS.items():
+                    buffer = io.BytesIO()
+                    image.save(buffer, pil_format, **options)
+                    target = derivative_name(name, size, image_format)
+                    if storage.exists(target):
+                        storage.delete(target)
+                    storage.save(target, ContentFile(buffer.getvalue()))
+                    count += 1
+    return count
+
+
+def delete_derivatives(name, storage=default_storage):
+    for target in derivative_names(name):
+        if storage.exists(target):
+            storage.delete(target)
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'PRODUCT_IMAGE_WORKERS', 2),
+                    thread_name_prefix='product-image',
+                )
+    return _executor
+
+
+def _generate_safely(name):
+    try:
+        count = generate_derivatives(name)
+        mark_derivatives_ready(name)
+        logger.info(f"Product image derivatives generated: {name} ({count} files)")
+    except Exception:
+        # 실패해도 원본 이미지가 그대로 사용됨
+        logger.exception(f"Product image derivative generation failed: {name}")
+
+
+def schedule_derivatives(name):
+    """
+    트랜잭션 커밋 후 작업 스레드에서 파생 이미지 생성
+    """
+    if not name:
+        return
+    transaction.on_commit(lambda: get_executor().submit(_generate_safely, name))
+
+
+def image_url(image, size, image_format='jpeg', ready=False, storage=default_storage):
+    """
+    파생 이미지 URL (ready가 아니면 원본 URL)
+    - ready: Product.image_derivatives_ready (렌더링할 때마다 저장소를 조회하지 않음)
+    """
+    if not image:
+        return ''
+    if ready:
+        return storage.url(derivative_name(image.name, size, image_format))
+    return image.url
+
+
+def image_name_url(name, size, image_format='jpeg', ready=False, storage=default_storage):
+    """
+    .values()로 조회한 이미지 이름의 파생 이미지 URL (ready가 아니면 원본 URL)
+    """
+    if not name:
+        return ''
+    return storage.url(derivative_name(name, size, image_format) if ready else name)
@@ -6,12 +6,14 @@ app_name = 'products'
 
 urlpatterns = [
     path('', views.product_list, name='product_list'),
+    path('api/', views.product_list_api, name='product_list_api'),
     path('<int:product_id>/', views.product_detail, name='product_detail'),
     path('create/', views.product_create, name='product_create'),
     path('<int:product_id>/update/', views.product_update, name='product_update'),
     path('<int:product_id>/delete/', views.product_delete, name='product_delete'),
     path('my-products/', views.my_products, name='my_products'),
     path('<int:product_id>/change-status/', views.change_product_status, name='change_status'),
+    path('change-status/bulk/', views.bulk_change_product_status, name='bulk_change_status'),
 ]
 
 # products/views.py
@@ -0,0 +1,145 @@
+# products/viewcounts.py
+import atexit
+import logging
+import os
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """
+    상품 조회수 증가분을 메모리에 모았다가 주기적으로 DB에 반영하는 버퍼 (write-behind)
+    - 같은 증가분을 가진 상품끼리 묶어 UPDATE ... SET views = views + n 한 번으로 처리
+    - views 컬럼만 갱신하므로 updated_at과 다른 컬럼은 바뀌지 않음
+    - flush_interval초마다 또는 대기 중인 조회가 flush_threshold개를 넘으면 반영
+    - 워커가 비정상 종료되면 마지막 flush 이후의 조회수만 유실됨 (정상 종료 시에는 atexit에서 반영)
+    """
+
+    def __init__(self, flush_interval=None, flush_threshold=None):
+        self.flush_interval = flush_interval if flush_interval is not None else getattr(
+            settings, 'VIEW_COUNT_FLUSH_INTERVAL', 5)
+        self.flush_threshold = flush_threshold if flush_threshold is not None else getattr(
+            settings, 'VIEW_COUNT_FLUSH_THRESHOLD', 1000)
+        self._pending = defaultdict(int)
+        self._pending_total = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher_pid = None
+
+    def record(self, product_id, count=1):
+        self._ensure_flusher()
+        with self._lock:
+            self._pending[product_id] += count
+            self._pending_total += count
+            full = self._pending_total >= self.flush_threshold
+        if full:
+            self._wakeup.set()
+
+    def pending(self, product_id):
+        return self._pending.get(product_id, 0)
+
+    def _drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(int)
+            self._pending_total = 0
+        return pending
+
+    def _restore(self, pending):
+        # 반영에 실패한 증가분을 다음 flush로 넘김
+        with self._lock:
+            for product_id, count in pending.items():
+                self._pending[product_id] += count
+                self._pending_total += count
+
+    def flush(self):
+        """
+        대기 중인 조회수를 DB에 반영 (반환값: 실행한 UPDATE 수)
+        """
+        from .models import Product
+
+        with self._flush_lock:
+            pending = self._drain()
+            if not pending:
+                return 0
+
+            by_count = defaultdict(list)
+            for product_id, count in pending.items():
+                by_count[count].append(product_id)
+
+            updates = 0
+            try:
+                for count, product_ids in sorted(by_count.items()):
+                    Product.objects.filter(id__in=product_ids).update(views=F('views') + count)
+                    updates += 1
+                    for product_id in product_ids:
+                        del pending[product_id]
+            except DatabaseError as e:
+                logger.warning(f"View count flush failed, {sum(pending.values())} views kept for retry: {e}")
+                self._restore(pending)
+            return updates
+
+    def _ensure_flusher(self):
+        # 포크된 워커에서는 스레드를 새로 시작
+        if self._flusher_pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._flusher_pid == os.getpid():
+                return
+            thread = threading.Thread(target=self._run, name='view-count-flusher', daemon=True)
+            thread.start()
+            self._flusher_pid = os.getpid()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("View count flush failed")
+            finally:
+                # 이 스레드의 DB 연결은 다음 flush까지 유지할 필요가 없음
+                connections.close_all()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_view_count_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = ViewCountBuffer()
+    return _buffer
+
+
+def record_view(product_id):
+    """
+    상품 조회 1회 기록
+    - VIEW_COUNT_BUFFERED가 False면 바로 UPDATE (다른 컬럼은 건드리지 않음)
+    """
+    if getattr(settings, 'VIEW_COUNT_BUFFERED', True):
+        get_view_count_buffer().record(product_id)
+        return
+    from .models import Product
+
+    Product.objects.filter(id=product_id).update(views=F('views') + 1)
+
+
+@atexit.register
+def _flush_on_exit():
+    if _buffer is not None and _buffer._flusher_pid == os.getpid():
+        try:
+            _buffer.flush()
+        except Exception:
+            logger.exception("View count flush at exit failed")
@@ -2,14 +2,25 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
 from django.utils.html import escape
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.core.paginator import Paginator
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from collections import Counter
 import logging
 
+from core.conditional import not_modified_response, page_etag, set_validators
+from core.pagination import CursorPage, CursorPaginator, approximate_count
+from core.serialization import stream_json_object
 from .models import Product, Category
+from .counters import apply_changes as apply_category_changes
 from .forms import ProductForm
+from .listcache import bump_catalog_generation, catalog_generation, category_snapshot, find_category, get_or_compute, make_key
+from .search import search_products
+from .thumbnails import image_name_url
+from .viewcounts import record_view
 from reports.forms import ReportForm
 
 logger = logging.getLogger(__name__)
@@ -18,12 +29,14 @@ def product_list(request):
     category_slug = request.GET.get('category')
     search_query = request.GET.get('search', '')
     
-    products = Product.objects.filter(status='available')
-    
-    # 카테고리 필터링
+    # 카테고리 필터링 (카테고리 목록과 상품 수는 프로세스 메모리의 스냅샷에서 조회)
+    generation = catalog_generation()
+    categories = category_snapshot(generation)
+    category = None
     if category_slug:
-        category = get_object_or_404(Category, slug=category_slug)
-        products = products.filter(category=category)
+        categories, category = find_category(category_slug, generation)
+        if category is None:
+            raise Http404('No Category matches the given query.')
     
     # 검색 필터링
     if search_query:
@@ -33,44 +46,200 @@ def product_list(request):
         if len(search_query) < 2:
             messages.info(request, '검색어는 2글자 이상 입력해주세요.')
         else:
-            products = products.filter(
-                Q(title__icontains=search_query) | 
-                Q(description__icontains=search_query)
-            )
-            
-            # 검색 로그
-            logger.info(f"Product search: '{search_query}' - Results: {products.count()}")
+            # 검색 로그 (결과 수는 페이지네이션에서 계산되므로 별도로 세지 않음)
+            logger.info(f"Product search: '{search_query}'")
+    searching = len(search_query) >= 2
+    
+    # 카탈로그 세대와 요청 조건이 같으면 304
+    etag = page_etag(request, 'product_list', generation, request.GET.urlencode())
+    response = not_modified_response(request, etag)
+    if response is not None:
+        return response
+    
+    # 페이지네이션 (페이지당 12개 상품)
+    # 검색 결과는 관련도 순이므로 페이지 번호, 일반 목록은 (created_at, id) 커서 방식
+    cursor = None if searching else request.GET.get('cursor')
+    page_number = request.GET.get('page') if searching else None
     
-    # 페이지네이션
-    paginator = Paginator(products, 12)  # 페이지당 12개 상품
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    def build_page():
+        products = Product.objects.filter(status='available')
+        if category is not None:
+            products = products.filter(category=category)
+        if searching:
+            # 검색 색인(FTS5)으로 관련도 순 검색
+            page_obj = Paginator(search_products(products, search_query), 12).get_page(page_number)
+            return {
+                'ids': [product.id for product in page_obj],
+                'count': page_obj.paginator.count,
+                'number': page_obj.number,
+            }
+        page_obj = CursorPaginator(products, 12).page(cursor)
+        return {
+            'ids': [product.id for product in page_obj],
+            # 커서 페이지마다 세지 않도록 같은 조건의 개수는 PAGINATION_COUNT_CACHE_TIMEOUT초 동안 재사용
+            'count': approximate_count(products),
+            'next_cursor': page_obj.next_cursor,
+            'previous_cursor': page_obj.previous_cursor,
+        }
     
-    # 모든 카테고리 가져오기
-    categories = Category.objects.all()
+    # 페이지의 상품 id와 전체 개수만 캐시하고 상품 정보는 매번 id로 조회
+    if cursor and CursorPaginator(Product.objects.none(), 12).decode_cursor(cursor) is None:
+        cursor = None
+    search_key = ' '.join(search_query.casefold().split()) if searching else ''
+    entry = get_or_compute(
+        make_key('list', category.id if category else '', search_key, cursor or '', page_number or '',
+                 generation=generation),
+        build_page,
+    )
+    products_by_id = Product.objects.select_related('category').in_bulk(entry['ids'])
+    object_list = [products_by_id[pk] for pk in entry['ids'] if pk in products_by_id]
     
-    return render(request, 'products/product_list.html', {
+    if searching:
+        page_obj = Paginator(range(entry['count']), 12).get_page(entry['number'])
+        page_obj.object_list = object_list
+    else:
+        page_obj = CursorPage(object_list, None, entry['next_cursor'], entry['previous_cursor'])
+    
+    response = render(request, 'products/product_list.html', {
         'page_obj': page_obj,
         'categories': categories,
         'current_category': category_slug,
-        'search_query': search_query
+        'search_query': search_query,
+        'total_count': entry['count']
     })
+    return set_validators(response, etag)
+
+# 목록 API에서 선택할 수 있는 필드 (응답 키: 조회할 컬럼)
+API_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'price': 'price',
+    'status': 'status',
+    'category': 'category__slug',
+    'seller': 'seller__username',
+    'views': 'views',
+    'image': 'image',
+    'created_at': 'created_at',
+    'updated_at': 'updated_at',
+}
+API_DEFAULT_FIELDS = ('id', 'title', 'price', 'category', 'image', 'created_at')
+
+def product_list_api(request):
+    """
+    상품 목록 JSON API (product_list와 같은 category / search 조건)
+    - fields=id,title,...: 응답 필드 선택 (기본값 API_DEFAULT_FIELDS)
+    - limit: 페이지 크기 (최대 PRODUCT_API_MAX_LIMIT)
+    - 일반 목록은 cursor, 검색 결과는 관련도 순이므로 page 번호로 다음 페이지 요청
+    - 모델 인스턴스를 만들지 않고 .values()를 iterator()로 읽으며 응답을 스트리밍
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return JsonResponse({'error': '잘못된 요청입니다.'}, status=405)
+    
+    fields = [name for name in request.GET.get('fields', '').split(',') if name] or list(API_DEFAULT_FIELDS)
+    unknown = [name for name in fields if name not in API_FIELDS]
+    if unknown:
+        return JsonResponse({'error': f"알 수 없는 필드입니다: {', '.join(unknown)}"}, status=400)
+    max_limit = getattr(settings, 'PRODUCT_API_MAX_LIMIT', 100)
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), max_limit)
+        page_number = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        return JsonResponse({'error': '잘못된 페이지 값입니다.'}, status=400)
+    
+    generation = catalog_generation()
+    category_slug = request.GET.get('category')
+    category = None
+    if category_slug:
+        _, category = find_category(category_slug, generation)
+        if category is None:
+            return JsonResponse({'error': '카테고리를 찾을 수 없습니다.'}, status=404)
+    search_query = request.GET.get('search', '').strip()
+    searching = len(search_query) >= 2
+    
+    etag = page_etag(request, 'product_list_api', generation, request.GET.urlencode())
+    response = not_modified_response(request, etag)
+    if response is not None:
+        return response
+    
+    products = Product.objects.filter(status='available')
+    if category is not None:
+        products = products.filter(category=category)
+    # 커서에 필요한 정렬 키는 선택한 필드와 관계없이 함께 조회
+    columns = list(dict.fromkeys([API_FIELDS[name] for name in fields] + ['created_at', 'id']))
+    if 'image' in fields:
+        columns.append('image_derivatives_ready')
+    selected = [(name, API_FIELDS[name]) for name in fields]
+    
+    def serialize(rows):
+        for row in rows:
+            item = {name: row[column] for name, column in selected}
+            if 'image' in item:
+                item['image'] = image_name_url(item['image'], 'list', 'webp', row['image_derivatives_ready'])
+            yield item
+    
+    if searching:
+        offset = (page_number - 1) * limit
+        rows = search_products(products, search_query).values(*columns)[offset:offset + limit + 1]
+        state = {'has_next': False}
+        
+        def page_rows():
+            for index, row in enumerate(rows.iterator(chunk_size=limit + 1)):
+                if index == limit:
+                    state['has_next'] = True
+                    break
+                yield row
+        
+        body = [
+            ('results', serialize(page_rows())),
+            ('next_page', lambda: page_number + 1 if state['has_next'] else None),
+            ('previous_page', page_number - 1 if page_number > 1 else None),
+        ]
+    else:
+        page = CursorPaginator(products.values(*columns), limit).stream(request.GET.get('cursor'), chunk_size=limit + 1)
+        body = [
+            ('results', serialize(iter(page))),
+            ('next_cursor', lambda: page.next_cursor),
+            ('previous_cursor', lambda: page.previous_cursor),
+        ]
+    
+    response = StreamingHttpResponse(stream_json_object(body), content_type='application/json')
+    return set_validators(response, etag)
 
 def product_detail(request, product_id):
-    product = get_object_or_404(Product, id=product_id)
+    # 304 응답 여부 판단에 필요한 값만 먼저 조회
+    meta = Product.objects.filter(id=product_id).values(
+        'status', 'updated_at', 'views', 'seller_id',
+        'seller__username', 'seller__is_active', 'seller__is_dormant', 'seller__profile_image',
+    ).first()
+    if meta is None:
+        raise Http404('No Product matches the given query.')
     
     # 삭제되거나 차단된 상품은 관리자나 판매자만 볼 수 있음
-    if product.status == 'blocked' and not (request.user.is_staff or request.user == product.seller):
+    if meta['status'] == 'blocked' and not (request.user.is_staff or request.user.id == meta['seller_id']):
         messages.error(request, '이 상품은 차단되었습니다.')
         return redirect('products:product_list')
     
     # 조회수 증가 (중복 방지 로직)
     session_key = f'viewed_product_{product_id}'
-    if not request.session.get(session_key, False):
-        product.views += 1
-        product.save()
+    first_view = not request.session.get(session_key, False)
+    if first_view:
+        # DB에는 주기적으로 모아서 반영
+        record_view(product_id)
         request.session[session_key] = True
     
+    # 상품, 조회수, 판매자 상태, 판매자의 다른 상품(카탈로그 세대)이 같으면 304
+    # 세션의 첫 조회는 증가된 조회수를 보여줘야 하므로 항상 새로 렌더링
+    etag = page_etag(request, 'product_detail', product_id, *meta.values(), catalog_generation())
+    if not first_view:
+        response = not_modified_response(request, etag, meta['updated_at'])
+        if response is not None:
+            return response
+    
+    product = get_object_or_404(Product.objects.select_related('seller', 'category'), id=product_id)
+    if first_view:
+        product.views += 1
+    
     # 판매자의 다른 상품
     seller_other_products = Product.objects.filter(
         seller=product.seller, 
@@ -80,11 +249,12 @@ def product_detail(request, product_id):
     # 신고 폼
     report_form = ReportForm()
     
-    return render(request, 'products/product_detail.html', {
+    response = render(request, 'products/product_detail.html', {
         'product': product,
         'seller_other_products': seller_other_products,
         'report_form': report_form
     })
+    return set_validators(response, etag, meta['updated_at'])
 
 @login_required
 def product_create(request):
@@ -173,26 +343,33 @@ def my_products(request):
     if status_filter and status_filter != 'all':
         products = products.filter(status=status_filter)
     
-    # 페이지네이션
-    paginator = Paginator(products, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # 페이지네이션 (커서 방식)
+    page_obj = CursorPaginator(products, 10).page(request.GET.get('cursor'))
     
     return render(request, 'products/my_products.html', {
         'page_obj': page_obj,
         'status_filter': status_filter
     })
 
+
+def can_change_status(user, seller_id, status, new_status):
+    # 판매자는 자기 상품만, 관리자는 모든 상품 변경 가능
+    # 신고로 차단(blocked)된 상품의 해제와 차단 처리는 관리자만 가능
+    if user.is_staff:
+        return True
+    return seller_id == user.id and 'blocked' not in (status, new_status)
+
+
 @login_required
 def change_product_status(request, product_id):
     if request.method == 'POST':
         product = get_object_or_404(Product, id=product_id)
+        new_status = request.POST.get('status')
         
-        # 권한 확인
-        if product.seller != request.user and not request.user.is_staff:
+        # 권한 확인 (bulk_change_product_status와 같은 규칙)
+        if not can_change_status(request.user, product.seller_id, product.status, new_status):
             return JsonResponse({'error': '권한이 없습니다.'}, status=403)
         
-        new_status = request.POST.get('status')
         if new_status in [s[0] for s in Product.STATUS_CHOICES]:
             product.status = new_status
             product.save()
@@ -202,4 +379,68 @@ def change_product_status(request, product_id):
         
         return JsonResponse({'error': '잘못된 상태값입니다.'}, status=400)
     
-    return JsonResponse({'error': '잘못된 요청입니다.'}, status=405)
\ No newline at end of file
+    return JsonResponse({'error': '잘못된 요청입니다.'}, status=405)
+
+
+@login_required
+def bulk_change_product_status(request):
+    """
+    여러 상품의 상태를 한 번에 변경 (POST ids=1&ids=2 또는 ids=1,2 / status)
+    - 판매자는 자기 상품만, 관리자는 모든 상품 변경 가능
+    - 차단(blocked) 처리나 차단된 상품의 변경은 관리자만 가능
+    - results: 상품 id별 updated / unchanged / forbidden / not_found
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': '잘못된 요청입니다.'}, status=405)
+    
+    new_status = request.POST.get('status')
+    if new_status not in [s[0] for s in Product.STATUS_CHOICES]:
+        return JsonResponse({'error': '잘못된 상태값입니다.'}, status=400)
+    
+    try:
+        ids = list(dict.fromkeys(
+            int(value) for raw in request.POST.getlist('ids') for value in raw.split(',') if value.strip()
+        ))
+    except ValueError:
+        return JsonResponse({'error': '잘못된 상품 번호입니다.'}, status=400)
+    max_ids = getattr(settings, 'PRODUCT_BULK_STATUS_MAX', 100)
+    if not ids or len(ids) > max_ids:
+        return JsonResponse({'error': f'상품은 1개 이상 {max_ids}개 이하로 선택해주세요.'}, status=400)
+    
+    results = dict.fromkeys(ids, 'not_found')
+    with transaction.atomic():
+        # 권한 확인과 카테고리 개수 갱신에 필요한 값을 한 번에 조회
+        rows = Product.objects.select_for_update().filter(id__in=ids).values_list(
+            'id', 'seller_id', 'status', 'category_id'
+        )
+        changes = Counter()
+        changed_ids = []
+        for product_id, seller_id, status, category_id in rows:
+            if not can_change_status(request.user, seller_id, status, new_status):
+                results[product_id] = 'forbidden'
+            elif status == new_status:
+                results[product_id] = 'unchanged'
+            else:
+                results[product_id] = 'updated'
+                changed_ids.append(product_id)
+                changes[(category_id, status)] -= 1
+                changes[(category_id, new_status)] += 1
+        
+        if changed_ids:
+            # update()는 시그널을 보내지 않으므로 카테고리 개수와 목록 캐시는 여기서 한 번만 갱신
+            Product.objects.filter(id__in=changed_ids).update(status=new_status, updated_at=timezone.now())
+            apply_category_changes(changes)
+            transaction.on_commit(bump_catalog_generation)
+    
+    summary = Counter(results.values())
+    logger.info(
+        f"Bulk product status change to '{new_status}' by {request.user.username}: "
+        f"{summary['updated']} updated, {summary['unchanged']} unchanged, "
+        f"{summary['forbidden']} forbidden, {summary['not_found']} not found"
+    )
+    return JsonResponse({
+        'success': True,
+        'status': new_status,
+        'updated': summary['updated'],
+        'results': {str(product_id): result for product_id, result in results.items()},
+    })
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Report',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('prohibited', '금지된 상품'), ('counterfeit', '위조품/가품'), ('misleading', '상품 정보 불일치'), ('fraud', '사기 의심'), ('harassment', '괴롭힘/부적절한 행동'), ('other', '기타')], max_length=20)),
+                ('detail', models.TextField()),
+                ('status', models.CharField(choices=[('pending', '처리 대기'), ('approved', '승인됨'), ('rejected', '거부됨')], default='pending', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('processed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='processed_reports', to=settings.AUTH_USER_MODEL)),
+                ('reporter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reports_filed', to=settings.AUTH_USER_MODEL)),
+                ('target_product', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='products.product')),
+                ('target_user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reports_received', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['target_product', 'status'], name='report_product_status_idx'), models.Index(fields=['target_user', 'status'], name='report_user_status_idx'), models.Index(fields=['status', '-created_at', '-id'], name='report_status_recent_idx'), models.Index(fields=['reporter', '-created_at'], name='report_reporter_recent_idx')],
+            },
+        ),
+    ]
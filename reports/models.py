@@ -33,6 +33,15 @@ class Report(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # 대상별 신고 누적 수 (자동 차단/휴면 판단)
+            models.Index(fields=['target_product', 'status'], name='report_product_status_idx'),
+            models.Index(fields=['target_user', 'status'], name='report_user_status_idx'),
+            # 관리자 신고 목록 (상태별 최신순) / 내 신고 목록
+            # 관리자 목록은 pending 외의 상태 탭도 같은 쿼리로 조회하므로 pending 부분 인덱스 대신 상태별 일반 인덱스 하나 사용
+            models.Index(fields=['status', '-created_at', '-id'], name='report_status_recent_idx'),
+            models.Index(fields=['reporter', '-created_at'], name='report_reporter_recent_idx'),
+        ]
     
     def __str__(self):
         if self.target_product:
@@ -8,6 +8,7 @@ from django.contrib.auth import get_user_model
 from django.db.models import Count
 import logging
 
+from core.pagination import CursorPaginator
 from .models import Report
 from .forms import ReportForm
 from products.models import Product
@@ -142,6 +143,9 @@ def admin_report_list(request):
     else:
         reports = Report.objects.filter(status=status_filter)
     
+    # 페이지네이션 (커서 방식)
+    page_obj = CursorPaginator(reports, 20).page(request.GET.get('cursor'))
+    
     # 통계 정보
     stats = {
         'total': Report.objects.count(),
@@ -151,7 +155,8 @@ def admin_report_list(request):
     }
     
     return render(request, 'reports/admin_report_list.html', {
-        'reports': reports,
+        'reports': page_obj,
+        'page_obj': page_obj,
         'status_filter': status_filter,
         'stats': stats
     })
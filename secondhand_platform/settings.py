@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,7 +61,9 @@ ROOT_URLCONF = 'secondhand_platform.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # 렌더링 시간을 PerformanceMiddleware에 기록하는 DjangoTemplates 백엔드
+        'BACKEND': 'core.instrumentation.TimedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -166,27 +169,38 @@ LOGGING = {
             'style': '{',
         },
     },
+    # 요청 스레드는 큐에 넣기만 하고 파일/메일 기록은 백그라운드 스레드에서 일괄 처리
     'handlers': {
         'file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'class': 'core.logging_handlers.QueuedHandler',
+            'target': 'core.logging_handlers.BatchingRotatingFileHandler',
             'filename': os.path.join(BASE_DIR, 'logs/django.log'),
+            'maxBytes': 10 * 1024 * 1024,  # 10 MB
+            'backupCount': 5,
+            'throttle_interval': 60,
             'formatter': 'verbose',
         },
         'console': {
             'level': 'DEBUG',
-            'class': 'logging.StreamHandler',
+            'class': 'core.logging_handlers.QueuedHandler',
+            'target': 'logging.StreamHandler',
             'formatter': 'simple',
         },
         'mail_admins': {
             'level': 'ERROR',
-            'class': 'django.utils.log.AdminEmailHandler',
+            'class': 'core.logging_handlers.QueuedHandler',
+            'target': 'django.utils.log.AdminEmailHandler',
             'formatter': 'verbose',
         },
         'security': {
             'level': 'WARNING',
-            'class': 'logging.FileHandler',
+            'class': 'core.logging_handlers.QueuedHandler',
+            'target': 'core.logging_handlers.BatchingRotatingFileHandler',
             'filename': os.path.join(BASE_DIR, 'logs/security.log'),
+            'maxBytes': 10 * 1024 * 1024,  # 10 MB
+            'backupCount': 10,
+            'throttle_interval': 60,  # 같은 IP의 동일 경고는 60초마다 요약
             'formatter': 'verbose',
         },
     },
@@ -241,9 +255,108 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache Configuration
+# 여러 워커가 상태를 공유해야 하는 운영 환경에서는 Redis 캐시 사용
+# 예: {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://redis:6379/1'}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+}
+
 # 레이트 리미팅 설정 (IP당 분당 최대 요청 수)
 RATE_LIMIT = 60
+RATE_LIMIT_WINDOW = 60  # 초
+# 워커 간 공유가 필요하면 'core.ratelimit.CacheRateLimitBackend' 사용
+RATE_LIMIT_BACKEND = 'core.ratelimit.LocMemRateLimitBackend'
+RATE_LIMIT_CACHE = 'default'
+RATE_LIMIT_MAX_KEYS = 100000  # 메모리 백엔드에서 유지할 최대 IP 수
+
+# POST 요청 검사 정책 (URL 이름별, 'default'는 등록되지 않은 URL에 적용)
+# - scan: 검사 여부 / fields: 검사할 필드 (None이면 전체) / exclude_fields: 제외할 필드
+# - rule_sets: 적용할 규칙 집합 (core.scanner.RULE_SETS) / max_bytes: 검사할 최대 바이트 수 (UTF-8 기준)
+SECURITY_INSPECTION_POLICY = {
+    'default': {'rule_sets': ['xss', 'sql']},
+    'accounts:login': {'scan': False},
+    'accounts:signup': {'scan': False},
+    'accounts:profile_update': {'fields': ['username', 'email', 'intro']},
+    'products:product_create': {'fields': ['title', 'description'], 'max_bytes': 256 * 1024},
+    'products:product_update': {'fields': ['title', 'description'], 'max_bytes': 256 * 1024},
+    'products:change_status': {'scan': False},
+    'products:bulk_change_status': {'scan': False},
+    'reports:report_product': {'fields': ['detail']},
+    'reports:report_user': {'fields': ['detail']},
+    'reports:admin_report_action': {'scan': False},
+}
+# ASGI 환경에서 이 크기(bytes) 이상의 POST 본문은 별도 스레드 풀에서 검사
+SECURITY_SCAN_OFFLOAD_BYTES = 64 * 1024
+SECURITY_SCAN_WORKERS = 4
+
+# 성능 측정 설정 (core.middleware.PerformanceMiddleware)
+PERF_INSTRUMENTATION = True
+PERF_SERVER_TIMING = DEBUG  # Server-Timing 응답 헤더 추가 (DB 쿼리 수/시간이 클라이언트에 노출되므로 개발 환경에서만)
+PERF_SUMMARY_LOG_INTERVAL = 300  # URL 이름별 응답 시간 요약(p50/p90/p99)을 로그로 남기는 간격(초), 0이면 기록하지 않음
+PERF_SLOW_REQUEST_MS = 500  # 이 시간(ms) 이상 걸린 요청은 느린 요청으로 기록
+PERF_SLOW_REQUEST_SAMPLE_RATE = 0.1  # 느린 요청 중 SQL과 함께 로그로 남길 비율
 
 # 파일 업로드 설정
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5 MB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5 MB
\ No newline at end of file
+DATA_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5 MB
+# 업로드 스트림을 청크 단위로 검사해 위반 시 즉시 중단 (SecureUploadHandler는 맨 앞에 위치)
+FILE_UPLOAD_HANDLERS = [
+    'core.uploadhandlers.SecureUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+UPLOAD_MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
+UPLOAD_ALLOWED_IMAGE_EXTENSIONS = ['jpg', 'jpeg', 'png', 'gif']
+# 목록 페이지네이션 설정 (core.pagination)
+PAGINATION_COUNT_CACHE_TIMEOUT = 60  # 목록 전체 개수 캐시 시간(초) (상품 변경 후에도 최대 이 시간만큼 이전 개수 표시)
+
+# 상품 목록 캐시 설정 (products.listcache)
+# 워커 간 공유가 필요하면 CACHES에 Redis 캐시를 추가하고 그 별칭 지정
+PRODUCT_LIST_CACHE = 'default'
+PRODUCT_LIST_CACHE_TIMEOUT = 300  # 초 (상품/카테고리 변경 시에는 즉시 무효화)
+PRODUCT_CATEGORY_SNAPSHOT_MAX_AGE = 60  # 워커별 카테고리 스냅샷을 다시 조회하는 최대 간격(초)
+
+# 상품 조회수 설정 (products.viewcounts)
+VIEW_COUNT_BUFFERED = True  # 조회수를 메모리에 모았다가 일괄 반영
+VIEW_COUNT_FLUSH_INTERVAL = 5  # 반영 주기(초), 워커 비정상 종료 시 최대 이 시간만큼의 조회수 유실
+VIEW_COUNT_FLUSH_THRESHOLD = 1000  # 대기 중인 조회가 이 수를 넘으면 즉시 반영
+
+# 상품 이미지 파생본 설정 (products.thumbnails)
+PRODUCT_IMAGE_SIZES = {
+    'card': (160, 160),  # 채팅방 상품 카드
+    'list': (400, 400),  # 상품 목록
+    'detail': (1080, 1080),  # 상품 상세
+}
+PRODUCT_IMAGE_WORKERS = 2  # 파생 이미지를 생성하는 작업 스레드 수
+
+# 미디어 파일 정리 설정 (core.storage / core.media / gc_media_blobs / gc_media_orphans)
+MEDIA_GC_GRACE_PERIOD = 3600  # 참조가 없어진 파일을 삭제하기 전 유예 시간(초)
+MEDIA_DELETE_ASYNC = True  # 참조가 0이 된 파일을 백그라운드 스레드에서 바로 삭제
+MEDIA_DELETE_MIN_AGE = 60  # 이 시간(초) 안에 수정된 파일은 백그라운드 삭제 대상에서 제외
+MEDIA_GC_DIRECTORIES = ['product_images', 'profile_images']  # gc_media_orphans가 검사할 디렉터리
+MEDIA_GC_SIDECAR_SUFFIXES = list(PRODUCT_IMAGE_SIZES)  # 원본과 함께 정리할 파생 파일 접미사 (abc_list.webp)
+
+# 상품 상태 일괄 변경 시 한 번에 처리할 최대 상품 수
+PRODUCT_BULK_STATUS_MAX = 100
+
+# 상품 목록 JSON API 한 페이지의 최대 상품 수 (products:product_list_api)
+PRODUCT_API_MAX_LIMIT = 100
+
+# 채팅방을 열 때와 이전 메시지를 요청할 때 불러오는 메시지 수 (chat.history)
+CHAT_HISTORY_PAGE_SIZE = 50
+
+# 채팅 메시지 쓰기 지연 (chat.writer) - 받은 메시지는 바로 전송하고 저장은 모아서 일괄 처리
+CHAT_WRITE_BEHIND = False
+CHAT_WRITE_BEHIND_INTERVAL = 0.05  # 저장 주기(초), 워커 비정상 종료 시 최대 이 시간만큼의 메시지 유실
+CHAT_WRITE_BEHIND_THRESHOLD = 200  # 대기 중인 메시지가 이 수를 넘으면 즉시 저장
+CHAT_WRITE_BEHIND_MAX_PENDING = 10000  # DB 장애 시 재시도를 위해 보관하는 최대 메시지 수 (넘치면 오래된 것부터 버림)
+
+# 채팅방 참여자 캐시 (chat.membership) - 채팅방 페이지/WebSocket 연결 권한 확인용
+# 권한은 연결할 때 한 번만 확인하고, 연결 중 제외된 참여자는 채널 레이어 알림으로 연결 종료
+# 워커별 캐시(locmem)에서는 무효화가 다른 워커에 닿지 않으므로 캐시를 쓰지 않고 DB에서 확인
+# 배포 후 재연결이 몰릴 때 DB 조회 없이 처리하려면 CACHES에 Redis 캐시를 추가하고 그 별칭 지정
+CHAT_MEMBERSHIP_CACHE = 'default'
+CHAT_MEMBERSHIP_CACHE_TIMEOUT = 300  # 공유 캐시에서 보관하는 시간(초) (참여자 추가/삭제 시에는 즉시 무효화)